@@ -1,2 +1,6 @@
 REGION_SIZE = 64  # tiles per region
 VIEW_RADIUS = 1  # keeps a 3 × 3 region window in memory
+RETAIN_MARGIN = 1  # extra ring of regions kept resident before unloading
+LOD_DISTANCES = (96.0, 160.0)  # camera distances switching to 2×2 and 4×4 region meshes
+CHUNK_SIZE = 16  # tiles per edge of the separately culled region mesh chunks
+SMOOTH_TERRAIN = False  # build regions as shared-vertex heightmaps instead of flat tile quads
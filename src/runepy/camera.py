@@ -1,9 +1,55 @@
-from panda3d.core import ClockObject, Vec3
+from panda3d.core import ClockObject, Point2, Point3, Vec3
+
+from constants import REGION_SIZE, VIEW_RADIUS
 
 # Initialize the global clock for time-based movement
 globalClock = ClockObject.getGlobalClock()
 
 
+def ground_footprint(camera, render, lens=None, ground_z=0.0, max_distance=None):
+    """Return the ``(x0, y0, x1, y1)`` bounds of the camera view on the ground.
+
+    The four corner rays of the lens frustum are intersected with the plane
+    ``z == ground_z``. Rays that point at or above the horizon, and hits
+    farther than ``max_distance`` from the camera, are clamped to
+    ``max_distance`` so a tilted camera cannot request the whole world. By
+    default that is half the :data:`VIEW_RADIUS` region window, so the
+    footprint streams about as many regions as the player window does.
+    Returns ``None`` if the camera has no lens.
+    """
+    if max_distance is None:
+        max_distance = (VIEW_RADIUS + 0.5) * REGION_SIZE
+    if lens is None:
+        node = camera.node()
+        lens = node.getLens() if hasattr(node, "getLens") else None
+    if lens is None:
+        return None
+    origin = camera.getPos(render)
+    xs = []
+    ys = []
+    for corner in ((-1, -1), (1, -1), (1, 1), (-1, 1)):
+        near = Point3()
+        far = Point3()
+        if not lens.extrude(Point2(*corner), near, far):
+            return None
+        near = render.getRelativePoint(camera, near)
+        far = render.getRelativePoint(camera, far)
+        ray = far - near
+        if ray.z < 0:
+            hit = near + ray * ((ground_z - near.z) / ray.z)
+            flat = Vec3(hit.x - origin.x, hit.y - origin.y, 0)
+        else:
+            flat = Vec3(ray.x, ray.y, 0)
+            if flat.length_squared() == 0:
+                return None
+            flat *= max_distance / flat.length()
+        if flat.length() > max_distance:
+            flat *= max_distance / flat.length()
+        xs.append(origin.x + flat.x)
+        ys.append(origin.y + flat.y)
+    return min(xs), min(ys), max(xs), max(ys)
+
+
 class CameraControl:
 
     def __init__(self, camera, render, character):
@@ -67,4 +113,11 @@ class FreeCameraControl:
                     int(self.camera.getX()),
                     int(self.camera.getY()),
                 )
+                if dt > 0:
+                    self.world.prefetch_motion(
+                        self.camera.getX(),
+                        self.camera.getY(),
+                        vec.x / dt,
+                        vec.y / dt,
+                    )
         return task.cont
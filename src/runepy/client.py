@@ -12,15 +12,19 @@ except Exception:  # pragma: no cover - Panda3D may be missing
 from constants import REGION_SIZE, VIEW_RADIUS
 from runepy import verbose
 from runepy.base_app import BaseApp
-from runepy.camera import CameraControl
+from runepy.camera import CameraControl, ground_footprint
 from runepy.character import Character
-from runepy.collision import CollisionControl
 from runepy.config import load_state, save_state
 from runepy.controls import Controls
 from runepy.debuginfo import DebugInfo
 from runepy.input_binder import InputBinder
 from runepy.pathfinding import Pathfinder
+from runepy.picking import TilePicker, heightfield_surface
 from runepy.utils import update_tile_hover as util_update_tile_hover
+from runepy.world.instancing import Instancer
+from runepy.world.manager import RegionManager
+from runepy.world.mesh_cache import MeshCache
+from runepy.world.snapshot import load_snapshot, save_snapshot
 from runepy.world.world import World
 
 logger = logging.getLogger(__name__)
@@ -30,9 +34,36 @@ class Client(BaseApp):
 
     def __init__(self, debug=False):
         self.debug = debug
+        self._start_warmup()
         super().__init__()
         atexit.register(self._save_state)
 
+    def _start_warmup(self):
+        """Begin loading and meshing the starting regions in worker threads.
+
+        Runs before ShowBase opens the window, using the position saved in
+        ``state.json``, so region I/O overlaps window and UI setup.
+        """
+        self._saved_state = load_state()
+        pos = self._saved_state.get("character_pos")
+        x, y = (pos[0], pos[1]) if isinstance(pos, list) and len(pos) == 3 else (0, 0)
+        self.region_manager = RegionManager(
+            view_radius=VIEW_RADIUS, mesh_cache=MeshCache(), instancer=Instancer()
+        )
+        # Regions saved at the end of the last session skip disk and meshing
+        self.region_manager.seed(load_snapshot())
+        self.region_manager.prefetch_around(int(x), int(y), build_mesh=True)
+
+    def _wait_for_warmup(self, low, high):
+        """Advance the loading screen from ``low`` to ``high`` as regions arrive."""
+        done, total = self.region_manager.prefetch_progress()
+        while done < total:
+            self.loading_screen.update(
+                low + int((high - low) * done / total),
+                f"Loading regions ({done}/{total})",
+            )
+            done, total = self.region_manager.wait_prefetch(timeout=0.05)
+
     def initialize(self):
         """Perform heavy initialization for the game mode."""
         self.debug_info = DebugInfo()
@@ -40,6 +71,7 @@ class Client(BaseApp):
         self.mouseWatcherNode.set_modifier_buttons(ModifierButtons())
         self.buttonThrowers[0].node().set_modifier_buttons(ModifierButtons())
 
+        self._wait_for_warmup(5, 20)
         self.loading_screen.update(20, "Generating world")
 
         def world_progress(frac, text):
@@ -53,6 +85,7 @@ class Client(BaseApp):
             debug=self.debug,
             progress_callback=world_progress,
             view_radius=view_radius,
+            region_manager=self.region_manager,
         )
 
         tile_fit_scale = self.world.tile_size * 0.5
@@ -72,7 +105,7 @@ class Client(BaseApp):
             self.render,
             self.character,
         )
-        state = load_state()
+        state = self._saved_state
         char_pos = state.get("character_pos")
         if isinstance(char_pos, list) and len(char_pos) == 3:
             self.character.model.setPos(*char_pos)
@@ -81,7 +114,16 @@ class Client(BaseApp):
             self.camera.setZ(cam_h)
             self.camera_control.update_camera_focus()
         self.controls = Controls(self, self.camera_control, self.character)
-        self.collision_control = CollisionControl(self.camera, self.render)
+        self.tile_picker = TilePicker(
+            self.mouseWatcherNode,
+            self.camera,
+            self.render,
+            surface=heightfield_surface(
+                self.world.tile_height,
+                corners_at=self.world.tile_corners,
+                extent=self.world.terrain_extent,
+            ),
+        )
         self.pathfinder = Pathfinder(self.character, self.world, self.camera_control, debug=self.debug)
         self.input_binder = InputBinder(self, self.pathfinder, self.debug_info)
 
@@ -93,11 +135,22 @@ class Client(BaseApp):
         self.camera.lookAt(0, 0, 0)
 
         self.taskMgr.add(self.update_tile_hover, "updateTileHoverTask")
+        self.taskMgr.add(self.world.pump_streaming, "pumpStreamingTask")
+        self.taskMgr.add(self.update_view_streaming, "viewStreamingTask")
 
     def log(self, *args, **kwargs):
         if self.debug:
             logger.debug(*args, **kwargs)
 
+    def update_view_streaming(self, task):
+        """Stream the regions under the camera footprint and pick mesh LODs."""
+        footprint = ground_footprint(self.camera, self.render, max_distance=self.world.view_distance)
+        if footprint is not None:
+            self.world.update_view(*footprint)
+        cam = self.camera.getPos(self.render)
+        self.world.update_lod(cam.x, cam.y, cam.z)
+        return task.cont
+
     def update_tile_hover(self, task):
         util_update_tile_hover(
             self.mouseWatcherNode,
@@ -105,6 +158,7 @@ class Client(BaseApp):
             self.render,
             self.world,
             debug=self.debug_info,
+            picker=self.tile_picker,
         )
         return task.cont
 
@@ -128,7 +182,7 @@ class Client(BaseApp):
     # State persistence
     # ------------------------------------------------------------------
     def _save_state(self):
-        """Save camera height and character position."""
+        """Save camera height, character position and the region snapshot."""
         if not hasattr(self, "character"):
             return
         state = {
@@ -140,6 +194,8 @@ class Client(BaseApp):
             ],
         }
         save_state(state)
+        if hasattr(self, "world"):
+            save_snapshot(self.world.region_manager)
 
 
 def main(args=None):
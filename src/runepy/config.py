@@ -6,6 +6,7 @@ CONFIG_DIR = os.path.join(_ROOT_DIR, "config")
 os.makedirs(CONFIG_DIR, exist_ok=True)
 DEFAULT_CONFIG_PATH = os.path.join(CONFIG_DIR, "config.json")
 DEFAULT_STATE_PATH = os.path.join(CONFIG_DIR, "state.json")
+DEFAULT_SNAPSHOT_PATH = os.path.join(CONFIG_DIR, "session.snap")
 
 
 def load_config(path: str = DEFAULT_CONFIG_PATH) -> dict:
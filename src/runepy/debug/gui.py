@@ -47,14 +47,14 @@ class DebugWindow(DirectFrame):
         if base is None:
             return task.again
         world = getattr(base, "world", None)
-        if world is not None:
-            rm = world.region_manager
-            regions = len(rm.loaded)
-        else:
-            regions = 0
-        geoms = base.render.findAllMatches("**/+GeomNode").getNumPaths()
+        stats = world.stats() if world is not None else {}
         self.widgets["stats"]["text"] = (
-            f"Regions: {regions:2d}\nGeoms:   {geoms:3d}"
+            f"Regions: {stats.get('regions', 0):2d}\n"
+            f"Pending: {stats.get('pending', 0):2d}\n"
+            f"Geoms:   {stats.get('geoms', 0):3d}\n"
+            f"Tris:    {stats.get('triangles', 0):d}\n"
+            f"Mesh:    {stats.get('mesh_bytes', 0) / 1024:.0f} KiB\n"
+            f"Tex:     {stats.get('texture_bytes', 0) / 1024:.0f} KiB"
         )
         return task.again
 
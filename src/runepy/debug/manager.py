@@ -116,10 +116,8 @@ class DebugManager:
             world = getattr(base, "world", None)
             if world is None:
                 return 0, 0
-            rm = world.region_manager
-            regions = len(rm.loaded)
-            geoms = base.render.findAllMatches("**/+GeomNode").getNumPaths()
-            return regions, geoms
+            stats = world.stats()
+            return stats["regions"], stats["geoms"]
         except Exception:
             return 0, 0
 
@@ -173,7 +171,7 @@ class DebugManager:
             if new_region.node is not None:
                 new_region.node.reparentTo(parent)
                 new_region.node.setPos(rx * REGION_SIZE, ry * REGION_SIZE, 0)
-            world.region_manager.loaded[(rx, ry)] = new_region
+            world.region_manager.replace_region(rx, ry, new_region)
         except Exception:
             pass
 
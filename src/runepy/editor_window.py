@@ -2,12 +2,13 @@ import logging
 
 from constants import REGION_SIZE, VIEW_RADIUS
 from runepy.base_app import BaseApp
-from runepy.camera import FreeCameraControl
+from runepy.camera import FreeCameraControl, ground_footprint
 from runepy.controls import Controls
 from runepy.debug import get_debug
 from runepy.editor_toolbar import EditorToolbar
 from runepy.map_editor import MapEditor
 from runepy.options_menu import KeyBindingManager, OptionsMenu
+from runepy.picking import TilePicker, heightfield_surface
 from runepy.ui.editor import UIEditorController
 from runepy.utils import update_tile_hover as util_update_tile_hover
 from runepy.world.world import World
@@ -30,6 +31,16 @@ class EditorWindow(BaseApp):
             radius=world_radius,
             view_radius=view_radius,
         )
+        self.tile_picker = TilePicker(
+            self.mouseWatcherNode,
+            self.camera,
+            self.render,
+            surface=heightfield_surface(
+                self.world.tile_height,
+                corners_at=self.world.tile_corners,
+                extent=self.world.terrain_extent,
+            ),
+        )
         self.editor = MapEditor(self, self.world)
         self.editor.save_callback = self.save_map
         self.editor.load_callback = self.load_map
@@ -92,10 +103,25 @@ class EditorWindow(BaseApp):
         self.camera.lookAt(0, 0, 0)
 
         self.taskMgr.add(self.update_tile_hover, "updateTileHoverTask")
+        self.taskMgr.add(self.world.pump_streaming, "pumpStreamingTask")
+        self.taskMgr.add(self.update_view_streaming, "viewStreamingTask")
+
+    def update_view_streaming(self, task):
+        """Stream the regions under the camera footprint and pick mesh LODs."""
+        footprint = ground_footprint(self.camera, self.render, max_distance=self.world.view_distance)
+        if footprint is not None:
+            self.world.update_view(*footprint)
+        cam = self.camera.getPos(self.render)
+        self.world.update_lod(cam.x, cam.y, cam.z)
+        return task.cont
 
     def update_tile_hover(self, task):
         util_update_tile_hover(
-            self.mouseWatcherNode, self.camera, self.render, self.world
+            self.mouseWatcherNode,
+            self.camera,
+            self.render,
+            self.world,
+            picker=self.tile_picker,
         )
         return task.cont
 
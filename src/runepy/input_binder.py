@@ -28,16 +28,10 @@ class InputBinder:
     def on_click(self):
         if self.options_menu.visible:
             return
-        if not self.base.mouseWatcherNode.hasMouse():
-            return
-        mpos = self.base.mouseWatcherNode.getMouse()
         self.base.camera.setH(0)
-        self.base.collision_control.update_ray(self.base.camNode, mpos)
-        self.base.collision_control.traverser.traverse(self.base.render)
-        collided_obj, pickedPos = self.base.collision_control.get_collided_object(self.base.render)
-        if collided_obj:
-            snapped_x = round(pickedPos.getX())
-            snapped_y = round(pickedPos.getY())
-            self.pathfinder.move_along_path(snapped_x, snapped_y)
-        self.base.collision_control.cleanup()
-
+        # The cached pick of this frame predates the heading change
+        self.base.tile_picker.invalidate()
+        pick = self.base.tile_picker.pick()
+        if pick is None:
+            return
+        self.pathfinder.move_along_path(pick.tile_x, pick.tile_y)
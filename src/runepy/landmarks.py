@@ -0,0 +1,275 @@
+"""Landmark (ALT) heuristics for :func:`runepy.pathfinding.a_star`.
+
+A :class:`LandmarkTable` stores the exact distance from a handful of landmark
+tiles to every tile of a static walkability grid. The triangle inequality then
+gives a lower bound on the remaining distance which is far tighter than the
+Chebyshev estimate around walls and inside dungeons.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+from typing import Callable, Dict, Hashable, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OFFSETS: Tuple[Tuple[int, int], ...] = (
+    (0, -1),
+    (1, 0),
+    (0, 1),
+    (-1, 0),
+    (-1, -1),
+    (1, 1),
+    (-1, 1),
+    (1, -1),
+)
+
+
+def _shift(mask: np.ndarray, dx: int, dy: int) -> np.ndarray:
+    """Return ``mask`` moved by ``(dx, dy)`` with vacated cells set to ``False``."""
+    height, width = mask.shape
+    out = np.zeros_like(mask)
+    if abs(dx) >= width or abs(dy) >= height:
+        return out
+    src_x = slice(max(0, -dx), width - max(0, dx))
+    dst_x = slice(max(0, dx), width - max(0, -dx))
+    src_y = slice(max(0, -dy), height - max(0, dy))
+    dst_y = slice(max(0, dy), height - max(0, -dy))
+    out[dst_y, dst_x] = mask[src_y, src_x]
+    return out
+
+
+def move_masks(
+    walkable: np.ndarray, offsets: Iterable[Tuple[int, int]]
+) -> List[Tuple[int, int, np.ndarray]]:
+    """Return ``(dx, dy, mask)`` triples of tiles allowed to step by each offset.
+
+    A move is allowed when the destination is walkable and, for diagonal
+    moves, neither orthogonal neighbour is blocked. This mirrors the corner
+    cutting rule used by :func:`runepy.pathfinding.a_star`.
+    """
+    masks = []
+    for dx, dy in offsets:
+        allowed = walkable & _shift(walkable, -dx, -dy)
+        if dx and dy:
+            allowed &= _shift(walkable, -dx, 0) & _shift(walkable, 0, -dy)
+        masks.append((dx, dy, allowed))
+    return masks
+
+
+#: Frontiers at least this large are expanded with whole-grid array shifts;
+#: smaller ones (corridors) are cheaper to walk tile by tile.
+_VECTOR_FRONTIER = 64
+
+
+def _bfs(
+    shape: Tuple[int, int],
+    masks: Sequence[Tuple[int, int, np.ndarray]],
+    source: Tuple[int, int],
+) -> np.ndarray:
+    """Unit-cost distances from ``source`` expanded one wavefront at a time."""
+    height, width = shape
+    dist = np.full(height * width, np.inf, dtype=np.float32)
+    visited = bytearray(height * width)
+    visited_grid = np.frombuffer(visited, dtype=bool).reshape(shape)
+    deltas = [dy * width + dx for dx, dy, _allowed in masks]
+    allowed_flat = [allowed.tobytes() for _dx, _dy, allowed in masks]
+    start = source[1] * width + source[0]
+    visited[start] = 1
+    dist[start] = 0
+    frontier = [start]
+    step = 0
+    while frontier:
+        step += 1
+        if len(frontier) >= _VECTOR_FRONTIER:
+            current = np.zeros(height * width, dtype=bool)
+            current[frontier] = True
+            current = current.reshape(shape)
+            reached = np.zeros(shape, dtype=bool)
+            for dx, dy, allowed in masks:
+                reached |= _shift(current & allowed, dx, dy)
+            reached &= ~visited_grid
+            visited_grid[reached] = True
+            frontier = np.flatnonzero(reached).tolist()
+        else:
+            nxt = []
+            for index in frontier:
+                for delta, allowed in zip(deltas, allowed_flat):
+                    if allowed[index]:
+                        target = index + delta
+                        if not visited[target]:
+                            visited[target] = 1
+                            nxt.append(target)
+            frontier = nxt
+        dist[frontier] = step
+    return dist.reshape(shape)
+
+
+def _dijkstra(
+    grid: np.ndarray,
+    masks: Sequence[Tuple[int, int, np.ndarray]],
+    source: Tuple[int, int],
+) -> np.ndarray:
+    """Weighted distances from ``source`` where entering a tile costs its value."""
+    dist = np.full(grid.shape, np.inf, dtype=np.float32)
+    dist[source[1], source[0]] = 0
+    heap: list[tuple[float, int, int]] = [(0.0, source[0], source[1])]
+    while heap:
+        d, x, y = heapq.heappop(heap)
+        if d > dist[y, x]:
+            continue
+        for dx, dy, allowed in masks:
+            if not allowed[y, x]:
+                continue
+            nx, ny = x + dx, y + dy
+            nd = d + float(grid[ny, nx])
+            if nd < dist[ny, nx]:
+                dist[ny, nx] = nd
+                heapq.heappush(heap, (nd, nx, ny))
+    return dist
+
+
+class LandmarkTable:
+    """Distance tables from selected landmarks over a static walkability grid.
+
+    ``grid`` follows the :func:`runepy.pathfinding.a_star` conventions: non-zero
+    values are walkable and, with ``weighted`` enabled, give the cost of
+    entering a tile. ``neighbor_offsets`` should be symmetric, as the default
+    eight-way move set is. Landmarks are chosen by farthest-point selection so
+    they end up spread along the edges and dead ends of the map, which is
+    where they give the best bounds.
+    """
+
+    def __init__(
+        self,
+        grid: Union[list, np.ndarray],
+        count: int = 8,
+        neighbor_offsets: Iterable[Tuple[int, int]] | None = None,
+        weighted: bool = False,
+        landmarks: Iterable[Tuple[int, int]] | None = None,
+    ) -> None:
+        self.grid = np.asarray(grid)
+        self.weighted = weighted
+        walkable = self.grid != 0
+        offsets = DEFAULT_OFFSETS if neighbor_offsets is None else tuple(neighbor_offsets)
+        self._masks = move_masks(walkable, offsets)
+        self.landmarks: List[Tuple[int, int]] = []
+        self.distances = np.empty((0,) + self.grid.shape, dtype=np.float32)
+        if landmarks is not None:
+            for landmark in landmarks:
+                self._add(landmark)
+        else:
+            self._select(walkable, count)
+
+    # ------------------------------------------------------------------
+    # Construction helpers
+    # ------------------------------------------------------------------
+    def _distances_from(self, source: Tuple[int, int]) -> np.ndarray:
+        if self.weighted:
+            return _dijkstra(self.grid, self._masks, source)
+        return _bfs(self.grid.shape, self._masks, source)
+
+    def _add(self, landmark: Tuple[int, int]) -> np.ndarray:
+        dist = self._distances_from(landmark)
+        self.landmarks.append((int(landmark[0]), int(landmark[1])))
+        self.distances = np.concatenate([self.distances, dist[None]], axis=0)
+        return dist
+
+    def _select(self, walkable: np.ndarray, count: int) -> None:
+        ys, xs = np.nonzero(walkable)
+        if len(xs) == 0 or count <= 0:
+            return
+        # Seed from an arbitrary tile, then repeatedly take the tile farthest
+        # from every landmark chosen so far.
+        seed = (int(xs[len(xs) // 2]), int(ys[len(ys) // 2]))
+        score = self._distances_from(seed)
+        for _ in range(count):
+            finite = np.where(np.isfinite(score), score, -1.0)
+            idx = int(np.argmax(finite))
+            y, x = divmod(idx, self.grid.shape[1])
+            if finite[y, x] <= 0 and self.landmarks:
+                break
+            dist = self._add((x, y))
+            score = dist if len(self.landmarks) == 1 else np.minimum(score, dist)
+        logger.debug("Selected %d landmarks: %s", len(self.landmarks), self.landmarks)
+
+    # ------------------------------------------------------------------
+    # Heuristics
+    # ------------------------------------------------------------------
+    def lower_bounds(self, goal: Tuple[int, int]) -> np.ndarray:
+        """Return a map of admissible distance estimates to ``goal``.
+
+        Tiles that cannot reach ``goal`` receive ``inf`` so the search never
+        expands them.
+        """
+        gx, gy = goal
+        to_goal = self.distances[:, gy, gx][:, None, None]
+        with np.errstate(invalid="ignore"):
+            bound = to_goal - self.distances
+            if not self.weighted:
+                # Moves are symmetric, so the reverse bound also holds.
+                bound = np.abs(bound)
+        # inf - inf means neither tile is reachable from this landmark, which
+        # carries no information.
+        bound = np.nan_to_num(bound, nan=0.0, posinf=np.inf, neginf=0.0)
+        if len(self.landmarks) == 0:
+            return np.zeros(self.grid.shape, dtype=np.float32)
+        return np.maximum(bound.max(axis=0), 0.0)
+
+    def heuristic_for(
+        self, goal: Tuple[int, int]
+    ) -> Callable[[Tuple[int, int], Tuple[int, int]], float]:
+        """Return a heuristic callable for :func:`runepy.pathfinding.a_star`."""
+        bounds = self.lower_bounds(goal)
+
+        def heuristic(a: Tuple[int, int], b: Tuple[int, int]) -> float:
+            chebyshev = max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+            return max(float(bounds[a[1], a[0]]), chebyshev)
+
+        return heuristic
+
+
+class LandmarkCache:
+    """Keep :class:`LandmarkTable` objects for stitched windows of regions.
+
+    Tables are keyed by the window origin and shape and remember a stamp of
+    ``((rx, ry), revision)`` pairs for the regions they were built from. A
+    table is rebuilt when any of those regions has been edited since, or when
+    :meth:`invalidate_region` drops it explicitly.
+    """
+
+    def __init__(self, count: int = 8, max_entries: int | None = 16) -> None:
+        self.count = count
+        self.max_entries = max_entries
+        self._tables: Dict[Hashable, Tuple[tuple, LandmarkTable]] = {}
+
+    def get(
+        self,
+        grid: Union[list, np.ndarray],
+        key: Hashable,
+        stamp: tuple = (),
+        weighted: bool = False,
+    ) -> LandmarkTable:
+        """Return the table for ``key`` building it from ``grid`` when stale."""
+        entry = self._tables.get(key)
+        if entry is not None and entry[0] == stamp and entry[1].weighted == weighted:
+            return entry[1]
+        table = LandmarkTable(grid, count=self.count, weighted=weighted)
+        self._tables.pop(key, None)
+        self._tables[key] = (stamp, table)
+        if self.max_entries is not None and len(self._tables) > self.max_entries:
+            self._tables.pop(next(iter(self._tables)))
+        return table
+
+    def invalidate_region(self, rx: int, ry: int) -> None:
+        """Drop every table built from region ``(rx, ry)``."""
+        for key, (stamp, _table) in list(self._tables.items()):
+            if any(region == (rx, ry) for region, _rev in stamp):
+                self._tables.pop(key)
+
+    def clear(self) -> None:
+        """Drop all cached tables."""
+        self._tables.clear()
@@ -19,6 +19,10 @@ class MapEditor:
 
     def _get_mouse_tile(self):
         """Return the tile coordinates under the mouse or ``None``."""
+        picker = getattr(self.client, "tile_picker", None)
+        if picker is not None:
+            pick = picker.pick()
+            return None if pick is None else (pick.tile_x, pick.tile_y)
         tile_x, tile_y = get_tile_from_mouse(
             self.client.mouseWatcherNode,
             self.client.camera,
@@ -48,7 +52,7 @@ class MapEditor:
     def _toggle_region_value(self, tile_x: int, tile_y: int, array_name: str) -> None:
         """Toggle a value within a region array and refresh the mesh."""
         rx, ry = world_to_region(tile_x, tile_y)
-        region = self.world.region_manager.loaded.get((rx, ry))
+        region = self.world.region_manager.region_at(tile_x, tile_y)
         if region is None:
             self.world.region_manager.ensure(tile_x, tile_y)
             region = self.world.region_manager.loaded.get((rx, ry))
@@ -57,15 +61,20 @@ class MapEditor:
         lx, ly = local_tile(tile_x, tile_y)
         array = getattr(region, array_name)
         array[ly, lx] ^= 1
-        region.make_mesh()
-        if region.node is not None:
-            parent = getattr(self.client, "tile_root", self.client.render)
-            region.node.reparentTo(parent)
-            region.node.setPos(
-                region.rx * REGION_SIZE,
-                region.ry * REGION_SIZE,
-                0,
-            )
+        region.touch()
+        if region.instances is not None:
+            region.instances.update_tile(lx, ly)
+        if not region.rebuild_chunk(lx, ly):
+            region.make_mesh()
+            if region.node is not None:
+                parent = getattr(self.client, "tile_root", self.client.render)
+                region.node.reparentTo(parent)
+                region.node.setPos(
+                    region.rx * REGION_SIZE,
+                    region.ry * REGION_SIZE,
+                    0,
+                )
+        self.world.region_manager.rebuild_border(tile_x, tile_y)
 
     def toggle_tile(self):
         if self.client.options_menu.visible:
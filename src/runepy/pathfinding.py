@@ -3,21 +3,33 @@
 import heapq
 import logging
 import math
-from typing import Iterable, Tuple, Union
+from typing import Callable, Iterable, Tuple, Union
 
 import numpy as np
 from direct.interval.IntervalGlobal import Func, Sequence
 from panda3d.core import Vec3
 
+from constants import REGION_SIZE
+from runepy.landmarks import LandmarkCache
+
 logger = logging.getLogger(__name__)
 
 
+def chebyshev(a: Tuple[int, int], b: Tuple[int, int]) -> int:
+    """Return the Chebyshev distance between grid coordinates ``a`` and ``b``."""
+    dx = abs(a[0] - b[0])
+    dy = abs(a[1] - b[1])
+    return max(dx, dy)
+
+
 def a_star(
     grid: Union[list, np.ndarray],
     start: Tuple[int, int],
     end: Tuple[int, int],
     neighbor_offsets: Iterable[Tuple[int, int]] | None = None,
     weighted: bool = False,
+    heuristic: Callable[[Tuple[int, int], Tuple[int, int]], float] | None = None,
+    stats: dict | None = None,
 ):
     """Perform A* pathfinding on ``grid`` and return the path as a list.
 
@@ -25,12 +37,14 @@ def a_star(
     indicating walkable tiles. ``start`` and ``end`` are grid coordinates using
     ``(x, y)`` ordering starting at ``(0, 0)``. If no path exists, ``None`` is
     returned.
+
+    ``heuristic`` replaces the default Chebyshev estimate, for example with
+    :meth:`runepy.landmarks.LandmarkTable.heuristic_for`. When ``stats`` is a
+    dictionary the number of expanded nodes is stored under ``"expanded"``.
     """
 
-    def heuristic(a: Tuple[int, int], b: Tuple[int, int]) -> int:
-        dx = abs(a[0] - b[0])
-        dy = abs(a[1] - b[1])
-        return max(dx, dy)
+    if heuristic is None:
+        heuristic = chebyshev
 
     # Use numpy for fast indexing regardless of the initial grid type.
     grid = np.asarray(grid)
@@ -54,6 +68,8 @@ def a_star(
     open_dict: dict[Tuple[int, int], tuple[float, Tuple[int, int] | None]] = {}
     closed_set: set[Tuple[int, int]] = set()
 
+    if stats is not None:
+        stats["expanded"] = 0
     start_h = heuristic(start, end)
     open_dict[start] = (0.0, None)
     heapq.heappush(open_heap, (start_h, start))
@@ -75,6 +91,8 @@ def a_star(
             return path[::-1]
 
         closed_set.add(current)
+        if stats is not None:
+            stats["expanded"] = len(closed_set)
 
         cx, cy = current
         nx = cx + offsets_arr[:, 0]
@@ -102,6 +120,8 @@ def a_star(
                 continue
             g_score = g + int(step_cost)
             h_score = heuristic(neighbor, end)
+            if h_score == math.inf:
+                continue
             existing = open_dict.get(neighbor)
             if existing is not None and g_score >= existing[0]:
                 continue
@@ -111,19 +131,223 @@ def a_star(
     return None
 
 
+def _predecessors(grid, node, offsets_arr, start, weighted):
+    """Yield ``(prev, cost)`` for moves ``prev -> node`` allowed by ``a_star``.
+
+    The cost is that of entering ``node``; diagonal moves that cut a blocked
+    corner are pruned exactly as in the forward search.
+    """
+    height, width = grid.shape[:2]
+    vx, vy = node
+    if grid[vy, vx] == 0:
+        return
+    cost = int(grid[vy, vx]) if weighted else 1
+    for dx, dy in offsets_arr:
+        ux, uy = vx - int(dx), vy - int(dy)
+        if not (0 <= ux < width and 0 <= uy < height):
+            continue
+        if grid[uy, ux] == 0 and (ux, uy) != start:
+            continue
+        if dx and dy and (grid[uy, vx] == 0 or grid[vy, ux] == 0):
+            continue
+        yield (ux, uy), cost
+
+
+def _successors(grid, node, offsets_arr, weighted):
+    """Yield ``(next, cost)`` for moves out of ``node``."""
+    height, width = grid.shape[:2]
+    ux, uy = node
+    for dx, dy in offsets_arr:
+        vx, vy = ux + int(dx), uy + int(dy)
+        if not (0 <= vx < width and 0 <= vy < height):
+            continue
+        value = grid[vy, vx]
+        if value == 0:
+            continue
+        if dx and dy and (grid[uy, vx] == 0 or grid[vy, ux] == 0):
+            continue
+        yield (vx, vy), int(value) if weighted else 1
+
+
+def bidirectional_a_star(
+    grid: Union[list, np.ndarray],
+    start: Tuple[int, int],
+    end: Tuple[int, int],
+    neighbor_offsets: Iterable[Tuple[int, int]] | None = None,
+    weighted: bool = False,
+    stats: dict | None = None,
+):
+    """Search from both ends of the path at once and return it as a list.
+
+    Takes the same arguments as :func:`a_star` and follows the same movement
+    and corner cutting rules. The forward search is guided towards ``end``
+    and the backward search towards ``start``; the smaller frontier is
+    expanded each turn. The search stops once the cheapest open node of
+    either side can no longer improve on the best meeting point found,
+    which keeps the returned path optimal. Long corridors are covered by two
+    narrow frontiers instead of one that fans out near the goal.
+    """
+    grid = np.asarray(grid)
+    if neighbor_offsets is None:
+        neighbor_offsets = [
+            (0, -1),
+            (1, 0),
+            (0, 1),
+            (-1, 0),
+            (-1, -1),
+            (1, 1),
+            (-1, 1),
+            (1, -1),
+        ]
+    offsets_arr = [(int(dx), int(dy)) for dx, dy in neighbor_offsets]
+    start = (int(start[0]), int(start[1]))
+    end = (int(end[0]), int(end[1]))
+    if stats is not None:
+        stats["expanded"] = 0
+    if start == end:
+        return [start]
+
+    g_fwd: dict[Tuple[int, int], float] = {start: 0}
+    g_bwd: dict[Tuple[int, int], float] = {end: 0}
+    parent_fwd: dict[Tuple[int, int], Tuple[int, int] | None] = {start: None}
+    parent_bwd: dict[Tuple[int, int], Tuple[int, int] | None] = {end: None}
+    heap_fwd: list[tuple[float, Tuple[int, int]]] = [(chebyshev(start, end), start)]
+    heap_bwd: list[tuple[float, Tuple[int, int]]] = [(chebyshev(end, start), end)]
+    closed_fwd: set[Tuple[int, int]] = set()
+    closed_bwd: set[Tuple[int, int]] = set()
+    best = math.inf
+    meet: Tuple[int, int] | None = None
+
+    def top(heap, closed):
+        while heap and heap[0][1] in closed:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else math.inf
+
+    while True:
+        top_fwd = top(heap_fwd, closed_fwd)
+        top_bwd = top(heap_bwd, closed_bwd)
+        if max(top_fwd, top_bwd) >= best or (not heap_fwd and not heap_bwd):
+            break
+        if not heap_fwd or not heap_bwd:
+            break
+        forward = len(heap_fwd) <= len(heap_bwd)
+        if forward:
+            _f, current = heapq.heappop(heap_fwd)
+            closed_fwd.add(current)
+            moves = _successors(grid, current, offsets_arr, weighted)
+            g_here, g_mine, g_other = g_fwd[current], g_fwd, g_bwd
+            parents, heap, target, closed = parent_fwd, heap_fwd, end, closed_fwd
+        else:
+            _f, current = heapq.heappop(heap_bwd)
+            closed_bwd.add(current)
+            moves = _predecessors(grid, current, offsets_arr, start, weighted)
+            g_here, g_mine, g_other = g_bwd[current], g_bwd, g_fwd
+            parents, heap, target, closed = parent_bwd, heap_bwd, start, closed_bwd
+
+        for neighbor, cost in moves:
+            if neighbor in closed:
+                continue
+            g_score = g_here + cost
+            if g_score >= g_mine.get(neighbor, math.inf):
+                continue
+            g_mine[neighbor] = g_score
+            parents[neighbor] = current
+            heapq.heappush(heap, (g_score + chebyshev(neighbor, target), neighbor))
+            other = g_other.get(neighbor)
+            if other is not None and g_score + other < best:
+                best = g_score + other
+                meet = neighbor
+
+    if stats is not None:
+        stats["expanded"] = len(closed_fwd) + len(closed_bwd)
+    if meet is None:
+        return None
+    path = []
+    pos: Tuple[int, int] | None = meet
+    while pos is not None:
+        path.append(pos)
+        pos = parent_fwd[pos]
+    path.reverse()
+    pos = parent_bwd[meet]
+    while pos is not None:
+        path.append(pos)
+        pos = parent_bwd[pos]
+    return path
+
+
 class Pathfinder:
     """Helper to compute paths and move a character along them."""
 
-    def __init__(self, character, world, camera_control, debug=False):
+    def __init__(
+        self,
+        character,
+        world,
+        camera_control,
+        debug=False,
+        use_landmarks=False,
+        landmark_count=8,
+        bidirectional_distance=REGION_SIZE,
+        max_planning_margin=2 * REGION_SIZE,
+        max_planning_regions=1024,
+    ):
         self.character = character
         self.world = world
         self.camera_control = camera_control
         self.debug = debug
+        self.use_landmarks = use_landmarks
+        self.landmarks = LandmarkCache(count=landmark_count)
+        # Paths at least this many tiles long (Chebyshev) are searched from
+        # both ends; ``None`` always uses plain A*.
+        self.bidirectional_distance = bidirectional_distance
+        self.max_planning_margin = max_planning_margin
+        self.max_planning_regions = max_planning_regions
 
     def log(self, *args, **kwargs):
         if self.debug:
             logger.debug(*args, **kwargs)
 
+    def find_path(self, grid, start, end, heuristic=None):
+        """Return a path on ``grid`` using the engine best suited to the query.
+
+        An explicit ``heuristic`` (such as landmarks) always uses
+        :func:`a_star`. Otherwise far apart endpoints use
+        :func:`bidirectional_a_star`.
+        """
+        far = (
+            self.bidirectional_distance is not None
+            and chebyshev(start, end) >= self.bidirectional_distance
+        )
+        if heuristic is None and far:
+            return bidirectional_a_star(grid, start, end)
+        return a_star(grid, start, end, heuristic=heuristic)
+
+    def plan_path(self, start, goal):
+        """Plan a path between two world tiles at any distance.
+
+        The search grid covers the bounding box of ``start`` and ``goal`` and
+        grows by a region on every side while no path is found, up to
+        ``max_planning_margin`` tiles. Only the ``flags`` layer of the covered
+        regions is read through :attr:`World.flags_store`, so nothing is
+        meshed or added to the render streaming cache. Returns
+        ``(path, offset_x, offset_y)`` with the path in grid coordinates.
+        """
+        store = self.world.flags_store
+        margin = 0
+        while True:
+            span_x = abs(goal[0] - start[0]) + 2 * margin
+            span_y = abs(goal[1] - start[1]) + 2 * margin
+            regions = (span_x // REGION_SIZE + 2) * (span_y // REGION_SIZE + 2)
+            if regions > self.max_planning_regions:
+                self.log("Planning window too large:", regions)
+                return None, 0, 0
+            grid, off_x, off_y = store.walkable_between(start, goal, margin)
+            start_idx = (start[0] - off_x, start[1] - off_y)
+            end_idx = (goal[0] - off_x, goal[1] - off_y)
+            path = self.find_path(grid, start_idx, end_idx)
+            if path is not None or margin >= self.max_planning_margin:
+                return path, off_x, off_y
+            margin += REGION_SIZE
+
     def move_along_path(self, target_x: int, target_y: int) -> None:
         """Find a path to ``(target_x, target_y)`` and move the character."""
         current_pos = self.character.get_position()
@@ -139,7 +363,17 @@ class Pathfinder:
         start_idx = (current_x - off_x, current_y - off_y)
         end_idx = (target_x - off_x, target_y - off_y)
 
-        path = a_star(stitched, start_idx, end_idx)
+        heuristic = None
+        in_window = 0 <= end_idx[0] < stitched.shape[1] and 0 <= end_idx[1] < stitched.shape[0]
+        if not in_window:
+            path, off_x, off_y = self.plan_path((current_x, current_y), (target_x, target_y))
+            start_idx = (current_x - off_x, current_y - off_y)
+        else:
+            if self.use_landmarks:
+                stamp = self.world.window_stamp(current_x, current_y)
+                table = self.landmarks.get(stitched, (off_x, off_y, stitched.shape), stamp)
+                heuristic = table.heuristic_for(end_idx)
+            path = self.find_path(stitched, start_idx, end_idx, heuristic=heuristic)
         self.log("Calculated Path:", path)
         if not path:
             return
@@ -149,6 +383,9 @@ class Pathfinder:
             self.log("Already at destination")
             return
 
+        route = [(current_x, current_y)] + [(x + off_x, y + off_y) for x, y in path]
+        self.world.prefetch_route(route, self.character.speed)
+
         intervals = []
         prev_x, prev_y = current_pos.getX(), current_pos.getY()
         for step in path:
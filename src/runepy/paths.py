@@ -3,4 +3,7 @@ from pathlib import Path
 # Directory containing map data files
 MAPS_DIR = Path("maps")
 
-__all__ = ["MAPS_DIR"]
+# Directory holding baked region meshes
+MESH_CACHE_DIR = Path("cache") / "meshes"
+
+__all__ = ["MAPS_DIR", "MESH_CACHE_DIR"]
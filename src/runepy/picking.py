@@ -0,0 +1,299 @@
+"""Mouse picking of world tiles by ray intersection.
+
+Picking casts the camera ray under the mouse against the terrain surface in
+plain math instead of traversing collision geometry, so its cost does not
+depend on the size of the scene graph.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+
+try:
+    from panda3d.core import ClockObject, Point3
+except Exception:  # pragma: no cover - Panda3D may be missing during tests
+    ClockObject = Point3 = None
+
+Vec3Tuple = Tuple[float, float, float]
+#: ``((x0, y0, x1, y1), (z_min, z_max))``: the tile rectangle outside which
+#: the terrain is flat at height ``0``, and the range of heights inside it.
+Extent = Tuple[Tuple[float, float, float, float], Tuple[float, float]]
+#: Heights at the ``(x, y)``, ``(x + 1, y)``, ``(x, y + 1)`` and ``(x + 1, y + 1)`` corners.
+Corners = Tuple[float, float, float, float]
+#: Returns where the segment from ``near`` to ``far`` first meets the terrain.
+Surface = Callable[[Vec3Tuple, Vec3Tuple], Optional[Vec3Tuple]]
+
+
+@dataclass(frozen=True)
+class TilePick:
+    """Result of a pick: the mouse position and the world point under it."""
+
+    mpos: Any
+    x: float
+    y: float
+    z: float
+
+    @property
+    def tile_x(self) -> int:
+        return math.floor(self.x)
+
+    @property
+    def tile_y(self) -> int:
+        return math.floor(self.y)
+
+
+def mouse_ray(mouse_watcher, camera, render) -> Optional[Tuple[Any, Vec3Tuple, Vec3Tuple]]:
+    """Return ``(mpos, near, far)`` for the camera ray under the mouse.
+
+    ``near`` and ``far`` are the ray's points on the lens near and far planes
+    in ``render`` space. Returns ``None`` without a mouse or camera.
+    """
+    if not mouse_watcher or not mouse_watcher.hasMouse():
+        return None
+    if not camera or not render:
+        return None
+    mpos = mouse_watcher.getMouse()
+    node = camera.node()
+    if hasattr(node, "getLens"):
+        lens = node.getLens()
+    else:
+        cam = camera.find("**/+Camera")
+        if cam.isEmpty():
+            return None
+        lens = cam.node().getLens()
+    near = Point3()
+    far = Point3()
+    if not lens.extrude(mpos, near, far):
+        return None
+    near = render.getRelativePoint(camera, near)
+    far = render.getRelativePoint(camera, far)
+    return mpos, tuple(near), tuple(far)
+
+
+def ground_plane(near: Vec3Tuple, far: Vec3Tuple, z: float = 0.0) -> Optional[Vec3Tuple]:
+    """Intersect the ray from ``near`` through ``far`` with the plane at height ``z``."""
+    dz = far[2] - near[2]
+    if dz == 0:
+        return None
+    t = (z - near[2]) / dz
+    if t < 0:
+        return None
+    return near[0] + t * (far[0] - near[0]), near[1] + t * (far[1] - near[1]), z
+
+
+def corner_height(corners: Corners, u: float, v: float) -> float:
+    """Return the smooth surface height at ``(u, v)`` within a tile.
+
+    The tile is split along its ``(0, 0)``–``(1, 1)`` diagonal into the same
+    two triangles :func:`~runepy.world.meshing.build_grid_geom` draws.
+    """
+    z00, z10, z01, z11 = corners
+    if u >= v:
+        return z00 + u * (z10 - z00) + v * (z11 - z10)
+    return z00 + v * (z01 - z00) + u * (z11 - z01)
+
+
+def _corner_hit(ox, oy, oz, dx, dy, dz, x, y, t0, t1, corners: Corners) -> Optional[float]:
+    """Return the first ``t`` in ``[t0, t1]`` where the ray meets the triangles of tile ``(x, y)``."""
+    # Along the ray the surface is linear on each side of the diagonal
+    ts = [t0]
+    du = dx - dy
+    if du:
+        t = (oy - y - (ox - x)) / du
+        if t0 < t < t1:
+            ts.append(t)
+    ts.append(t1)
+
+    def gap(t):
+        u = min(max(ox + t * dx - x, 0.0), 1.0)
+        v = min(max(oy + t * dy - y, 0.0), 1.0)
+        return oz + t * dz - corner_height(corners, u, v)
+
+    a = gap(ts[0])
+    if a <= 0:
+        return ts[0]
+    for ta, tb in zip(ts, ts[1:]):
+        b = gap(tb)
+        if b <= 0:
+            return ta + a / (a - b) * (tb - ta)
+        a = b
+    return None
+
+
+def _clip(near: Vec3Tuple, far: Vec3Tuple, extent: Extent) -> Tuple[float, float]:
+    """Return the ``t`` interval where the ray lies inside ``extent``, empty if ``t0 > t1``."""
+    (x0, y0, x1, y1), (z_min, z_max) = extent
+    t0, t1 = 0.0, 1.0
+    for lo, hi, o, f in ((x0, x1, near[0], far[0]), (y0, y1, near[1], far[1]), (z_min, z_max, near[2], far[2])):
+        d = f - o
+        if d == 0:
+            if not lo <= o <= hi:
+                return 1.0, 0.0
+            continue
+        ta, tb = (lo - o) / d, (hi - o) / d
+        t0, t1 = max(t0, min(ta, tb)), min(t1, max(ta, tb))
+    return t0, t1
+
+
+def heightfield_hit(
+    near: Vec3Tuple,
+    far: Vec3Tuple,
+    height_at: Callable[[int, int], float],
+    max_tiles: int = 4096,
+    corners_at: Callable[[int, int], Optional[Corners]] | None = None,
+    extent: Extent | None = None,
+) -> Optional[Vec3Tuple]:
+    """Return where the ray from ``near`` through ``far`` first hits the terrain.
+
+    Tiles are columns of height ``height_at(x, y)``. The ray is walked across
+    the tile grid with a DDA (Amanatides–Woo) traversal, visiting only the
+    tiles it crosses, up to the far point or ``max_tiles`` tiles. Within a
+    tile the ray hits the top face where it descends below the tile height,
+    or the side if it enters below it. Tiles for which ``corners_at``
+    returns corner heights are smooth instead, and the ray is intersected
+    with their two triangles. The returned point lies inside the hit tile,
+    so flooring it gives the tile.
+
+    With an ``extent`` only the part of the ray inside its rectangle and
+    height range is walked; outside it the ray is intersected with the
+    ground plane directly, so rays towards the horizon or beyond the loaded
+    terrain cost no more than the tiles they could hit.
+    """
+    if extent is None:
+        return _march(near, far, height_at, max_tiles, corners_at)
+    d = [f - n for n, f in zip(near, far)]
+    ground = ground_plane(near, far)
+    tg = -near[2] / d[2] if ground is not None else math.inf
+    (x0, y0, x1, y1), _heights = extent
+    if tg > 1.0 or (x0 <= ground[0] <= x1 and y0 <= ground[1] <= y1):
+        # Beyond the far point, or inside the rectangle where the walk finds it
+        ground = None
+    t0, t1 = _clip(near, far, extent)
+    if t0 <= t1:
+        if ground is not None and tg < t0:
+            return ground
+        start = tuple(n + t0 * e for n, e in zip(near, d))
+        end = tuple(n + t1 * e for n, e in zip(near, d))
+        hit = _march(start, end, height_at, max_tiles, corners_at)
+        if hit is not None:
+            return hit
+    return ground
+
+
+def _march(
+    near: Vec3Tuple,
+    far: Vec3Tuple,
+    height_at: Callable[[int, int], float],
+    max_tiles: int,
+    corners_at: Callable[[int, int], Optional[Corners]] | None,
+) -> Optional[Vec3Tuple]:
+    ox, oy, oz = near
+    dx, dy, dz = far[0] - ox, far[1] - oy, far[2] - oz
+    x, y = math.floor(ox), math.floor(oy)
+    step_x = 1 if dx > 0 else -1
+    step_y = 1 if dy > 0 else -1
+    # Ray parameter at the next vertical and horizontal grid line
+    next_x = ((x + (dx > 0) - ox) / dx) if dx else math.inf
+    next_y = ((y + (dy > 0) - oy) / dy) if dy else math.inf
+    delta_x = abs(1 / dx) if dx else math.inf
+    delta_y = abs(1 / dy) if dy else math.inf
+
+    t0 = 0.0
+    for _ in range(max_tiles):
+        if t0 > 1.0:
+            return None
+        t1 = min(next_x, next_y, 1.0)
+        corners = corners_at(x, y) if corners_at is not None else None
+        if corners is not None:
+            t = _corner_hit(ox, oy, oz, dx, dy, dz, x, y, t0, t1, corners)
+            z = None if t is None else oz + t * dz
+        else:
+            h = height_at(x, y)
+            z0 = oz + t0 * dz
+            z1 = oz + t1 * dz
+            if z0 <= h:
+                t, z = t0, z0
+            elif z1 <= h:
+                t, z = t0 + (z0 - h) / (z0 - z1) * (t1 - t0), h
+            else:
+                t = None
+        if t is None:
+            if next_x < next_y:
+                t0 = next_x
+                next_x += delta_x
+                x += step_x
+            else:
+                t0 = next_y
+                next_y += delta_y
+                y += step_y
+            continue
+        # Keep the point inside the tile even when it lies on its border
+        px = min(max(ox + t * dx, x), x + 1 - 1e-6)
+        py = min(max(oy + t * dy, y), y + 1 - 1e-6)
+        return px, py, z
+    return None
+
+
+def heightfield_surface(
+    height_at: Callable[[int, int], float],
+    max_tiles: int = 4096,
+    corners_at: Callable[[int, int], Optional[Corners]] | None = None,
+    extent: Callable[[], Optional[Extent]] | None = None,
+) -> Surface:
+    """Return a :class:`TilePicker` surface ray marching ``height_at``.
+
+    ``corners_at`` supplies the corner heights of smooth tiles and
+    ``extent`` is called once per pick for the loaded terrain extent, see
+    :func:`heightfield_hit`.
+    """
+
+    def surface(near: Vec3Tuple, far: Vec3Tuple) -> Optional[Vec3Tuple]:
+        bounds = extent() if extent is not None else None
+        return heightfield_hit(near, far, height_at, max_tiles, corners_at, bounds)
+
+    return surface
+
+
+class TilePicker:
+    """Shared picking service evaluated at most once per frame.
+
+    Hover highlighting, click-to-move and the debug overlay all call
+    :meth:`pick`; the first call in a frame intersects the mouse ray with
+    ``surface`` (the ground plane by default) and later calls in the same
+    frame return the cached result.
+    """
+
+    def __init__(self, mouse_watcher, camera, render, surface: Surface | None = None, clock=None) -> None:
+        self.mouse_watcher = mouse_watcher
+        self.camera = camera
+        self.render = render
+        self.surface = surface or ground_plane
+        if clock is None and ClockObject is not None:
+            clock = ClockObject.getGlobalClock()
+        self.clock = clock
+        self._frame: int | None = None
+        self._pick: TilePick | None = None
+
+    def invalidate(self) -> None:
+        """Forget the cached pick, e.g. after moving the camera mid-frame."""
+        self._frame = None
+
+    def pick(self) -> TilePick | None:
+        """Return the world point under the mouse for this frame, or ``None``."""
+        frame = self.clock.getFrameCount() if self.clock is not None else None
+        if frame is None or frame != self._frame:
+            self._pick = self._compute()
+            self._frame = frame
+        return self._pick
+
+    def _compute(self) -> TilePick | None:
+        ray = mouse_ray(self.mouse_watcher, self.camera, self.render)
+        if ray is None:
+            return None
+        mpos, near, far = ray
+        hit = self.surface(near, far)
+        if hit is None:
+            return None
+        return TilePick(mpos, *hit)
@@ -52,7 +52,7 @@ class TextureEditor:
             self._click_ctx = suspend_mouse_click(self.base)
             self._click_ctx.__enter__()
         rx, ry = world_to_region(tile_x, tile_y)
-        region = self.world.region_manager.loaded.get((rx, ry))
+        region = self.world.region_manager.region_at(tile_x, tile_y)
         if region is None:
             self.world.region_manager.ensure(tile_x, tile_y)
             region = self.world.region_manager.loaded.get((rx, ry))
@@ -90,10 +90,16 @@ class TextureEditor:
         if self.region is None:
             return
         self.region.textures[self.ly, self.lx, py, px] = self.selected_color
+        self.region.touch()
         if self.frame is not None:
             btn = self._grid_buttons[py][px]
             if btn is not None and hasattr(btn, '__setitem__'):
                 btn['frameColor'] = (self.selected_color / 255.0,) * 3 + (1,)
+        if self.region.node is not None:
+            self.region.update_texture_tile(self.lx, self.ly)
+            return
+        # Without a mesh the cached texture is not patched; rebuild it
+        self.region.texture = None
         self.region.make_mesh()
         if self.region.node is not None and hasattr(self.base, 'render'):
             parent = getattr(self.base, 'tile_root', self.base.render)
@@ -2,7 +2,9 @@
 import math
 from contextlib import contextmanager
 
-from panda3d.core import MouseWatcher, Plane, Point3, Vec3
+from panda3d.core import MouseWatcher
+
+from runepy.picking import ground_plane, mouse_ray
 
 
 def get_mouse_tile_coords(
@@ -15,29 +17,12 @@ def get_mouse_tile_coords(
     ``camera`` and ``render`` should be the current camera node and the
     render root so the mouse ray can be projected into world space.
     """
-    if mouse_watcher and mouse_watcher.hasMouse():
-        if not camera or not render:
-            return None, None, None
-        mpos = mouse_watcher.getMouse()
-        node = camera.node()
-        if hasattr(node, "getLens"):
-            lens = node.getLens()
-        else:
-            cam = camera.find("**/+Camera")
-            if cam.isEmpty():
-                return None, None, None
-            lens = cam.node().getLens()
-        near = Point3()
-        far = Point3()
-        lens.extrude(mpos, near, far)
-        near_world = render.getRelativePoint(camera, near)
-        far_world = render.getRelativePoint(camera, far)
-        plane = Plane(Vec3(0, 0, 1), Point3(0, 0, 0))
-        intersection = Point3()
-        if plane.intersectsLine(intersection, near_world, far_world):
-            tile_x = math.floor(intersection.getX())
-            tile_y = math.floor(intersection.getY())
-            return mpos, tile_x, tile_y
+    ray = mouse_ray(mouse_watcher, camera, render)
+    if ray is not None:
+        mpos, near, far = ray
+        hit = ground_plane(near, far)
+        if hit is not None:
+            return mpos, math.floor(hit[0]), math.floor(hit[1])
     return None, None, None
 
 
@@ -52,10 +37,19 @@ def update_tile_hover(
     render,
     world,
     debug=None,
+    picker=None,
 ) -> tuple:
-    """Highlight the tile under the mouse and optionally update debug info."""
+    """Highlight the tile under the mouse and optionally update debug info.
 
-    mpos, tile_x, tile_y = get_mouse_tile_coords(mouse_watcher, camera, render)
+    With a :class:`~runepy.picking.TilePicker` the pick shared with the rest
+    of the frame is used.
+    """
+
+    if picker is not None:
+        pick = picker.pick()
+        mpos, tile_x, tile_y = (pick.mpos, pick.tile_x, pick.tile_y) if pick else (None, None, None)
+    else:
+        mpos, tile_x, tile_y = get_mouse_tile_coords(mouse_watcher, camera, render)
 
     if mpos:
         if debug is not None:
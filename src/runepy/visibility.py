@@ -0,0 +1,204 @@
+"""Line-of-sight and field-of-view queries over tile flag windows.
+
+All functions work on a boolean ``opaque`` grid indexed as ``[y, x]``, such as
+the one returned by :func:`opaque_mask` for a window from
+:meth:`runepy.world.world.World.flags_window`. Coordinates are ``(x, y)`` pairs
+local to that grid; tiles outside of it are treated as opaque.
+"""
+
+from __future__ import annotations
+
+import math
+from fractions import Fraction
+from typing import Iterable, List, Tuple, Union
+
+import numpy as np
+
+from runepy.terrain import FLAG_BLOCKED
+
+Coords = Union[Iterable[Tuple[int, int]], np.ndarray]
+
+
+def opaque_mask(flags: np.ndarray, mask: int = FLAG_BLOCKED) -> np.ndarray:
+    """Return a boolean grid of tiles in ``flags`` that block sight."""
+    return (np.asarray(flags) & mask) != 0
+
+
+def _gather(opaque: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Return ``opaque[ys, xs]`` treating coordinates outside the grid as opaque."""
+    height, width = opaque.shape
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    out = np.ones(xs.shape, dtype=bool)
+    out[inside] = opaque[ys[inside], xs[inside]]
+    return out
+
+
+def line_cells(
+    sources: Coords, targets: Coords, supercover: bool = True
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the tiles crossed by the segments from ``sources`` to ``targets``.
+
+    The result is ``(xs, ys, valid)`` where each array has one row per pair.
+    Rows are padded to the longest segment and ``valid`` marks real entries.
+    With ``supercover`` every tile touched by the segment between tile
+    centres is reported, including both tiles at corner crossings, which
+    makes the result independent of direction. Otherwise one tile per step
+    along the major axis is reported, as with Bresenham's algorithm.
+    """
+    src = np.asarray(sources, dtype=np.int64).reshape(-1, 2)
+    dst = np.asarray(targets, dtype=np.int64).reshape(-1, 2)
+    dx = dst[:, 0] - src[:, 0]
+    dy = dst[:, 1] - src[:, 1]
+    x_major = np.abs(dx) >= np.abs(dy)
+    length = np.maximum(np.abs(dx), np.abs(dy))
+    major = np.where(x_major, dx, dy)
+    minor = np.where(x_major, dy, dx)[:, None]
+    sign = np.where(major < 0, -1, 1)[:, None]
+    steps = np.arange(int(length.max(initial=0)) + 1)[None, :]
+    in_range = steps <= length[:, None]
+    span = np.maximum(length, 1)[:, None]
+
+    if supercover:
+        # Work in half-tile units along the major axis so the column band
+        # ``[i - 0.5, i + 0.5]`` of each step stays exact in integers.
+        lo = np.clip(2 * steps - 1, 0, 2 * length[:, None])
+        hi = np.clip(2 * steps + 1, 0, 2 * length[:, None])
+        a = minor * lo
+        b = minor * hi
+        m_min = np.minimum(a, b)
+        m_max = np.maximum(a, b)
+        first = -((span - m_min) // (2 * span))  # ceil(m - 0.5)
+        last = (m_max + span) // (2 * span)  # floor(m + 0.5)
+        offsets = first[:, :, None] + np.arange(3)[None, None, :]
+        valid = in_range[:, :, None] & (offsets <= last[:, :, None])
+        major_off = np.broadcast_to((sign * steps)[:, :, None], offsets.shape)
+        n = len(src)
+        offsets = offsets.reshape(n, -1)
+        major_off = major_off.reshape(n, -1)
+        valid = valid.reshape(n, -1)
+    else:
+        offsets = (minor * 2 * steps + span) // (2 * span)
+        major_off = sign * steps
+        valid = in_range
+
+    xm = x_major[:, None]
+    xs = src[:, 0:1] + np.where(xm, major_off, offsets)
+    ys = src[:, 1:2] + np.where(xm, offsets, major_off)
+    return xs, ys, valid
+
+
+def line_of_sight(
+    opaque: np.ndarray, sources: Coords, targets: Coords, supercover: bool = True
+) -> np.ndarray:
+    """Return a boolean array telling whether each source sees its target.
+
+    Only the tiles strictly between the two endpoints are tested, so an
+    opaque target (a wall) can still be seen. See :func:`line_cells` for the
+    meaning of ``supercover``.
+    """
+    opaque = np.asarray(opaque, dtype=bool)
+    src = np.asarray(sources, dtype=np.int64).reshape(-1, 2)
+    dst = np.asarray(targets, dtype=np.int64).reshape(-1, 2)
+    xs, ys, valid = line_cells(src, dst, supercover)
+    endpoint = ((xs == src[:, 0:1]) & (ys == src[:, 1:2])) | (
+        (xs == dst[:, 0:1]) & (ys == dst[:, 1:2])
+    )
+    blocked = _gather(opaque, xs, ys) & valid & ~endpoint
+    return ~blocked.any(axis=1)
+
+
+def has_line_of_sight(
+    opaque: np.ndarray, source: Tuple[int, int], target: Tuple[int, int]
+) -> bool:
+    """Return ``True`` if ``target`` is visible from ``source``."""
+    return bool(line_of_sight(opaque, [source], [target])[0])
+
+
+# ----------------------------------------------------------------------
+# Symmetric shadowcasting
+# ----------------------------------------------------------------------
+def _round_ties_up(value: Fraction) -> int:
+    return math.floor(value + Fraction(1, 2))
+
+
+def _round_ties_down(value: Fraction) -> int:
+    return math.ceil(value - Fraction(1, 2))
+
+
+def _quadrants(ox: int, oy: int):
+    """Yield functions mapping ``(depth, cols)`` to grid ``(xs, ys)``."""
+    yield lambda depth, cols: (ox + cols, oy - depth)
+    yield lambda depth, cols: (ox + cols, oy + depth)
+    yield lambda depth, cols: (ox + depth, oy + cols)
+    yield lambda depth, cols: (ox - depth, oy + cols)
+
+
+def field_of_view(
+    opaque: np.ndarray, origin: Tuple[int, int], radius: int | None = None
+) -> np.ndarray:
+    """Return a boolean mask of tiles visible from ``origin``.
+
+    Uses symmetric shadowcasting: whenever ``B`` is visible from ``A`` then
+    ``A`` is visible from ``B``, and walls bordering visible floor are lit.
+    Each row of a quadrant is evaluated with array operations; only the runs
+    of floor that spawn the next rows are handled in Python. ``radius``
+    limits the view to a Euclidean distance.
+    """
+    opaque = np.asarray(opaque, dtype=bool)
+    height, width = opaque.shape
+    ox, oy = int(origin[0]), int(origin[1])
+    visible = np.zeros((height, width), dtype=bool)
+    if not (0 <= ox < width and 0 <= oy < height):
+        return visible
+    visible[oy, ox] = True
+    max_depth = radius if radius is not None else max(width, height)
+
+    for transform in _quadrants(ox, oy):
+        rows: List[Tuple[int, Fraction, Fraction]] = [(1, Fraction(-1), Fraction(1))]
+        while rows:
+            depth, start, end = rows.pop()
+            if depth > max_depth:
+                continue
+            lo = _round_ties_up(depth * start)
+            hi = _round_ties_down(depth * end)
+            if hi < lo:
+                continue
+            cols = np.arange(lo, hi + 1)
+            xs, ys = transform(depth, cols)
+            xs = np.broadcast_to(xs, cols.shape)
+            ys = np.broadcast_to(ys, cols.shape)
+            walls = _gather(opaque, xs, ys)
+            # ``col >= depth * start`` and ``col <= depth * end`` in integers.
+            symmetric = (cols * start.denominator >= depth * start.numerator) & (
+                cols * end.denominator <= depth * end.numerator
+            )
+            lit = walls | symmetric
+            inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height) & lit
+            visible[ys[inside], xs[inside]] = True
+
+            # Every maximal run of floor tiles continues into the next row.
+            floor = np.concatenate(([False], ~walls, [False])).astype(np.int8)
+            edges = np.flatnonzero(np.diff(floor))
+            for first, stop in zip(edges[::2], edges[1::2]):
+                run_start = start if first == 0 else Fraction(2 * int(cols[first]) - 1, 2 * depth)
+                run_end = end if stop == len(cols) else Fraction(2 * int(cols[stop]) - 1, 2 * depth)
+                rows.append((depth + 1, run_start, run_end))
+
+    if radius is not None:
+        yy, xx = np.ogrid[:height, :width]
+        visible &= (xx - ox) ** 2 + (yy - oy) ** 2 <= radius * radius
+    return visible
+
+
+def fields_of_view(
+    opaque: np.ndarray, origins: Coords, radius: int | None = None
+) -> np.ndarray:
+    """Return stacked :func:`field_of_view` masks, one per origin."""
+    opaque = np.asarray(opaque, dtype=bool)
+    masks = [
+        field_of_view(opaque, (int(x), int(y)), radius)
+        for x, y in np.asarray(origins).reshape(-1, 2)
+    ]
+    if not masks:
+        return np.zeros((0,) + opaque.shape, dtype=bool)
+    return np.stack(masks)
@@ -27,8 +27,10 @@ class BaseRegionManager:
     # ------------------------------------------------------------------
     # Loading logic helpers
     # ------------------------------------------------------------------
-    def _wanted(self, rx: int, ry: int) -> Set[Tuple[int, int]]:
-        r = range(-self.view_radius, self.view_radius + 1)
+    def _wanted(self, rx: int, ry: int, radius: int | None = None) -> Set[Tuple[int, int]]:
+        if radius is None:
+            radius = self.view_radius
+        r = range(-radius, radius + 1)
         return {(rx + i, ry + j) for i in r for j in r}
 
     def _ensure_loaded(self, rx: int, ry: int) -> None:
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from typing import Tuple
+
+import numpy as np
+
+from constants import REGION_SIZE
+from runepy.terrain import FLAG_BLOCKED
+
+from .region import Region, world_to_region
+
+logger = logging.getLogger(__name__)
+
+
+class FlagsStore:
+    """Flags-only access to arbitrary regions for long-range queries.
+
+    Regions resident in ``region_manager`` are read live so editor changes are
+    honoured. Any other region is loaded with only its ``flags`` layer into a
+    small LRU cache of its own, without textures, meshes or the render
+    streaming cache. Cached copies are dropped whenever the region manager
+    makes the region resident, replaces or unloads it, since it may be
+    edited and saved meanwhile.
+    """
+
+    def __init__(self, region_manager=None, cache_size: int | None = 256) -> None:
+        self.region_manager = region_manager
+        self.cache_size = cache_size
+        self._cache: OrderedDict[Tuple[int, int], np.ndarray] = OrderedDict()
+        listeners = getattr(region_manager, "region_listeners", None)
+        if listeners is not None:
+            listeners.append(self.invalidate)
+
+    def flags(self, rx: int, ry: int) -> np.ndarray:
+        """Return the ``flags`` layer of region ``(rx, ry)``."""
+        if self.region_manager is not None:
+            region = self.region_manager.resident(rx, ry)
+            if region is not None:
+                return region.flags
+        key = (rx, ry)
+        flags = self._cache.get(key)
+        if flags is None:
+            flags = Region.load(rx, ry, layers={"flags"}).flags
+            self._cache[key] = flags
+            if self.cache_size is not None and len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return flags
+
+    def invalidate(self, rx: int, ry: int) -> None:
+        """Forget the cached flags of region ``(rx, ry)``."""
+        self._cache.pop((rx, ry), None)
+
+    def clear(self) -> None:
+        """Forget all cached flags."""
+        self._cache.clear()
+
+    def window(self, x0: int, y0: int, x1: int, y1: int) -> tuple[np.ndarray, int, int]:
+        """Return stitched flags for the regions covering tiles ``(x0, y0)``–``(x1, y1)``.
+
+        The window is aligned to region boundaries; the returned offsets
+        translate window coordinates back into world space.
+        """
+        rx0, ry0 = world_to_region(min(x0, x1), min(y0, y1))
+        rx1, ry1 = world_to_region(max(x0, x1), max(y0, y1))
+        cols = rx1 - rx0 + 1
+        rows = ry1 - ry0 + 1
+        stitched = np.empty((rows * REGION_SIZE, cols * REGION_SIZE), dtype=np.uint8)
+        for j in range(rows):
+            for i in range(cols):
+                stitched[
+                    j * REGION_SIZE : (j + 1) * REGION_SIZE,
+                    i * REGION_SIZE : (i + 1) * REGION_SIZE,
+                ] = self.flags(rx0 + i, ry0 + j)
+        return stitched, rx0 * REGION_SIZE, ry0 * REGION_SIZE
+
+    def walkable_between(
+        self, start: Tuple[int, int], goal: Tuple[int, int], margin: int = 0
+    ) -> tuple[np.ndarray, int, int]:
+        """Return a walkability grid over the bounding box of two tiles.
+
+        ``margin`` widens the box by that many tiles on every side before it is
+        rounded out to whole regions.
+        """
+        x0 = min(start[0], goal[0]) - margin
+        y0 = min(start[1], goal[1]) - margin
+        x1 = max(start[0], goal[0]) + margin
+        y1 = max(start[1], goal[1]) + margin
+        flags, off_x, off_y = self.window(x0, y0, x1, y1)
+        return ((flags & FLAG_BLOCKED) == 0).astype(int), off_x, off_y
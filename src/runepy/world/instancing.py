@@ -0,0 +1,323 @@
+"""Instanced rendering of objects placed on ``overlay`` tiles.
+
+Every non-zero ``overlay`` value names a model type. Per region the tiles of
+one type form an :class:`InstanceBatch` drawn with a single instanced draw
+call: the model is rendered ``count`` times and a vertex shader reads the
+offset of instance ``gl_InstanceID`` from a buffer texture. Editing a tile
+rewrites one texel of that buffer. Without hardware instancing each batch is
+instead a ``flattenStrong`` merge of model copies, rebuilt on edits.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Callable, Dict, Mapping, Tuple
+
+import numpy as np
+
+try:
+    import direct.showbase.ShowBaseGlobal as sbg
+    from panda3d.core import (
+        BoundingBox,
+        Geom,
+        GeomEnums,
+        GeomNode,
+        GeomTriangles,
+        GeomVertexData,
+        GeomVertexFormat,
+        GeomVertexWriter,
+        NodePath,
+        Point3,
+        Shader,
+        Texture,
+    )
+except Exception:  # pragma: no cover - Panda3D may be missing during tests
+    sbg = None
+    BoundingBox = Geom = GeomEnums = GeomNode = GeomTriangles = None
+    GeomVertexData = GeomVertexFormat = GeomVertexWriter = None
+    NodePath = Point3 = Shader = Texture = None
+
+from constants import REGION_SIZE
+
+logger = logging.getLogger(__name__)
+
+#: Height above the tile used for batch bounds, in tiles.
+MODEL_HEIGHT = 2.0
+
+_VERTEX_SHADER = """
+#version 140
+uniform mat4 p3d_ModelViewProjectionMatrix;
+uniform samplerBuffer instances;
+in vec4 p3d_Vertex;
+in vec4 p3d_Color;
+out vec4 color;
+void main() {
+    vec4 offset = texelFetch(instances, gl_InstanceID);
+    vec3 pos = p3d_Vertex.xyz * offset.w + offset.xyz;
+    gl_Position = p3d_ModelViewProjectionMatrix * vec4(pos, 1.0);
+    color = p3d_Color;
+}
+"""
+
+_FRAGMENT_SHADER = """
+#version 140
+in vec4 color;
+out vec4 p3d_FragColor;
+void main() {
+    p3d_FragColor = color;
+}
+"""
+
+_SHADER = None
+
+
+def placements(overlay: np.ndarray) -> Dict[int, np.ndarray]:
+    """Return the ``(lx, ly)`` tiles of each model type in an overlay layer."""
+    ys, xs = np.nonzero(overlay)
+    kinds = overlay[ys, xs]
+    return {
+        int(kind): np.stack((xs[kinds == kind], ys[kinds == kind]), axis=1)
+        for kind in np.unique(kinds)
+    }
+
+
+def marker_model(kind: int):
+    """Return a small box shaded by ``kind``, used when no model is registered."""
+    if GeomNode is None:
+        return None
+    shade = 0.4 + 0.6 * (kind % 8) / 7
+    vdata = GeomVertexData("marker", GeomVertexFormat.getV3c4(), Geom.UHStatic)
+    vdata.setNumRows(8)
+    vertex = GeomVertexWriter(vdata, "vertex")
+    color = GeomVertexWriter(vdata, "color")
+    for z in (0.0, 0.6):
+        for x, y in ((-0.3, -0.3), (0.3, -0.3), (0.3, 0.3), (-0.3, 0.3)):
+            vertex.addData3(x, y, z)
+            color.addData4(shade, shade * 0.8, 0.3, 1.0)
+    tris = GeomTriangles(Geom.UHStatic)
+    faces = ((4, 5, 6, 7), (0, 3, 2, 1), (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7))
+    for a, b, c, d in faces:
+        tris.addVertices(a, b, c)
+        tris.addVertices(a, c, d)
+    geom = Geom(vdata)
+    geom.addPrimitive(tris)
+    node = GeomNode(f"marker_{kind}")
+    node.addGeom(geom)
+    return NodePath(node)
+
+
+def _instance_shader():
+    global _SHADER
+    if _SHADER is None:
+        _SHADER = Shader.make(Shader.SL_GLSL, _VERTEX_SHADER, _FRAGMENT_SHADER)
+    return _SHADER
+
+
+def instancing_supported() -> bool:
+    """Return whether the open window can draw instanced, shader-offset batches."""
+    base_inst = getattr(sbg, "base", None)
+    win = getattr(base_inst, "win", None)
+    gsg = win.getGsg() if win is not None else None
+    if gsg is None:
+        return False
+    return bool(
+        gsg.getSupportsGeometryInstancing()
+        and gsg.getSupportsBufferTexture()
+        and gsg.getSupportsGlsl()
+    )
+
+
+class InstanceBatch:
+    """All objects of one model type in one region.
+
+    Instances are packed at the front of :attr:`offsets`, one
+    ``(x, y, z, scale)`` row per tile. Removing an instance moves the last
+    row into the gap, so an edit touches at most two rows.
+    """
+
+    def __init__(self, kind: int, model, instanced: bool, capacity: int = 16) -> None:
+        self.kind = kind
+        self.model = model
+        self.instanced = instanced
+        self.offsets = np.zeros((capacity, 4), dtype=np.float32)
+        self.tiles: list[Tuple[int, int]] = []
+        self._index: Dict[Tuple[int, int], int] = {}
+        self.texture = None
+        self.node = NodePath(f"instances_{kind}")
+        if instanced:
+            body = model.copyTo(self.node)
+            body.setShader(_instance_shader())
+            self._allocate(capacity)
+
+    def __len__(self) -> int:
+        return len(self.tiles)
+
+    def _allocate(self, capacity: int) -> None:
+        offsets = np.zeros((capacity, 4), dtype=np.float32)
+        offsets[: len(self.tiles)] = self.offsets[: len(self.tiles)]
+        self.offsets = offsets
+        if not self.instanced:
+            return
+        self.texture = Texture(f"instances_{self.kind}")
+        self.texture.setupBufferTexture(capacity, Texture.T_float, Texture.F_rgba32, GeomEnums.UH_dynamic)
+        self.texture.setRamImage(self.offsets.tobytes())
+        self.node.setShaderInput("instances", self.texture)
+
+    def _write(self, index: int) -> None:
+        if self.texture is None:
+            return
+        rows = np.asarray(memoryview(self.texture.modifyRamImage())).view(np.float32).reshape(-1, 4)
+        rows[index] = self.offsets[index]
+
+    def set(self, lx: int, ly: int, z: float, scale: float = 1.0) -> None:
+        """Place or move the instance on local tile ``(lx, ly)``."""
+        key = (lx, ly)
+        index = self._index.get(key)
+        if index is None:
+            index = len(self.tiles)
+            if index == len(self.offsets):
+                self._allocate(2 * index)
+            self.tiles.append(key)
+            self._index[key] = index
+        self.offsets[index] = (lx + 0.5, ly + 0.5, z, scale)
+        self._write(index)
+
+    def remove(self, lx: int, ly: int) -> None:
+        """Drop the instance on local tile ``(lx, ly)`` if there is one."""
+        index = self._index.pop((lx, ly), None)
+        if index is None:
+            return
+        last = len(self.tiles) - 1
+        moved = self.tiles.pop()
+        if index != last:
+            self.tiles[index] = moved
+            self._index[moved] = index
+            self.offsets[index] = self.offsets[last]
+            self._write(index)
+
+    def refresh(self) -> None:
+        """Apply the instance count, or rebuild the flattened fallback."""
+        if self.instanced:
+            self.node.setInstanceCount(len(self.tiles))
+            if self.tiles:
+                self.node.show()
+            else:
+                # A count of zero means "not instanced" to Panda3D
+                self.node.hide()
+            return
+        self.node.getChildren().detach()
+        if not self.tiles:
+            return
+        group = NodePath("flattened")
+        for x, y, z, scale in self.offsets[: len(self.tiles)].tolist():
+            copy = self.model.copyTo(group)
+            copy.setPos(x, y, z)
+            copy.setScale(scale)
+        group.flattenStrong()
+        group.reparentTo(self.node)
+
+
+class RegionInstances:
+    """Instance batches for the ``overlay`` objects of one region.
+
+    :attr:`root` is positioned like the region mesh; the region manager
+    attaches, detaches and removes it together with :attr:`Region.node`.
+    """
+
+    def __init__(self, region, instancer: "Instancer") -> None:
+        self.region = region
+        self.instancer = instancer
+        self.root = NodePath(f"instances_{region.rx}_{region.ry}")
+        self.batches: Dict[int, InstanceBatch] = {}
+        self.kinds: Dict[Tuple[int, int], int] = {}
+        height = region.height
+        for kind, tiles in placements(region.overlay).items():
+            batch = self._batch(kind)
+            for lx, ly in tiles.tolist():
+                batch.set(lx, ly, float(height[ly, lx]))
+                self.kinds[(lx, ly)] = kind
+            batch.refresh()
+
+    def _batch(self, kind: int) -> InstanceBatch:
+        batch = self.batches.get(kind)
+        if batch is None:
+            batch = InstanceBatch(kind, self.instancer.model(kind), self.instancer.instanced)
+            top = float(self.region.height.max()) + MODEL_HEIGHT
+            bottom = float(self.region.height.min())
+            batch.node.node().setBounds(
+                BoundingBox(Point3(0, 0, bottom), Point3(REGION_SIZE, REGION_SIZE, top))
+            )
+            batch.node.node().setFinal(True)
+            batch.node.reparentTo(self.root)
+            self.batches[kind] = batch
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def update_tile(self, lx: int, ly: int) -> None:
+        """Resync the instance on local tile ``(lx, ly)`` after an edit."""
+        key = (lx, ly)
+        old = self.kinds.pop(key, None)
+        kind = int(self.region.overlay[ly, lx])
+        if old is not None:
+            batch = self.batches[old]
+            batch.remove(lx, ly)
+            if old != kind:
+                batch.refresh()
+        if kind:
+            batch = self._batch(kind)
+            batch.set(lx, ly, float(self.region.height[ly, lx]))
+            batch.refresh()
+            self.kinds[key] = kind
+
+    def remove(self) -> None:
+        """Remove every batch from the scene graph."""
+        self.root.removeNode()
+        self.batches.clear()
+        self.kinds.clear()
+
+
+class Instancer:
+    """Create :class:`RegionInstances` with shared model templates.
+
+    ``models`` maps overlay values to model node paths, or is a callable
+    returning one; types without a model use :func:`marker_model`.
+    ``instanced`` forces hardware instancing on or off; by default it is
+    detected from the open window on first use.
+    """
+
+    def __init__(
+        self,
+        models: Mapping[int, object] | Callable[[int], object] | None = None,
+        instanced: bool | None = None,
+    ) -> None:
+        self.models = models
+        self._instanced = instanced
+        self._templates: Dict[int, object] = {}
+
+    @property
+    def instanced(self) -> bool:
+        if self._instanced is None:
+            self._instanced = instancing_supported()
+            logger.debug("Overlay object instancing %s", "enabled" if self._instanced else "disabled")
+        return self._instanced
+
+    def model(self, kind: int):
+        """Return the model template for overlay value ``kind``."""
+        template = self._templates.get(kind)
+        if template is None:
+            if callable(self.models):
+                template = self.models(kind)
+            elif self.models is not None:
+                template = self.models.get(kind)
+            if template is None:
+                template = marker_model(kind)
+            self._templates[kind] = template
+        return template
+
+    def build(self, region) -> RegionInstances | None:
+        """Return the instance batches for ``region``."""
+        if NodePath is None:
+            return None
+        return RegionInstances(region, self)
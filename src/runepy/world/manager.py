@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import logging
-from concurrent.futures import Future, ThreadPoolExecutor
-from typing import Dict, Tuple
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Hashable, Iterable, List, Mapping, Sequence, Set, Tuple
 
-from constants import REGION_SIZE, VIEW_RADIUS
+from constants import REGION_SIZE, RETAIN_MARGIN, VIEW_RADIUS
 
 from .base_manager import BaseRegionManager
 
@@ -13,83 +15,618 @@ try:
 except Exception:  # pragma: no cover - Panda3D may be missing during tests
     sbg = None
 
+from .instancing import Instancer
+from .mesh_cache import MeshCache
+from .meshing import RENDER_STATS, SMOOTH_PAD
 from .region import Region
+from .slots import RegionSlots
 
 logger = logging.getLogger(__name__)
 
 
 class RegionManager(BaseRegionManager):
-    """Manage loading and unloading of :class:`Region` objects around a player."""
+    """Manage loading and unloading of :class:`Region` objects around a player.
 
-    def __init__(self, view_radius: int = VIEW_RADIUS, async_load: bool = False, cache_size: int | None = None) -> None:
+    Regions leaving the view window are detached from the scene graph and kept
+    in :attr:`retained` until they are more than ``view_radius +
+    retain_margin`` regions away, so walking back and forth across a region
+    edge only reattaches existing meshes. ``max_resident`` caps the number of
+    loaded plus retained regions; the farthest retained regions are dropped
+    first when it is exceeded.
+
+    Any number of observers (players, NPC simulators, editor viewports) can
+    register interest sets. Each region is reference counted by the observers
+    that want it and stays loaded while at least one does, so shared regions
+    are loaded once. :meth:`ensure` and :meth:`ensure_rect` move the
+    :data:`PRIMARY` observer.
+    """
+
+    PRIMARY = "primary"
+
+    def __init__(
+        self,
+        view_radius: int = VIEW_RADIUS,
+        async_load: bool = False,
+        cache_size: int | None = None,
+        retain_margin: int = RETAIN_MARGIN,
+        max_resident: int | None = None,
+        slot_grid: int | None = None,
+        mesh_cache: MeshCache | None = None,
+        instancer: Instancer | None = None,
+    ) -> None:
         super().__init__(region_size=REGION_SIZE, view_radius=view_radius)
         self.async_load = async_load
+        self.retain_margin = retain_margin
+        self.max_resident = max_resident
+        self.retained: Dict[Tuple[int, int], Region] = {}
+        self.mesh_cache = mesh_cache
+        self.instancer = instancer
+        if slot_grid is None:
+            slot_grid = 2 * view_radius + 1
+        # Grows with the widest observer window, see :meth:`_fit_slots`
+        self.slots = RegionSlots(slot_grid)
+        self.observers: Dict[Hashable, Set[Tuple[int, int]]] = {}
+        #: Called with ``(rx, ry)`` whenever a region becomes resident, is
+        #: replaced or unloaded, so copies of its data held elsewhere can be
+        #: dropped.
+        self.region_listeners: List[Callable[[int, int], None]] = []
+        self._observer_radius: Dict[Hashable, int | None] = {}
+        self._generation = 0
+        self._refs: Dict[Tuple[int, int], int] = {}
         self._executor: ThreadPoolExecutor | None = None
         self._pending: Dict[Tuple[int, int], Future[Region]] = {}
+        self._prefetched: Dict[Tuple[int, int], Future[Region]] = {}
+        self._prefetch_order: List[Tuple[int, int]] = []
         self.cache_size = cache_size
         self._cache: Dict[Tuple[int, int], Region] = {}
+        self.stream_stats: Dict[str, int] = {"completed": 0, "pending": 0, "prefetching": 0}
+        # Totals over loaded regions, updated as they attach, detach or rebuild
+        self.render_stats: Dict[str, int] = dict.fromkeys(RENDER_STATS, 0)
         if async_load:
             self._executor = ThreadPoolExecutor(max_workers=1)
 
-    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the worker pool, creating it for background prefetching."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        return self._executor
+
+    def _remember(self, key: Tuple[int, int], region: Region) -> None:
+        """Store ``region`` in the region cache, honouring ``cache_size``."""
+        self._cache[key] = region
+        if self.cache_size is not None and len(self._cache) > self.cache_size:
+            self._cache.pop(next(iter(self._cache)))
+
+    def seed(self, regions: Dict[Tuple[int, int], Region]) -> None:
+        """Add already loaded ``regions`` to the region cache.
+
+        Used to warm-start from a session snapshot; regions carrying a mesh
+        are attached without rebuilding it.
+        """
+        for key, region in regions.items():
+            if key not in self.loaded and key not in self.retained:
+                self._remember(key, region)
+
     def clear_cache(self) -> None:
-        """Empty the region cache."""
+        """Empty the region cache and drop retained regions."""
+        for key in list(self.retained):
+            self.unload_region(*key)
         self._cache.clear()
 
+    def region_at(self, x: int, y: int) -> Region | None:
+        """Return the loaded region containing world tile ``(x, y)``."""
+        rx = x // self.region_size
+        ry = y // self.region_size
+        region = self.slots.region(rx, ry)
+        if region is None:
+            region = self.loaded.get((rx, ry))
+        return region
+
+    def resident(self, rx: int, ry: int) -> Region | None:
+        """Return region ``(rx, ry)`` if it is loaded, retained or cached in memory."""
+        key = (rx, ry)
+        region = self.loaded.get(key)
+        if region is None:
+            region = self.retained.get(key)
+        if region is None:
+            region = self._cache.get(key)
+        return region
+
+    def rebuild_border(self, x: int, y: int) -> None:
+        """Rebuild neighbor mesh chunks whose smooth border covers world tile ``(x, y)``.
+
+        Smooth meshes pad each region with :data:`SMOOTH_PAD` tiles of its
+        neighbors, so an edit near a region edge also moves the corners and
+        normals along the adjacent regions' borders. Call after editing the
+        tile and rebuilding its own region.
+        """
+        rx, ry = self.region_coords(x, y)
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if not (dx or dy):
+                    continue
+                region = self.resident(rx + dx, ry + dy)
+                if region is None or not region.smooth or region.node is None:
+                    continue
+                lx = x - region.rx * self.region_size
+                ly = y - region.ry * self.region_size
+                reach = range(-SMOOTH_PAD, self.region_size + SMOOTH_PAD)
+                if lx in reach and ly in reach:
+                    region.rebuild_chunk(lx, ly)
+
     # ------------------------------------------------------------------
     # Region helpers
     # ------------------------------------------------------------------
     def _setup_region(self, region: Region) -> Region:
-        """Finalize region after loading by creating a mesh and parenting."""
-        region.make_mesh()
+        """Finalize region after loading by creating a mesh and parenting.
+
+        A mesh already built in the background by :meth:`prefetch` is reused.
+        """
+        region.neighbors = self.resident
+        if region.node is None:
+            region.make_mesh(cache=self.mesh_cache)
+        else:
+            region.apply_texture()
         base_inst = getattr(sbg, "base", None)
         if region.node is not None and base_inst is not None and getattr(base_inst, "render", None) is not None:
             parent = getattr(base_inst, "tile_root", base_inst.render)
             region.node.reparentTo(parent)
             region.node.setPos(region.rx * REGION_SIZE, region.ry * REGION_SIZE, 0)
+        self._attach_instances(region)
         return region
 
+    def _attach_instances(self, region: Region) -> None:
+        """Build the overlay object batches of ``region`` and parent them."""
+        if self.instancer is None:
+            return
+        if region.instances is None:
+            region.instances = self.instancer.build(region)
+        base_inst = getattr(sbg, "base", None)
+        if region.instances is not None and base_inst is not None and getattr(base_inst, "render", None) is not None:
+            parent = getattr(base_inst, "tile_root", base_inst.render)
+            region.instances.root.reparentTo(parent)
+            region.instances.root.setPos(region.rx * REGION_SIZE, region.ry * REGION_SIZE, 0)
+
+    @staticmethod
+    def _drop_instances(region: Region) -> None:
+        if region.instances is not None:
+            region.instances.remove()
+            region.instances = None
+
     def load_region(self, rx: int, ry: int) -> Region:
-        """Synchronously load a region from disk, using the region cache if possible."""
+        """Synchronously load a region from disk, using the region cache if possible.
+
+        Retained regions are reattached with their existing mesh.
+        """
         key = (rx, ry)
+        region = self.retained.pop(key, None)
+        if region is not None:
+            return self._setup_region(region)
+        self._collect_prefetched()
         region = self._cache.get(key)
         if region is None:
-            region = Region.load(rx, ry)
-            self._cache[key] = region
-            if self.cache_size is not None and len(self._cache) > self.cache_size:
-                self._cache.pop(next(iter(self._cache)))
+            future = self._prefetched.pop(key, None)
+            region = None
+            if future is not None:
+                try:
+                    region = future.result()
+                except Exception:
+                    logger.exception("Prefetch of region %s failed", key)
+            if region is None:
+                region = Region.load(rx, ry)
+            self._remember(key, region)
         return self._setup_region(region)
 
+    def _activate(self, key: Tuple[int, int], region: Region) -> None:
+        """Add ``region`` to :attr:`loaded` and its slot.
+
+        A region becoming resident for the first time gets the next
+        :attr:`Region.generation`.
+        """
+        if not region.generation:
+            self._generation += 1
+            region.generation = self._generation
+        self.loaded[key] = region
+        self.slots.insert(region)
+        self._track(region, True)
+        self._notify(*key)
+
+    def _notify(self, rx: int, ry: int) -> None:
+        for listener in self.region_listeners:
+            listener(rx, ry)
+
+    def _track(self, region: Region, rendered: bool) -> None:
+        """Add ``region`` to or remove it from :attr:`render_stats`."""
+        if (region.stats_sink is self.render_stats) == rendered:
+            return
+        sign = 1 if rendered else -1
+        self.render_stats["regions"] += sign
+        for name, value in region.mesh_stats.items():
+            self.render_stats[name] += sign * value
+        region.stats_sink = self.render_stats if rendered else None
+
+    def replace_region(self, rx: int, ry: int, region: Region) -> None:
+        """Swap the loaded region ``(rx, ry)`` for a freshly loaded ``region``."""
+        key = (rx, ry)
+        self.slots.release(rx, ry)
+        old = self.loaded.get(key)
+        if old is not None:
+            self._track(old, False)
+            self._drop_instances(old)
+        self._cache.pop(key, None)
+        self._activate(key, region)
+        self._attach_instances(region)
+
     def unload_region(self, rx: int, ry: int) -> None:
-        region = self.loaded.pop((rx, ry), None)
+        key = (rx, ry)
+        self.slots.release(rx, ry)
+        region = self.loaded.pop(key, None)
+        if region is None:
+            region = self.retained.pop(key, None)
         if region is None:
             return
+        self._track(region, False)
         if region.node is not None:
             region.node.removeNode()
+            region.node = None
+        self._drop_instances(region)
+        self._notify(rx, ry)
+
+    def retain_region(self, rx: int, ry: int) -> None:
+        """Move a loaded region into :attr:`retained`, detaching its mesh."""
+        key = (rx, ry)
+        region = self.loaded.pop(key, None)
+        if region is None:
+            return
+        self.slots.release(rx, ry)
+        self._track(region, False)
+        if region.node is not None:
+            region.node.detachNode()
+        if region.instances is not None:
+            region.instances.root.detachNode()
+        self.retained[key] = region
+
+    def _trim_retained(self, want: Set[Tuple[int, int]]) -> None:
+        """Unload retained regions outside the retention ring or over budget.
+
+        Distances are measured in regions to the nearest region of ``want``.
+        When nothing is wanted, for example after the last observer left,
+        every retained region is unloaded.
+        """
+
+        def distance(key: Tuple[int, int]) -> float:
+            return min(
+                (max(abs(key[0] - wx), abs(key[1] - wy)) for wx, wy in want),
+                default=math.inf,
+            )
+
+        for key in [key for key in self.retained if distance(key) > self.retain_margin]:
+            self.unload_region(*key)
+        if self.max_resident is None:
+            return
+        excess = len(self.loaded) + len(self.retained) - self.max_resident
+        if excess > 0:
+            for key in sorted(self.retained, key=distance, reverse=True)[:excess]:
+                self.unload_region(*key)
+
+    def regions_in_rect(self, x0: float, y0: float, x1: float, y1: float) -> Set[Tuple[int, int]]:
+        """Return the regions overlapping the world rectangle ``(x0, y0)-(x1, y1)``."""
+        rx0, ry0 = self.region_coords(math.floor(min(x0, x1)), math.floor(min(y0, y1)))
+        rx1, ry1 = self.region_coords(math.floor(max(x0, x1)), math.floor(max(y0, y1)))
+        return {(rx, ry) for rx in range(rx0, rx1 + 1) for ry in range(ry0, ry1 + 1)}
 
     def ensure(self, player_x: int, player_y: int) -> None:
         """Ensure regions around ``(player_x, player_y)`` are loaded."""
-        rx, ry = self.region_coords(player_x, player_y)
-        want = self._wanted(rx, ry)
+        self.update_observers({self.PRIMARY: (player_x, player_y)})
+
+    def ensure_rect(
+        self, x0: float, y0: float, x1: float, y1: float, max_loads: int | None = None
+    ) -> None:
+        """Ensure the regions overlapping a world rectangle are loaded.
+
+        Used for camera footprints, so the number of resident regions follows
+        the visible area instead of a fixed ``view_radius`` square. With
+        ``max_loads`` at most that many regions are loaded right away,
+        nearest to the middle first, and the rest are left to :meth:`pump`;
+        see :meth:`_apply`.
+        """
+        self._set_interest(self.PRIMARY, self.regions_in_rect(x0, y0, x1, y1))
+        self._apply(set(self._refs), max_loads)
+
+    # ------------------------------------------------------------------
+    # Observers
+    # ------------------------------------------------------------------
+    def _set_interest(self, observer: Hashable, keys: Set[Tuple[int, int]]) -> None:
+        """Replace the interest set of ``observer`` and update reference counts."""
+        old = self.observers.get(observer, set())
+        for key in old - keys:
+            self._refs[key] -= 1
+            if not self._refs[key]:
+                del self._refs[key]
+        for key in keys - old:
+            self._refs[key] = self._refs.get(key, 0) + 1
+        self.observers[observer] = keys
+
+    def add_observer(
+        self, observer: Hashable, x: int, y: int, view_radius: int | None = None
+    ) -> None:
+        """Register ``observer`` at world position ``(x, y)``.
+
+        ``view_radius`` defaults to the manager's own radius.
+        """
+        self._observer_radius[observer] = view_radius
+        self.update_observers({observer: (x, y)})
+
+    def remove_observer(self, observer: Hashable) -> None:
+        """Drop ``observer`` and unload regions no other observer needs."""
+        if observer not in self.observers:
+            return
+        self._set_interest(observer, set())
+        del self.observers[observer]
+        self._observer_radius.pop(observer, None)
+        self._apply(set(self._refs))
+
+    def update_observers(self, positions: Mapping[Hashable, Tuple[int, int]]) -> None:
+        """Move several observers at once and load or unload the difference.
+
+        All interest sets are updated first and the union is applied in a
+        single pass, so observers moving in the same tick never unload a
+        region another observer is about to claim.
+        """
+        for observer, (x, y) in positions.items():
+            rx, ry = self.region_coords(x, y)
+            radius = self._observer_radius.get(observer)
+            self._set_interest(observer, self._wanted(rx, ry, radius))
+        self._apply(set(self._refs))
 
+    def refcount(self, rx: int, ry: int) -> int:
+        """Return how many observers want region ``(rx, ry)``."""
+        return self._refs.get((rx, ry), 0)
+
+    def _fit_slots(self) -> None:
+        """Grow :attr:`slots` to hold the widest observer interest set.
+
+        Camera footprints can span more regions than ``view_radius``; a slot
+        grid at least as wide as each window keeps its regions from
+        colliding in the toroidal grid.
+        """
+        span = 0
+        for keys in self.observers.values():
+            if keys:
+                xs = [rx for rx, _ry in keys]
+                ys = [ry for _rx, ry in keys]
+                span = max(span, max(xs) - min(xs) + 1, max(ys) - min(ys) + 1)
+        if span > self.slots.size:
+            self.slots.resize(span)
+
+    def _apply(self, want: Set[Tuple[int, int]], max_loads: int | None = None) -> None:
+        """Make ``want`` the set of loaded regions.
+
+        Retained regions are reattached at once. Others are loaded in the
+        background with ``async_load``; otherwise up to ``max_loads`` of
+        them, nearest to the middle of ``want``, are loaded synchronously and
+        the rest are queued like background loads, so a sudden zoom-out
+        spreads its loads over the next :meth:`pump` calls.
+        """
+        self._fit_slots()
         for key in set(self.loaded) - want:
-            self.unload_region(*key)
+            self.retain_region(*key)
         for key in set(self._pending) - want:
             future = self._pending.pop(key)
             future.cancel()
         for key, future in list(self._pending.items()):
             if future.done():
-                region = self._setup_region(future.result())
-                self.loaded[key] = region
-                self._pending.pop(key)
-        for key in want - self.loaded.keys() - self._pending.keys():
-            if self.async_load and self._executor is not None:
-                self._pending[key] = self._executor.submit(Region.load, *key)
-            else:
-                self.loaded[key] = self.load_region(*key)
+                self._integrate(key, self._pending.pop(key))
+        missing = want - self.loaded.keys() - self._pending.keys()
+        if max_loads is not None and missing:
+            xs = [rx for rx, _ry in want]
+            ys = [ry for _rx, ry in want]
+            cx, cy = (min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2
+            missing = sorted(missing, key=lambda key: (max(abs(key[0] - cx), abs(key[1] - cy)), key))
+        loads = 0
+        for key in missing:
+            if key not in self.retained:
+                future = self._background_load(key, max_loads is not None and loads >= max_loads)
+                if future is not None:
+                    self._pending[key] = future
+                    continue
+                loads += 1
+            self._activate(key, self.load_region(*key))
+        self._trim_retained(want)
+
+    def _background_load(self, key: Tuple[int, int], deferred: bool) -> Future[Region] | None:
+        """Return a future for region ``key`` to integrate later, or ``None`` to load it now.
+
+        With ``async_load`` regions that are not cached are read by the
+        worker. ``deferred`` regions always get a future, already completed
+        for cached ones, so :meth:`pump` integrates them within its budget.
+        """
+        if not deferred and not (self.async_load and self._executor is not None):
+            return None
+        future = self._prefetched.pop(key, None)
+        if future is not None:
+            return future
+        region = self._cache.get(key)
+        if region is None:
+            return self._get_executor().submit(Region.load, *key)
+        if not deferred:
+            return None
+        future = Future()
+        future.set_result(region)
+        return future
+
+    def _integrate(self, key: Tuple[int, int], future: Future[Region]) -> None:
+        """Move the region of a finished load ``future`` into :attr:`loaded`."""
+        try:
+            region = future.result()
+        except Exception:
+            logger.exception("Async load of region %s failed", key)
+            self._activate(key, self.load_region(*key))
+            return
+        self._remember(key, region)
+        self._activate(key, self._setup_region(region))
+
+    def pump(self, budget: float | None = None) -> Dict[str, int]:
+        """Integrate finished background loads and return streaming counts.
+
+        Meant to run once per frame. Completed loads in ``_pending`` are moved
+        into :attr:`loaded` until ``budget`` seconds have been spent; the
+        rest wait for the next call. Finished prefetches are moved into the
+        region cache. The returned dict holds the number of regions
+        ``completed`` by this call and those still ``pending`` and
+        ``prefetching``; it is also kept in :attr:`stream_stats`.
+        """
+        start = time.perf_counter()
+        completed = 0
+        for key, future in list(self._pending.items()):
+            if budget is not None and completed and time.perf_counter() - start >= budget:
+                break
+            if future.done():
+                self._integrate(key, self._pending.pop(key))
+                completed += 1
+        self._collect_prefetched()
+        self.stream_stats = {
+            "completed": completed,
+            "pending": len(self._pending),
+            "prefetching": len(self._prefetched),
+        }
+        return self.stream_stats
+
+    # ------------------------------------------------------------------
+    # Predictive prefetching
+    # ------------------------------------------------------------------
+    def _prefetch_job(self, key: Tuple[int, int], build_mesh: bool) -> Region:
+        region = Region.load(*key)
+        if build_mesh:
+            region.neighbors = self.resident
+            region.make_mesh(cache=self.mesh_cache)
+        return region
+
+    def _collect_prefetched(self) -> int:
+        """Move finished prefetches into the region cache and return their count."""
+        done = 0
+        for key, future in list(self._prefetched.items()):
+            if not future.done():
+                continue
+            self._prefetched.pop(key)
+            if future.cancelled() or future.exception() is not None:
+                continue
+            if key not in self.loaded:
+                self._remember(key, future.result())
+            done += 1
+        return done
+
+    def prefetch(self, keys: Iterable[Tuple[int, int]], build_mesh: bool = False) -> None:
+        """Queue background loads for regions ``keys`` in priority order.
+
+        Regions already resident, pending or cached are skipped. Queued
+        prefetches that have not started yet are cancelled and requeued so
+        the worker follows the newest ranking; those no longer listed are
+        dropped. Finished regions land in the region cache where
+        :meth:`ensure` picks them up without touching the disk. With
+        ``build_mesh`` the worker also builds the region mesh.
+        """
+        order = [key for key in keys]
+        if order == self._prefetch_order:
+            return
+        self._prefetch_order = order
+        self._collect_prefetched()
+        for key, future in list(self._prefetched.items()):
+            # Jobs already running finish into the cache; the rest are
+            # requeued below in the new order or dropped.
+            if future.cancel():
+                self._prefetched.pop(key)
+        executor = self._get_executor()
+        for key in order:
+            if (
+                key in self.loaded
+                or key in self.retained
+                or key in self._pending
+                or key in self._cache
+                or key in self._prefetched
+            ):
+                continue
+            self._prefetched[key] = executor.submit(self._prefetch_job, key, build_mesh)
+
+    def prefetch_around(self, x: int, y: int, build_mesh: bool = False) -> List[Tuple[int, int]]:
+        """Prefetch the view window around world tile ``(x, y)``, nearest first."""
+        rx, ry = self.region_coords(x, y)
+        ranked = sorted(
+            self._wanted(rx, ry),
+            key=lambda key: (max(abs(key[0] - rx), abs(key[1] - ry)), key),
+        )
+        self.prefetch(ranked, build_mesh=build_mesh)
+        return ranked
+
+    def prefetch_progress(self) -> Tuple[int, int]:
+        """Return ``(done, total)`` for the most recent :meth:`prefetch` request.
+
+        Regions that were already resident when requested count as done.
+        """
+        self._collect_prefetched()
+        total = len(self._prefetch_order)
+        done = sum(1 for key in self._prefetch_order if key not in self._prefetched)
+        return done, total
+
+    def wait_prefetch(self, timeout: float | None = None) -> Tuple[int, int]:
+        """Block until a prefetch finishes or ``timeout`` expires.
+
+        Returns :meth:`prefetch_progress` afterwards, which makes it easy to
+        drive a progress bar while the worker threads run.
+        """
+        if self._prefetched:
+            wait(list(self._prefetched.values()), timeout=timeout, return_when=FIRST_COMPLETED)
+        return self.prefetch_progress()
+
+    def rank_route(
+        self, points: Sequence[Tuple[float, float]], speed: float = 1.0
+    ) -> List[Tuple[int, int]]:
+        """Return regions needed along ``points`` ordered by arrival time.
+
+        ``points`` are world positions in travel order starting at the
+        current position and ``speed`` is given in tiles per second. Each
+        region within ``view_radius`` of a point is ranked by the earliest
+        time the route brings it into view.
+        """
+        arrival: Dict[Tuple[int, int], float] = {}
+        speed = max(speed, 1e-6)
+        elapsed = 0.0
+        prev = points[0] if points else None
+        for x, y in points:
+            length = math.hypot(x - prev[0], y - prev[1])
+            # Sample long segments every half region so none is skipped.
+            samples = max(1, math.ceil(length / (self.region_size / 2)))
+            for i in range(1, samples + 1):
+                t = i / samples
+                sx = prev[0] + (x - prev[0]) * t
+                sy = prev[1] + (y - prev[1]) * t
+                rx, ry = self.region_coords(int(math.floor(sx)), int(math.floor(sy)))
+                for key in self._wanted(rx, ry):
+                    if key not in arrival:
+                        arrival[key] = elapsed + length * t / speed
+            elapsed += length / speed
+            prev = (x, y)
+        return sorted(arrival, key=lambda key: arrival[key])
+
+    def prefetch_route(
+        self,
+        points: Sequence[Tuple[float, float]],
+        speed: float = 1.0,
+        build_mesh: bool = False,
+    ) -> List[Tuple[int, int]]:
+        """Prefetch the regions a route will enter, soonest first.
+
+        Returns the ranked region keys passed to :meth:`prefetch`.
+        """
+        ranked = [key for key in self.rank_route(points, speed) if key not in self.loaded]
+        self.prefetch(ranked, build_mesh=build_mesh)
+        return ranked
 
     def shutdown(self) -> None:
         """Clean up any executor threads used for async loading."""
+        for future in self._prefetched.values():
+            future.cancel()
+        self._prefetched.clear()
         if self._executor is not None:
             self._executor.shutdown(wait=False)
             self._executor = None
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from panda3d.core import NodePath
+except Exception:  # pragma: no cover - Panda3D may be missing during tests
+    NodePath = None
+
+from runepy.paths import MESH_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+#: Bump when the mesh layout changes so stale bakes are ignored.
+MESH_FORMAT = 3
+
+
+def mesh_key(region, greedy: bool = True) -> str:
+    """Return a hash of the region data that determines its mesh geometry.
+
+    Heights and colors shape the mesh directly; of the ``textures`` layer only
+    the set of textured tiles matters because it splits greedy quads. The
+    chunk size is included because it decides how the mesh is split. Smooth
+    meshes also depend on the border tiles of the neighboring regions, taken
+    from :meth:`Region.padded_layers` so in-memory neighbor edits count.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{MESH_FORMAT}:{int(greedy)}:{region.chunk_size}:{int(region.smooth)}".encode())
+    if region.smooth:
+        layers = region.padded_layers()
+    else:
+        layers = [getattr(region, name) for name in ("height", "base", "overlay")]
+    for layer in layers:
+        digest.update(np.ascontiguousarray(layer).tobytes())
+    textures = region.textures
+    detail = textures.reshape(textures.shape[:2] + (-1,)).any(axis=2)
+    digest.update(np.packbits(detail).tobytes())
+    return digest.hexdigest()
+
+
+class MeshCache:
+    """On-disk cache of baked region meshes as ``.bam`` files.
+
+    Entries are named after :func:`mesh_key`, so an edited region simply
+    misses. The least recently used files are deleted once the directory
+    grows beyond ``max_bytes``.
+    """
+
+    def __init__(self, directory: str | Path = MESH_CACHE_DIR, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._size: int | None = None
+        # Background prefetch workers store meshes too
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.bam"
+
+    def _total_size(self) -> int:
+        if self._size is None:
+            self._size = sum(p.stat().st_size for p in self.directory.glob("*.bam"))
+        return self._size
+
+    def load(self, key: str):
+        """Return the cached mesh for ``key`` as a ``NodePath`` or ``None``."""
+        if NodePath is None:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            node = NodePath.decodeFromBamStream(data)
+        except Exception:
+            logger.warning("Discarding unreadable cached mesh %s", path)
+            node = None
+        # Workers may prune the file meanwhile; the size bookkeeping and the
+        # file itself are only touched under the lock.
+        with self._lock:
+            if node is None or node.isEmpty():
+                self._remove(path)
+                return None
+            # Mark as recently used for LRU eviction
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return node
+
+    def store(self, key: str, node) -> None:
+        """Bake ``node`` (without its texture) into the cache under ``key``."""
+        if node is None:
+            return
+        texture = node.getTexture() if node.hasTexture() else None
+        node.clearTexture()
+        data = bytes(node.encodeToBamStream())
+        if texture is not None:
+            node.setTexture(texture, 1)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        with self._lock:
+            total = self._total_size()
+            old = path.stat().st_size if path.exists() else 0
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            self._size = total - old + len(data)
+            self._prune()
+
+    def _remove(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        if self._size is not None:
+            self._size -= size
+
+    def prune(self) -> None:
+        """Delete least recently used meshes until the cache fits ``max_bytes``."""
+        with self._lock:
+            self._prune()
+
+    def _prune(self) -> None:
+        if self._total_size() <= self.max_bytes:
+            return
+        entries = sorted(self.directory.glob("*.bam"), key=lambda p: p.stat().st_mtime_ns)
+        for path in entries:
+            if self._size <= self.max_bytes:
+                break
+            self._remove(path)
+
+    def clear(self) -> None:
+        """Delete every cached mesh."""
+        with self._lock:
+            for path in self.directory.glob("*.bam"):
+                self._remove(path)
+            self._size = 0
@@ -0,0 +1,449 @@
+"""Vectorized construction of region meshes and textures.
+
+Meshes are described as axis-aligned quads ``(x, y, w, h)`` in tile units,
+each with one height and one color. :func:`tile_quads` emits one quad per
+tile while :func:`greedy_quads` merges rectangles of tiles sharing the same
+height and color. :func:`build_geom` writes the quads straight into Panda3D
+vertex and index buffers with NumPy instead of one writer call per vertex.
+Texture coordinates map the whole region onto one texture built by
+:func:`texture_image`, so merged quads stay correctly textured.
+
+Smooth terrain instead uses one shared vertex per grid corner
+(:func:`smooth_grid` and :func:`build_grid_geom`), with corner heights and
+colors averaged over the four surrounding tiles.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+try:
+    from panda3d.core import (
+        Geom,
+        GeomTriangles,
+        GeomVertexArrayFormat,
+        GeomVertexData,
+        GeomVertexFormat,
+        InternalName,
+        SamplerState,
+        Texture,
+    )
+except Exception:  # pragma: no cover - Panda3D may be missing during tests
+    Geom = GeomTriangles = GeomVertexArrayFormat = None
+    GeomVertexData = GeomVertexFormat = InternalName = None
+    SamplerState = Texture = None
+
+Quads = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+#: Counters kept for rendered regions by the region manager.
+RENDER_STATS: Tuple[str, ...] = (
+    "regions",
+    "geoms",
+    "vertices",
+    "triangles",
+    "mesh_bytes",
+    "texture_bytes",
+)
+
+#: Color of tiles without base or overlay.
+EMPTY_COLOR = (0.2, 0.2, 0.2, 1.0)
+
+#: Texels per tile edge in the ``textures`` layer.
+TILE_TEXELS = 16
+
+# Floats per vertex: position, RGBA color and texture coordinates
+_ROW = 9
+# Floats per smooth terrain vertex: position, normal, color and UV
+_GRID_ROW = 12
+
+#: Tiles of neighbor data needed around a region for smooth corners and normals.
+SMOOTH_PAD = 2
+
+_FORMAT = None
+_GRID_FORMAT = None
+
+
+def _vertex_format():
+    """Return the registered ``float32`` vertex, RGBA color and UV format."""
+    global _FORMAT
+    if _FORMAT is None:
+        array = GeomVertexArrayFormat()
+        array.addColumn(InternalName.getVertex(), 3, Geom.NT_float32, Geom.C_point)
+        array.addColumn(InternalName.getColor(), 4, Geom.NT_float32, Geom.C_color)
+        array.addColumn(InternalName.getTexcoord(), 2, Geom.NT_float32, Geom.C_texcoord)
+        _FORMAT = GeomVertexFormat.registerFormat(GeomVertexFormat(array))
+    return _FORMAT
+
+
+def _grid_format():
+    """Return the registered format with an added ``float32`` normal column."""
+    global _GRID_FORMAT
+    if _GRID_FORMAT is None:
+        array = GeomVertexArrayFormat()
+        array.addColumn(InternalName.getVertex(), 3, Geom.NT_float32, Geom.C_point)
+        array.addColumn(InternalName.getNormal(), 3, Geom.NT_float32, Geom.C_normal)
+        array.addColumn(InternalName.getColor(), 4, Geom.NT_float32, Geom.C_color)
+        array.addColumn(InternalName.getTexcoord(), 2, Geom.NT_float32, Geom.C_texcoord)
+        _GRID_FORMAT = GeomVertexFormat.registerFormat(GeomVertexFormat(array))
+    return _GRID_FORMAT
+
+
+def tile_values(base: np.ndarray, overlay: np.ndarray) -> np.ndarray:
+    """Return the color index of each tile: ``overlay`` or else ``base``."""
+    return np.where(overlay != 0, overlay, base).astype(np.uint8)
+
+
+def value_colors(values: np.ndarray) -> np.ndarray:
+    """Map color indices to RGBA grey shades, ``0`` to :data:`EMPTY_COLOR`."""
+    shade = values.astype(np.float32) / 255.0
+    colors = np.empty(values.shape + (4,), dtype=np.float32)
+    colors[..., 0] = shade
+    colors[..., 1] = shade
+    colors[..., 2] = shade
+    colors[..., 3] = 1.0
+    colors[values == 0] = EMPTY_COLOR
+    return colors
+
+
+def tile_quads(shape: Tuple[int, int]) -> Quads:
+    """Return one 1 × 1 quad per tile of a ``(rows, cols)`` grid."""
+    ys, xs = np.indices(shape)
+    ones = np.ones(xs.size, dtype=np.int64)
+    return xs.ravel(), ys.ravel(), ones, ones.copy()
+
+
+def greedy_quads(keys: np.ndarray, detail: np.ndarray | None = None) -> Quads:
+    """Merge tiles with equal ``keys`` into rectangles.
+
+    Each row is split into runs of equal keys with NumPy, then runs with the
+    same start, width and key in consecutive rows are stacked into one
+    rectangle. Tiles flagged in ``detail`` always get a quad of their own.
+    """
+    rows, cols = keys.shape
+    if detail is None:
+        detail = np.zeros(keys.shape, dtype=bool)
+    breaks = np.ones((rows, cols), dtype=bool)
+    breaks[:, 1:] = (keys[:, 1:] != keys[:, :-1]) | detail[:, 1:] | detail[:, :-1]
+
+    xs, ys, ws, hs = [], [], [], []
+    open_runs: dict = {}
+    for y in range(rows):
+        starts = np.flatnonzero(breaks[y])
+        widths = np.diff(np.append(starts, cols))
+        row_keys = keys[y, starts].tolist()
+        row_detail = detail[y, starts].tolist()
+        next_open = {}
+        for x, w, key, fine in zip(starts.tolist(), widths.tolist(), row_keys, row_detail):
+            run = (x, w, key)
+            index = None if fine else open_runs.get(run)
+            if index is None:
+                index = len(xs)
+                xs.append(x)
+                ys.append(y)
+                ws.append(w)
+                hs.append(1)
+            else:
+                hs[index] += 1
+            if not fine:
+                next_open[run] = index
+        open_runs = next_open
+    return (
+        np.array(xs, dtype=np.int64),
+        np.array(ys, dtype=np.int64),
+        np.array(ws, dtype=np.int64),
+        np.array(hs, dtype=np.int64),
+    )
+
+
+def build_geom(
+    quads: Quads,
+    heights: np.ndarray,
+    colors: np.ndarray,
+    name: str = "region",
+    uv_span: float = 64.0,
+):
+    """Return a :class:`Geom` for ``quads`` with per-quad heights and colors.
+
+    ``heights`` has one entry per quad and ``colors`` one RGBA row per quad.
+    Texture coordinates are ``(x, y) / uv_span``, spanning one texture over
+    the region. Returns ``None`` when Panda3D is unavailable.
+    """
+    if Geom is None:
+        return None
+    x, y, w, h = (np.asarray(a, dtype=np.float32) for a in quads)
+    count = len(x)
+    z = np.asarray(heights, dtype=np.float32)
+
+    rows = np.empty((count, 4, _ROW), dtype=np.float32)
+    rows[:, :, 0] = np.stack((x, x + w, x + w, x), axis=1)
+    rows[:, :, 1] = np.stack((y, y, y + h, y + h), axis=1)
+    rows[:, :, 2] = z[:, None]
+    rows[:, :, 3:7] = np.asarray(colors, dtype=np.float32)[:, None, :]
+    rows[:, :, 7:9] = rows[:, :, 0:2] / uv_span
+
+    vdata = GeomVertexData(name, _vertex_format(), Geom.UHStatic)
+    vdata.uncleanSetNumRows(count * 4)
+    np.asarray(memoryview(vdata.modifyArray(0))).view(np.float32).reshape(-1, _ROW)[:] = rows.reshape(-1, _ROW)
+
+    base = (np.arange(count, dtype=np.uint32) * 4)[:, None]
+    indices = (base + np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)).ravel()
+    tris = GeomTriangles(Geom.UHStatic)
+    tris.setIndexType(Geom.NT_uint32)
+    handle = tris.modifyVertices()
+    handle.uncleanSetNumRows(len(indices))
+    np.asarray(memoryview(handle))[:] = indices
+
+    geom = Geom(vdata)
+    geom.addPrimitive(tris)
+    return geom
+
+
+def region_quads(
+    height: np.ndarray,
+    base: np.ndarray,
+    overlay: np.ndarray,
+    textures: np.ndarray | None = None,
+    greedy: bool = True,
+) -> Tuple[Quads, np.ndarray, np.ndarray]:
+    """Return ``(quads, heights, colors)`` describing a region surface.
+
+    With ``greedy`` tiles of equal height and color are merged, except tiles
+    that carry texture detail, which keep their own quad.
+    """
+    values = tile_values(base, overlay)
+    if greedy:
+        keys = (height.astype(np.int32) << 8) | values
+        detail = None if textures is None else textures.reshape(textures.shape[:2] + (-1,)).any(axis=2)
+        quads = greedy_quads(keys, detail)
+    else:
+        quads = tile_quads(height.shape)
+    x, y = quads[0], quads[1]
+    return quads, height[y, x], value_colors(values[y, x])
+
+
+def chunk_quads(
+    height: np.ndarray,
+    base: np.ndarray,
+    overlay: np.ndarray,
+    textures: np.ndarray | None,
+    x0: int,
+    y0: int,
+    size: int,
+    greedy: bool = True,
+) -> Tuple[Quads, np.ndarray, np.ndarray]:
+    """Return :func:`region_quads` for the ``size × size`` chunk at ``(x0, y0)``.
+
+    Quads stay in region tile coordinates so chunk meshes share the region's
+    texture coordinates and line up under one region node.
+    """
+    window = (slice(y0, y0 + size), slice(x0, x0 + size))
+    detail = None if textures is None else textures[window]
+    (x, y, w, h), heights, colors = region_quads(
+        height[window], base[window], overlay[window], detail, greedy=greedy
+    )
+    return (x + x0, y + y0, w, h), heights, colors
+
+
+def pad_layer(center: np.ndarray, ring: dict, pad: int = SMOOTH_PAD) -> np.ndarray:
+    """Surround a square ``center`` layer with ``pad`` tiles of its neighbors.
+
+    ``ring`` maps offsets ``(dx, dy)`` in ``-1..1`` to the neighbor's layer;
+    missing neighbors repeat the edge of ``center``.
+    """
+    n = center.shape[0]
+    out = np.pad(center, ((pad, pad), (pad, pad)) + ((0, 0),) * (center.ndim - 2), mode="edge")
+    inner = (slice(pad, pad + n), slice(None))
+    before = (slice(0, pad), slice(n - pad, n))
+    after = (slice(pad + n, n + 2 * pad), slice(0, pad))
+    parts = {-1: before, 0: inner, 1: after}
+    for (dx, dy), layer in ring.items():
+        if layer is None or (dx, dy) == (0, 0):
+            continue
+        (dst_y, src_y), (dst_x, src_x) = parts[dy], parts[dx]
+        out[dst_y, dst_x] = layer[src_y, src_x]
+    return out
+
+
+def _corners(padded: np.ndarray) -> np.ndarray:
+    """Average each ``2 × 2`` tile block, giving values at the shared corners."""
+    padded = padded.astype(np.float32)
+    return (padded[:-1, :-1] + padded[:-1, 1:] + padded[1:, :-1] + padded[1:, 1:]) * 0.25
+
+
+def smooth_grid(
+    height: np.ndarray, colors: np.ndarray, pad: int = SMOOTH_PAD
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return corner ``(heights, normals, colors)`` for padded tile layers.
+
+    ``height`` and ``colors`` cover ``n + 2 * pad`` tiles per side, as built
+    by :func:`pad_layer`; the results cover the ``n + 1`` corners of the
+    inner ``n × n`` tiles. Corners on a region edge only depend on tiles
+    both regions see, so neighboring meshes meet without seams. Normals come
+    from central differences of the corner heights.
+    """
+    corners = _corners(height)
+    n = height.shape[0] - 2 * pad
+    o = pad - 1
+    inner = slice(o, o + n + 1)
+    dzdx = (corners[inner, o + 1 : o + n + 2] - corners[inner, o - 1 : o + n]) * 0.5
+    dzdy = (corners[o + 1 : o + n + 2, inner] - corners[o - 1 : o + n, inner]) * 0.5
+    normals = np.stack((-dzdx, -dzdy, np.ones_like(dzdx)), axis=2)
+    normals /= np.linalg.norm(normals, axis=2, keepdims=True)
+    shades = np.stack([_corners(colors[..., i]) for i in range(colors.shape[2])], axis=2)
+    return corners[inner, inner], normals, shades[inner, inner]
+
+
+def build_grid_geom(
+    heights: np.ndarray,
+    normals: np.ndarray,
+    colors: np.ndarray,
+    x0: int = 0,
+    y0: int = 0,
+    name: str = "region",
+    uv_span: float = 64.0,
+):
+    """Return an indexed :class:`Geom` with one vertex per grid corner.
+
+    ``heights`` has shape ``(rows + 1, cols + 1)`` for ``rows × cols`` tiles
+    whose lower corner is ``(x0, y0)``; ``normals`` and ``colors`` add a
+    trailing axis of 3 and 4. Each tile becomes two triangles sharing the
+    corner vertices. Returns ``None`` when Panda3D is unavailable.
+    """
+    if Geom is None:
+        return None
+    rows, cols = heights.shape
+    ys, xs = np.indices((rows, cols), dtype=np.float32)
+    data = np.empty((rows, cols, _GRID_ROW), dtype=np.float32)
+    data[..., 0] = xs + x0
+    data[..., 1] = ys + y0
+    data[..., 2] = heights
+    data[..., 3:6] = normals
+    data[..., 6:10] = colors
+    data[..., 10:12] = data[..., 0:2] / uv_span
+
+    vdata = GeomVertexData(name, _grid_format(), Geom.UHStatic)
+    vdata.uncleanSetNumRows(rows * cols)
+    np.asarray(memoryview(vdata.modifyArray(0))).view(np.float32).reshape(-1, _GRID_ROW)[:] = data.reshape(-1, _GRID_ROW)
+
+    corner = (np.arange(rows - 1, dtype=np.uint32)[:, None] * cols + np.arange(cols - 1, dtype=np.uint32)).ravel()
+    quad = np.array([0, 1, cols + 1, 0, cols + 1, cols], dtype=np.uint32)
+    indices = (corner[:, None] + quad).ravel()
+    tris = GeomTriangles(Geom.UHStatic)
+    tris.setIndexType(Geom.NT_uint32)
+    handle = tris.modifyVertices()
+    handle.uncleanSetNumRows(len(indices))
+    np.asarray(memoryview(handle))[:] = indices
+
+    geom = Geom(vdata)
+    geom.addPrimitive(tris)
+    return geom
+
+
+def downsample(array: np.ndarray, factor: int) -> np.ndarray:
+    """Average ``factor × factor`` blocks over the first two axes of ``array``."""
+    rows, cols = array.shape[:2]
+    blocks = array.reshape((rows // factor, factor, cols // factor, factor) + array.shape[2:])
+    return blocks.mean(axis=(1, 3), dtype=np.float32)
+
+
+def lod_quads(
+    height: np.ndarray,
+    base: np.ndarray,
+    overlay: np.ndarray,
+    factor: int,
+    greedy: bool = True,
+) -> Tuple[Quads, np.ndarray, np.ndarray]:
+    """Return ``(quads, heights, colors)`` for ``factor × factor`` merged tiles.
+
+    Heights and colors are averaged over each block; blocks that end up
+    identical are merged further when ``greedy`` is set.
+    """
+    if factor == 1:
+        return region_quads(height, base, overlay, greedy=greedy)
+    heights = downsample(height, factor)
+    colors = downsample(value_colors(tile_values(base, overlay)), factor)
+    if greedy:
+        rows = np.concatenate((heights[..., None], colors), axis=2).reshape(-1, 5)
+        _unique, keys = np.unique(rows, axis=0, return_inverse=True)
+        quads = greedy_quads(keys.reshape(heights.shape))
+    else:
+        quads = tile_quads(heights.shape)
+    x, y, w, h = quads
+    scaled = (x * factor, y * factor, w * factor, h * factor)
+    return scaled, heights[y, x], colors[y, x]
+
+
+def mesh_stats(node, texture=None) -> Dict[str, int]:
+    """Count the geoms, vertices, triangles and buffer bytes shown by ``node``.
+
+    Only the nodes attached below ``node`` are visited, so detached levels of
+    detail are not counted. ``texture`` adds its estimated memory.
+    """
+    stats = dict.fromkeys(RENDER_STATS[1:], 0)
+    paths = list(node.findAllMatches("**/+GeomNode"))
+    if node.node().isGeomNode():
+        paths.append(node)
+    for path in paths:
+        for geom in path.node().getGeoms():
+            vdata = geom.getVertexData()
+            stats["geoms"] += 1
+            stats["vertices"] += vdata.getNumRows()
+            stats["mesh_bytes"] += sum(
+                vdata.getArray(i).getDataSizeBytes() for i in range(vdata.getNumArrays())
+            )
+            for prim in geom.getPrimitives():
+                stats["triangles"] += prim.getNumPrimitives()
+                if prim.isIndexed():
+                    stats["mesh_bytes"] += prim.getVertices().getDataSizeBytes()
+    if texture is not None:
+        stats["texture_bytes"] = texture.estimateTextureMemory()
+    return stats
+
+
+def texture_image(textures: np.ndarray) -> np.ndarray:
+    """Lay out a ``(rows, cols, 16, 16)`` textures layer as one luminance image.
+
+    Texel ``(px, py)`` of tile ``(tx, ty)`` lands at ``[ty * 16 + py,
+    tx * 16 + px]``. Tiles whose texels are all zero are untextured and
+    become white so they keep their vertex color.
+    """
+    rows, cols, th, tw = textures.shape
+    blank = ~textures.reshape(rows, cols, -1).any(axis=2)
+    image = textures.transpose(0, 2, 1, 3).reshape(rows * th, cols * tw).copy()
+    if blank.any():
+        mask = np.repeat(np.repeat(blank, th, axis=0), tw, axis=1)
+        image[mask] = 255
+    return image
+
+
+def make_texture(textures: np.ndarray, name: str = "region"):
+    """Return a mipmapped luminance :class:`Texture` for a textures layer."""
+    if Texture is None:
+        return None
+    image = texture_image(textures)
+    height, width = image.shape
+    tex = Texture(name)
+    tex.setup2dTexture(width, height, Texture.T_unsigned_byte, Texture.F_luminance)
+    tex.setRamImage(image.tobytes())
+    tex.setMagfilter(SamplerState.FT_nearest)
+    tex.setMinfilter(SamplerState.FT_linear_mipmap_linear)
+    tex.setWrapU(SamplerState.WM_clamp)
+    tex.setWrapV(SamplerState.WM_clamp)
+    return tex
+
+
+def patch_texture(tex, textures: np.ndarray, lx: int, ly: int) -> None:
+    """Rewrite the texels of tile ``(lx, ly)`` in the RAM image of ``tex``.
+
+    Panda3D 1.10 has no sub-image upload, so the RAM image is patched in
+    place; only the 16 × 16 block is touched on the CPU side.
+    """
+    th, tw = textures.shape[2:]
+    block = textures[ly, lx]
+    if not block.any():
+        block = np.full((th, tw), 255, dtype=np.uint8)
+    width = tex.getXSize()
+    image = np.asarray(memoryview(tex.modifyRamImage())).reshape(-1, width)
+    image[ly * th : (ly + 1) * th, lx * tw : (lx + 1) * tw] = block
@@ -2,31 +2,41 @@ from __future__ import annotations
 
 import gzip
 import logging
+import struct
 import time
+import zlib
 from collections import defaultdict
-from dataclasses import dataclass
-from typing import ClassVar, Dict, List, Tuple
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, ClassVar, Dict, Iterable, List, Tuple
 
 import numpy as np
 
 try:
-    from panda3d.core import (
-        Geom,
-        GeomNode,
-        GeomTriangles,
-        GeomVertexData,
-        GeomVertexFormat,
-        GeomVertexWriter,
-        NodePath,
-    )
+    from panda3d.core import GeomNode, GeomVertexFormat, NodePath, PandaNode
 except Exception:  # pragma: no cover - Panda3D may be missing during tests
-    Geom = GeomNode = GeomTriangles = None
-    GeomVertexData = GeomVertexFormat = GeomVertexWriter = None
-    NodePath = None
+    GeomNode = GeomVertexFormat = NodePath = PandaNode = None
 
-from constants import REGION_SIZE
+from constants import CHUNK_SIZE, LOD_DISTANCES, REGION_SIZE, SMOOTH_TERRAIN
 from runepy.paths import MAPS_DIR
 
+from .mesh_cache import mesh_key
+from .meshing import (
+    SMOOTH_PAD,
+    build_geom,
+    build_grid_geom,
+    chunk_quads,
+    lod_quads,
+    make_texture,
+    mesh_stats,
+    pad_layer,
+    patch_texture,
+    region_quads,
+    smooth_grid,
+    tile_values,
+    value_colors,
+)
+
 logger = logging.getLogger(__name__)
 LOAD_TIMES: Dict[Tuple[int, int], List[float]] = defaultdict(list)
 
@@ -41,9 +51,110 @@ def local_tile(x: int, y: int) -> Tuple[int, int]:
     return x % REGION_SIZE, y % REGION_SIZE
 
 
+#: Layer names in on-disk order with their dtype and per-region shape.
+LAYER_SPECS: Dict[str, Tuple[type, Tuple[int, ...]]] = {
+    "height": (np.int16, (REGION_SIZE, REGION_SIZE)),
+    "base": (np.uint8, (REGION_SIZE, REGION_SIZE)),
+    "overlay": (np.uint8, (REGION_SIZE, REGION_SIZE)),
+    "flags": (np.uint8, (REGION_SIZE, REGION_SIZE)),
+    "textures": (np.uint8, (REGION_SIZE, REGION_SIZE, 16, 16)),
+}
+LAYERS: Tuple[str, ...] = tuple(LAYER_SPECS)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_HEADER = struct.Struct("<HH")
+_TABLE_ENTRY = struct.Struct("<II")
+
+
+def region_path(rx: int, ry: int) -> Path:
+    """Return the file path storing region ``(rx, ry)``."""
+    return MAPS_DIR / f"region_{rx}_{ry}.bin"
+
+
+def file_signature(rx: int, ry: int):
+    """Return ``[size, mtime_ns]`` of a region file or ``None`` if it is missing."""
+    try:
+        stat = region_path(rx, ry).stat()
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _empty_layer(name: str) -> np.ndarray:
+    dtype, shape = LAYER_SPECS[name]
+    return np.zeros(shape, dtype=dtype)
+
+
+def _layer_from_bytes(name: str, data: bytes) -> np.ndarray:
+    dtype, shape = LAYER_SPECS[name]
+    return np.frombuffer(data, dtype=dtype).reshape(shape).copy()
+
+
+def _layer_nbytes(name: str) -> int:
+    dtype, shape = LAYER_SPECS[name]
+    return int(np.prod(shape)) * np.dtype(dtype).itemsize
+
+
+def read_layers(path: Path, names: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Read the layers ``names`` from the region file at ``path``.
+
+    Version 3 files store every layer as a separately compressed block listed
+    in a header table, so only the requested blocks are read and inflated.
+    Older gzip files are read sequentially up to the last requested layer.
+    Layers absent from the file (or a missing file) are returned as zeros.
+    """
+    wanted = set(names)
+    if not path.exists():
+        return {name: _empty_layer(name) for name in wanted}
+    with open(path, "rb") as raw:
+        head = raw.read(2)
+        if head == _GZIP_MAGIC:
+            raw.seek(0)
+            return _read_legacy(raw, wanted)
+        raw.seek(0)
+        version, count = _HEADER.unpack(raw.read(_HEADER.size))
+        if version != Region.FILE_VERSION:
+            raise ValueError(f"Unsupported region version {version}")
+        table = [_TABLE_ENTRY.unpack(raw.read(_TABLE_ENTRY.size)) for _ in range(count)]
+        layers = {}
+        for name, (offset, length) in zip(LAYERS, table):
+            if name not in wanted:
+                continue
+            raw.seek(offset)
+            layers[name] = _layer_from_bytes(name, zlib.decompress(raw.read(length)))
+    for name in wanted - layers.keys():
+        layers[name] = _empty_layer(name)
+    return layers
+
+
+def _read_legacy(raw, wanted: set) -> Dict[str, np.ndarray]:
+    """Read layers from a version 1 or 2 gzip region file."""
+    layers: Dict[str, np.ndarray] = {}
+    with gzip.GzipFile(fileobj=raw) as f:
+        version = int.from_bytes(f.read(2), "little")
+        if version not in {1, 2}:
+            raise ValueError(f"Unsupported region version {version}")
+        present = LAYERS if version >= 2 else LAYERS[:-1]
+        last = max((present.index(n) for n in wanted if n in present), default=-1)
+        for name in present[: last + 1]:
+            nbytes = _layer_nbytes(name)
+            if name in wanted:
+                layers[name] = _layer_from_bytes(name, f.read(nbytes))
+            else:
+                # Skipping still inflates the data but avoids materializing it.
+                f.seek(nbytes, 1)
+    for name in wanted - layers.keys():
+        layers[name] = _empty_layer(name)
+    return layers
+
+
 @dataclass
 class Region:
-    """Container for region tile data."""
+    """Container for region tile data.
+
+    Regions loaded with only some ``layers`` fetch the remaining ones from
+    disk the first time they are accessed.
+    """
 
     rx: int
     ry: int
@@ -53,97 +164,354 @@ class Region:
     flags: np.ndarray
     textures: np.ndarray
     node: "NodePath" | None = None
+    revision: int = 0
+    #: Load counter assigned by the region manager when the region first
+    #: becomes resident; unlike ``id()`` it is never reused.
+    generation: int = field(default=0, repr=False, compare=False)
+    #: :attr:`revision` last written to disk by :meth:`save`.
+    saved_revision: int = field(default=0, repr=False, compare=False)
+    lod: int = 0
+    lod_nodes: Dict[int, Any] = field(default_factory=dict, repr=False, compare=False)
+    texture: Any = field(default=None, repr=False, compare=False)
+    #: :class:`~runepy.world.instancing.RegionInstances` of overlay objects.
+    instances: Any = field(default=None, repr=False, compare=False)
+    #: Tiles per edge of each separately culled mesh chunk.
+    chunk_size: int = field(default=CHUNK_SIZE, repr=False, compare=False)
+    #: Build a smooth heightmap with shared corner vertices instead of flat quads.
+    smooth: bool = field(default=SMOOTH_TERRAIN, repr=False, compare=False)
+    #: Neighbor ``(height, tile values)`` by offset, read for smooth meshes.
+    ring: Dict[Tuple[int, int], Any] = field(default_factory=dict, repr=False, compare=False)
+    #: ``(id, revision)`` of the in-memory neighbor each :attr:`ring` entry
+    #: was taken from, or ``None`` for entries read from disk.
+    ring_sources: Dict[Tuple[int, int], Tuple[int, int] | None] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    #: Returns the in-memory region at ``(rx, ry)`` or ``None``; set by the
+    #: region manager so smooth borders follow unsaved neighbor edits.
+    neighbors: Callable[[int, int], "Region | None"] | None = field(default=None, repr=False, compare=False)
+    #: ``(revision, ring sources, grid)`` of the last :meth:`corner_grid` result.
+    grid: Tuple[int, Any, Any] | None = field(default=None, repr=False, compare=False)
+    #: Geom, vertex, triangle and byte counts of the shown mesh.
+    mesh_stats: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+    #: Counters that :attr:`mesh_stats` changes are added to while rendered.
+    stats_sink: Dict[str, int] | None = field(default=None, repr=False, compare=False)
 
-    FILE_VERSION: ClassVar[int] = 2
+    FILE_VERSION: ClassVar[int] = 3
+    #: Tile block size merged by each level of detail.
+    LOD_FACTORS: ClassVar[Tuple[int, ...]] = (1, 2, 4)
 
     @classmethod
-    def load(cls, rx: int, ry: int) -> "Region":
-        """Load region ``(rx, ry)`` from disk or create a new one."""
+    def load(cls, rx: int, ry: int, layers: Iterable[str] | None = None) -> "Region":
+        """Load region ``(rx, ry)`` from disk or create a new one.
+
+        ``layers`` restricts which layers are read now, for example
+        ``{"flags"}`` for collision-only consumers. Other layers are loaded
+        lazily on first attribute access.
+        """
         start = time.perf_counter()
-        path = MAPS_DIR / f"region_{rx}_{ry}.bin"
-        size = REGION_SIZE * REGION_SIZE
-        texels = 16 * 16
-        if path.exists():
-            with gzip.open(path, "rb") as f:
-                version = int.from_bytes(f.read(2), "little")
-                if version not in {1, cls.FILE_VERSION}:
-                    raise ValueError(f"Unsupported region version {version}")
-                height = np.frombuffer(f.read(size * 2), dtype=np.int16).reshape(REGION_SIZE, REGION_SIZE).copy()
-                base = np.frombuffer(f.read(size), dtype=np.uint8).reshape(REGION_SIZE, REGION_SIZE).copy()
-                overlay = np.frombuffer(f.read(size), dtype=np.uint8).reshape(REGION_SIZE, REGION_SIZE).copy()
-                flags = np.frombuffer(f.read(size), dtype=np.uint8).reshape(REGION_SIZE, REGION_SIZE).copy()
-                if version >= 2:
-                    textures = np.frombuffer(
-                        f.read(size * texels), dtype=np.uint8
-                    ).reshape(REGION_SIZE, REGION_SIZE, 16, 16).copy()
-                else:
-                    textures = np.zeros((REGION_SIZE, REGION_SIZE, 16, 16), dtype=np.uint8)
-        else:
-            height = np.zeros((REGION_SIZE, REGION_SIZE), dtype=np.int16)
-            base = np.zeros((REGION_SIZE, REGION_SIZE), dtype=np.uint8)
-            overlay = np.zeros((REGION_SIZE, REGION_SIZE), dtype=np.uint8)
-            flags = np.zeros((REGION_SIZE, REGION_SIZE), dtype=np.uint8)
-            textures = np.zeros((REGION_SIZE, REGION_SIZE, 16, 16), dtype=np.uint8)
-        region = cls(rx, ry, height, base, overlay, flags, textures)
+        wanted = set(LAYERS) if layers is None else set(layers)
+        unknown = wanted - set(LAYERS)
+        if unknown:
+            raise ValueError(f"Unknown region layers: {sorted(unknown)}")
+        data = read_layers(region_path(rx, ry), wanted)
+        region = cls(rx, ry, **{name: data.get(name) for name in LAYERS})
+        for name in set(LAYERS) - wanted:
+            # Leave the attribute unset so ``__getattr__`` loads it on demand.
+            del region.__dict__[name]
         duration = time.perf_counter() - start
         LOAD_TIMES[(rx, ry)].append(duration)
         logger.debug(
-            "Loaded region (%s, %s) in %.6f s (access #%d)",
+            "Loaded region (%s, %s) layers %s in %.6f s (access #%d)",
             rx,
             ry,
+            sorted(wanted),
             duration,
             len(LOAD_TIMES[(rx, ry)]),
         )
         return region
 
+    def __getattr__(self, name: str):
+        # Only called for attributes missing from the instance, which for
+        # layers means they were skipped by a partial :meth:`load`.
+        if name in LAYER_SPECS and "rx" in self.__dict__:
+            layer = read_layers(region_path(self.rx, self.ry), [name])[name]
+            setattr(self, name, layer)
+            return layer
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    @property
+    def loaded_layers(self) -> Tuple[str, ...]:
+        """Return the names of layers currently held in memory."""
+        return tuple(name for name in LAYERS if name in self.__dict__)
+
+    def touch(self) -> None:
+        """Record that tile data was edited so derived caches can refresh."""
+        self.revision += 1
+
+    @property
+    def dirty(self) -> bool:
+        """Return whether edits since the last :meth:`save` are unsaved."""
+        return self.revision != self.saved_revision
+
     def save(self) -> None:
         """Write this region back to disk."""
-        path = MAPS_DIR / f"region_{self.rx}_{self.ry}.bin"
+        blocks = [
+            zlib.compress(getattr(self, name).astype(LAYER_SPECS[name][0]).tobytes(), 6)
+            for name in LAYERS
+        ]
+        path = region_path(self.rx, self.ry)
         path.parent.mkdir(parents=True, exist_ok=True)
-        with gzip.open(path, "wb") as f:
-            f.write(self.FILE_VERSION.to_bytes(2, "little"))
-            f.write(self.height.astype(np.int16).tobytes())
-            f.write(self.base.astype(np.uint8).tobytes())
-            f.write(self.overlay.astype(np.uint8).tobytes())
-            f.write(self.flags.astype(np.uint8).tobytes())
-            f.write(self.textures.astype(np.uint8).tobytes())
-
-    def make_mesh(self):
-        """Create or refresh a mesh for this region."""
+        offset = _HEADER.size + _TABLE_ENTRY.size * len(blocks)
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(self.FILE_VERSION, len(blocks)))
+            for block in blocks:
+                f.write(_TABLE_ENTRY.pack(offset, len(block)))
+                offset += len(block)
+            for block in blocks:
+                f.write(block)
+        self.saved_revision = self.revision
+
+    def make_mesh(self, greedy: bool = True, cache=None):
+        """Create or refresh a mesh for this region.
+
+        The mesh is split into :attr:`chunk_size` square chunks, each its own
+        ``GeomNode`` with tight bounds under a ``lod_0`` group, so the culler
+        skips chunks outside the view and :meth:`rebuild_chunk` can refresh
+        one chunk after an edit. With :attr:`smooth` the surface is a
+        heightmap with one shared vertex per tile corner. Otherwise, with
+        ``greedy`` flat runs of same-colored tiles are merged into single
+        quads; tiles with texture detail keep a quad each, and without
+        ``greedy`` every tile gets its own quad. A
+        :class:`~runepy.world.mesh_cache.MeshCache` passed as ``cache``
+        supplies a previously baked mesh for identical region data and
+        receives newly built ones.
+        """
         if GeomVertexFormat is None:
             return None
         if self.node is not None:
             self.node.removeNode()
             self.node = None
-        format = GeomVertexFormat.get_v3cp()
-        vdata = GeomVertexData("region", format, Geom.UHStatic)
-        vertex = GeomVertexWriter(vdata, "vertex")
-        color = GeomVertexWriter(vdata, "color")
-        tris = GeomTriangles(Geom.UHStatic)
-        index = 0
-        for y in range(REGION_SIZE):
-            for x in range(REGION_SIZE):
-                z = float(self.height[y, x])
-                val = int(self.overlay[y, x]) or int(self.base[y, x])
-                if val:
-                    shade = val / 255.0
-                    col = (shade, shade, shade, 1.0)
-                else:
-                    col = (0.2, 0.2, 0.2, 1.0)
-                vertex.addData3(x, y, z)
-                color.addData4f(*col)
-                vertex.addData3(x + 1, y, z)
-                color.addData4f(*col)
-                vertex.addData3(x + 1, y + 1, z)
-                color.addData4f(*col)
-                vertex.addData3(x, y + 1, z)
-                color.addData4f(*col)
-                tris.addVertices(index, index + 1, index + 2)
-                tris.addVertices(index, index + 2, index + 3)
-                index += 4
-        geom = Geom(vdata)
-        geom.addPrimitive(tris)
-        node = GeomNode("region")
-        node.addGeom(geom)
-        self.node = NodePath(node)
+        self.lod_nodes = {}
+        self.lod = 0
+        self.grid = None
+        key = None
+        if cache is not None:
+            key = mesh_key(self, greedy)
+            node = cache.load(key)
+            if node is not None and self.adopt_mesh(node):
+                self.apply_texture()
+                self._refresh_stats()
+                return self.node
+        root = NodePath(PandaNode("region"))
+        group = self._build_chunks(greedy)
+        group.reparentTo(root)
+        self.node = root
+        self.lod_nodes = {0: group}
+        if cache is not None:
+            cache.store(key, self.node)
+        self.apply_texture()
+        self._refresh_stats()
         return self.node
+
+    def adopt_mesh(self, node) -> bool:
+        """Use a mesh baked by :meth:`make_mesh` (e.g. read from disk) as :attr:`node`.
+
+        Returns ``False`` if ``node`` lacks the full detail chunk group.
+        """
+        group = node.find("lod_0")
+        if group.isEmpty():
+            return False
+        self.node = node
+        self.lod_nodes = {0: group}
+        self.lod = 0
+        self._refresh_stats()
+        return True
+
+    def _refresh_stats(self) -> None:
+        """Recount :attr:`mesh_stats` and push the change to :attr:`stats_sink`."""
+        stats = mesh_stats(self.node, self.texture) if self.node is not None else {}
+        sink = self.stats_sink
+        if sink is not None:
+            for key in stats.keys() | self.mesh_stats.keys():
+                sink[key] += stats.get(key, 0) - self.mesh_stats.get(key, 0)
+        self.mesh_stats = stats
+
+    def _chunk_extent(self) -> int:
+        return self.chunk_size if 0 < self.chunk_size < REGION_SIZE else REGION_SIZE
+
+    def neighbor_ring(self) -> Dict[Tuple[int, int], Any]:
+        """Return the heights and tile values of the eight neighbor regions.
+
+        Neighbors held in memory by :attr:`neighbors` are used as they are,
+        including unsaved edits, and are taken again once their revision
+        changes. The others are read from disk once; missing region files
+        read as zeros on both sides of the border, so smooth meshes stay
+        seamless.
+        """
+        lookup = self.neighbors
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if not (dx or dy):
+                    continue
+                offset = (dx, dy)
+                region = lookup(self.rx + dx, self.ry + dy) if lookup is not None else None
+                source = None if region is None else (id(region), region.revision)
+                if offset in self.ring and self.ring_sources.get(offset) == source:
+                    continue
+                if region is None:
+                    layers = read_layers(region_path(self.rx + dx, self.ry + dy), ("height", "base", "overlay"))
+                else:
+                    layers = {name: getattr(region, name) for name in ("height", "base", "overlay")}
+                values = tile_values(layers["base"], layers["overlay"])
+                self.ring[offset] = (layers["height"].copy(), values)
+                self.ring_sources[offset] = source
+        return self.ring
+
+    def padded_layers(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return heights and tile values padded by :data:`SMOOTH_PAD` neighbor tiles."""
+        ring = self.neighbor_ring()
+        height = pad_layer(self.height, {k: v[0] for k, v in ring.items()}, SMOOTH_PAD)
+        values = pad_layer(
+            tile_values(self.base, self.overlay), {k: v[1] for k, v in ring.items()}, SMOOTH_PAD
+        )
+        return height, values
+
+    def corner_grid(self):
+        """Return corner ``(heights, normals, colors)`` for the smooth mesh.
+
+        The grid is kept until this region or one of its neighbors changes
+        or the mesh is rebuilt, so picking can read the corner heights every
+        frame.
+        """
+        self.neighbor_ring()
+        sources = tuple(sorted(self.ring_sources.items()))
+        if self.grid is not None and self.grid[:2] == (self.revision, sources):
+            return self.grid[2]
+        height, values = self.padded_layers()
+        grid = smooth_grid(height, value_colors(values), SMOOTH_PAD)
+        self.grid = (self.revision, sources, grid)
+        return grid
+
+    def _chunk_geom(self, cx: int, cy: int, greedy: bool = True, grid=None):
+        size = self._chunk_extent()
+        x0, y0 = cx * size, cy * size
+        if self.smooth:
+            heights, normals, colors = grid if grid is not None else self.corner_grid()
+            window = (slice(y0, y0 + size + 1), slice(x0, x0 + size + 1))
+            return build_grid_geom(heights[window], normals[window], colors[window], x0, y0)
+        quads, heights, colors = chunk_quads(
+            self.height, self.base, self.overlay, self.textures, x0, y0, size, greedy
+        )
+        return build_geom(quads, heights, colors)
+
+    def _build_chunks(self, greedy: bool = True):
+        group = NodePath(PandaNode("lod_0"))
+        grid = self.corner_grid() if self.smooth else None
+        count = -(-REGION_SIZE // self._chunk_extent())
+        for cy in range(count):
+            for cx in range(count):
+                node = GeomNode(f"chunk_{cx}_{cy}")
+                node.addGeom(self._chunk_geom(cx, cy, greedy, grid))
+                group.attachNewNode(node)
+        return group
+
+    def rebuild_chunk(self, lx: int, ly: int, greedy: bool = True) -> bool:
+        """Rebuild only the mesh chunk holding local tile ``(lx, ly)``.
+
+        Smooth meshes also rebuild chunks within :data:`SMOOTH_PAD` tiles,
+        whose corners or normals depend on the tile; ``(lx, ly)`` may then
+        lie up to that many tiles outside the region, in a neighbor. Coarser levels of detail
+        are dropped and rebuilt on demand. Returns ``False`` if there is no
+        mesh yet, in which case callers should use :meth:`make_mesh`.
+        """
+        group = self.lod_nodes.get(0)
+        if self.node is None or group is None:
+            return False
+        size = self._chunk_extent()
+        reach = SMOOTH_PAD if self.smooth else 0
+        last = (REGION_SIZE - 1) // size
+        xs = range(max(lx - reach, 0) // size, min((lx + reach) // size, last) + 1)
+        ys = range(max(ly - reach, 0) // size, min((ly + reach) // size, last) + 1)
+        chunks = [(cx, cy, group.find(f"chunk_{cx}_{cy}")) for cy in ys for cx in xs]
+        if any(chunk.isEmpty() for _cx, _cy, chunk in chunks):
+            return False
+        level = self.lod
+        self.set_lod(0)
+        for stale in [n for n in self.lod_nodes if n]:
+            self.lod_nodes.pop(stale).removeNode()
+        self.grid = None
+        grid = self.corner_grid() if self.smooth else None
+        for cx, cy, chunk in chunks:
+            geom_node = chunk.node()
+            geom_node.removeAllGeoms()
+            geom_node.addGeom(self._chunk_geom(cx, cy, greedy, grid))
+        if not self.set_lod(level):
+            self._refresh_stats()
+        return True
+
+    def apply_texture(self) -> None:
+        """Show the ``textures`` layer on :attr:`node`.
+
+        The texture is generated on first use, and only for regions that have
+        any textured tile; untextured regions render with vertex colors alone.
+        """
+        if self.node is None or GeomNode is None:
+            return
+        if self.texture is None:
+            if not self.textures.any():
+                return
+            self.texture = make_texture(self.textures, f"region_{self.rx}_{self.ry}")
+            self._refresh_stats()
+        self.node.setTexture(self.texture, 1)
+
+    def update_texture_tile(self, lx: int, ly: int) -> None:
+        """Refresh the texels of tile ``(lx, ly)`` after editing ``textures``."""
+        if self.texture is None:
+            self.apply_texture()
+        else:
+            patch_texture(self.texture, self.textures, lx, ly)
+
+    def lod_node(self, level: int):
+        """Return the mesh node for LOD ``level``, building it on first use.
+
+        Level ``0`` is the chunked full detail mesh. Level ``n`` merges
+        ``LOD_FACTORS[n]`` square tile blocks with averaged heights and colors
+        into one geom; distant regions are seen whole, so it is not chunked.
+        The cache is reset by :meth:`make_mesh`.
+        """
+        group = self.lod_nodes.get(level)
+        if group is None:
+            if level == 0:
+                group = self._build_chunks()
+            else:
+                factor = self.LOD_FACTORS[level]
+                quads, heights, colors = lod_quads(self.height, self.base, self.overlay, factor)
+                node = GeomNode(f"lod_{level}")
+                node.addGeom(build_geom(quads, heights, colors))
+                group = NodePath(node)
+            self.lod_nodes[level] = group
+        return group
+
+    def set_lod(self, level: int) -> bool:
+        """Show LOD ``level`` in :attr:`node` and return whether it changed.
+
+        Only the shown level is attached below :attr:`node`; the others are
+        kept detached for quick switching.
+        """
+        if self.node is None or level == self.lod or GeomNode is None:
+            return False
+        current = self.lod_nodes.get(self.lod)
+        if current is not None:
+            current.detachNode()
+        self.lod_node(level).reparentTo(self.node)
+        self.lod = level
+        self._refresh_stats()
+        return True
+
+    def lod_for_distance(self, distance: float) -> int:
+        """Return the LOD level for a camera ``distance`` in tiles."""
+        level = 0
+        for threshold in LOD_DISTANCES:
+            if distance >= threshold:
+                level += 1
+        return min(level, len(self.LOD_FACTORS) - 1)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from constants import REGION_SIZE
+
+from .region import LAYER_SPECS, Region
+
+logger = logging.getLogger(__name__)
+
+#: Per-tile layers indexed for slotted regions.
+SLOT_LAYERS: Tuple[str, ...] = ("height", "base", "overlay", "flags")
+
+_EMPTY = np.iinfo(np.int64).min
+
+
+class RegionSlots:
+    """Toroidal ``N × N`` grid of region slots indexing loaded regions.
+
+    Region ``(rx, ry)`` lives in slot ``(rx mod N, ry mod N)``. Each slot
+    keeps the region and read-only memoryviews of its :data:`SLOT_LAYERS`
+    arrays, so a tile query through :meth:`tile` is plain integer arithmetic
+    plus one memoryview index, without tuple keys, dict lookups or numpy
+    scalars. The region keeps ownership of its arrays: edits through the
+    region are seen by lookups and nothing is copied when a region leaves
+    its slot. When two loaded regions map to the same slot the newer one
+    takes it; :meth:`resize` grows the grid so a window of regions fits
+    without collisions.
+    """
+
+    def __init__(self, size: int, region_size: int = REGION_SIZE) -> None:
+        self.region_size = region_size
+        self._allocate(size)
+
+    def _allocate(self, size: int) -> None:
+        self.size = size
+        count = size * size
+        self._owner_x = np.full(count, _EMPTY, dtype=np.int64)
+        self._owner_y = np.full(count, _EMPTY, dtype=np.int64)
+        # Python mirrors of the owner arrays for the scalar fast path
+        self._ox = [None] * count
+        self._oy = [None] * count
+        self._regions: List[Region | None] = [None] * count
+        self._arrays: Dict[str, List[np.ndarray | None]] = {name: [None] * count for name in SLOT_LAYERS}
+        # Memoryviews index to plain ints, much faster than numpy scalars
+        self._mem: Dict[str, List[memoryview | None]] = {name: [None] * count for name in SLOT_LAYERS}
+
+    def _slot(self, rx: int, ry: int) -> int:
+        return (ry % self.size) * self.size + rx % self.size
+
+    def insert(self, region: Region) -> None:
+        """Index ``region`` in its slot, replacing any region already there.
+
+        Layer arrays are captured now; insert the region again after
+        assigning a new array to one of its layers.
+        """
+        slot = self._slot(region.rx, region.ry)
+        for name in SLOT_LAYERS:
+            array = getattr(region, name)
+            self._arrays[name][slot] = array
+            self._mem[name][slot] = memoryview(array).toreadonly()
+        self._regions[slot] = region
+        self._ox[slot] = region.rx
+        self._oy[slot] = region.ry
+        self._owner_x[slot] = region.rx
+        self._owner_y[slot] = region.ry
+
+    def release(self, rx: int, ry: int) -> None:
+        """Free the slot of region ``(rx, ry)`` if it holds that region."""
+        slot = self._slot(rx, ry)
+        if self._ox[slot] == rx and self._oy[slot] == ry:
+            self._free(slot)
+
+    def _free(self, slot: int) -> None:
+        self._regions[slot] = None
+        for name in SLOT_LAYERS:
+            self._arrays[name][slot] = None
+            self._mem[name][slot] = None
+        self._ox[slot] = self._oy[slot] = None
+        self._owner_x[slot] = self._owner_y[slot] = _EMPTY
+
+    def clear(self) -> None:
+        """Release every slotted region."""
+        for slot, region in enumerate(self._regions):
+            if region is not None:
+                self._free(slot)
+
+    def resize(self, size: int) -> None:
+        """Rebuild the grid with ``size × size`` slots, keeping slotted regions."""
+        if size == self.size:
+            return
+        regions = [region for region in self._regions if region is not None]
+        self._allocate(size)
+        for region in regions:
+            self.insert(region)
+        logger.debug("Resized region slots to %d × %d", size, size)
+
+    def region(self, rx: int, ry: int) -> Region | None:
+        """Return the region held for ``(rx, ry)`` or ``None``."""
+        slot = self._slot(rx, ry)
+        if self._ox[slot] == rx and self._oy[slot] == ry:
+            return self._regions[slot]
+        return None
+
+    def tile(self, x: int, y: int, layer: str = "flags", default=None):
+        """Return the ``layer`` value of world tile ``(x, y)`` or ``default``."""
+        size = self.region_size
+        rx = x // size
+        ry = y // size
+        slot = (ry % self.size) * self.size + rx % self.size
+        if self._ox[slot] != rx or self._oy[slot] != ry:
+            return default
+        return self._mem[layer][slot][y - ry * size, x - rx * size]
+
+    def tiles(self, xs, ys, layer: str = "flags") -> Tuple[np.ndarray, np.ndarray]:
+        """Gather ``layer`` values for arrays of world tiles.
+
+        Returns ``(values, present)``. ``present`` is ``False`` where the tile's
+        region is not slotted, in which case ``values`` holds ``0``. Tiles are
+        gathered with one fancy index per slotted region they fall in.
+        """
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        size = self.region_size
+        rx = xs // size
+        ry = ys // size
+        slot = (ry % self.size) * self.size + rx % self.size
+        present = (self._owner_x[slot] == rx) & (self._owner_y[slot] == ry)
+        values = np.zeros(xs.shape, dtype=LAYER_SPECS[layer][0])
+        lx = xs - rx * size
+        ly = ys - ry * size
+        arrays = self._arrays[layer]
+        for index in np.unique(slot[present]).tolist():
+            mask = present & (slot == index)
+            values[mask] = arrays[index][ly[mask], lx[mask]]
+        return values, present
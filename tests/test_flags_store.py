@@ -0,0 +1,91 @@
+import numpy as np
+
+from constants import REGION_SIZE
+from runepy.pathfinding import Pathfinder
+from runepy.terrain import FLAG_BLOCKED
+from runepy.world.region import Region
+from runepy.world.world import World
+
+
+def test_flags_store_caches_flags_only_regions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    region = Region.load(3, 4)
+    region.flags[7, 2] = FLAG_BLOCKED
+    region.save()
+
+    world = World(view_radius=1)
+    flags = world.flags_store.flags(3, 4)
+    assert flags[7, 2] == FLAG_BLOCKED
+    assert np.count_nonzero(flags) == 1
+    assert world.flags_store.flags(3, 4) is flags
+    world.flags_store.invalidate(3, 4)
+    assert world.flags_store.flags(3, 4) is not flags
+
+
+def test_flags_store_prefers_resident_regions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    world = World(view_radius=1)
+    world.update_streaming(0, 0)
+    world.region_manager.loaded[(0, 0)].flags[1, 1] = FLAG_BLOCKED
+    assert world.flags_store.flags(0, 0)[1, 1] == FLAG_BLOCKED
+
+    flags, off_x, off_y = world.flags_store.window(-10, -10, REGION_SIZE * 5, 3)
+    assert flags.shape == (REGION_SIZE * 2, REGION_SIZE * 7)
+    assert (off_x, off_y) == (-REGION_SIZE, -REGION_SIZE)
+    assert (10, 5) not in world.region_manager.loaded
+
+
+def test_plan_path_beyond_view_window(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # A wall across region (4, 0) with a single gap near its top edge
+    wall = Region.load(4, 0)
+    wall.flags[:, 10] = FLAG_BLOCKED
+    wall.flags[REGION_SIZE - 2, 10] = 0
+    wall.save()
+
+    world = World(view_radius=1)
+    finder = Pathfinder(None, world, None)
+    start = (5, 5)
+    goal = (REGION_SIZE * 4 + 20, 5)
+    path, off_x, off_y = finder.plan_path(start, goal)
+    assert path is not None
+    world_path = [(x + off_x, y + off_y) for x, y in path]
+    assert world_path[0] == start and world_path[-1] == goal
+    assert (REGION_SIZE * 4 + 10, REGION_SIZE - 2) in world_path
+    assert (4, 0) not in world.region_manager.loaded
+
+
+def test_plan_path_grows_window(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Regions (0, 0) to (2, 0) are solid except for two shafts leading north,
+    # so the only route leaves the bounding box of start and goal.
+    for rx, shaft in ((0, 5), (1, None), (2, REGION_SIZE - 5)):
+        region = Region.load(rx, 0)
+        region.flags[:, :] = FLAG_BLOCKED
+        if shaft is not None:
+            region.flags[5:, shaft] = 0
+        region.save()
+
+    world = World(view_radius=1)
+    finder = Pathfinder(None, world, None)
+    goal = (REGION_SIZE * 3 - 5, 5)
+    path, off_x, off_y = finder.plan_path((5, 5), goal)
+    assert path is not None
+    assert max(y + off_y for _x, y in path) >= REGION_SIZE
+
+
+def test_flags_store_drops_copy_of_edited_region(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    world = World(view_radius=0)
+    world.region_manager.cache_size = 1
+    assert world.flags_store.flags(0, 0)[2, 2] == 0
+
+    world.update_streaming(10, 10)
+    region = world.region_manager.loaded[(0, 0)]
+    region.flags[2, 2] = FLAG_BLOCKED
+    region.save()
+    # Walk far enough that the region is unloaded and evicted from the cache
+    for step in range(1, 6):
+        world.update_streaming(REGION_SIZE * 4 * step, 10)
+    assert world.region_manager.resident(0, 0) is None
+    assert world.flags_store.flags(0, 0)[2, 2] == FLAG_BLOCKED
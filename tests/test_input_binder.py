@@ -0,0 +1,19 @@
+import types
+
+from runepy.input_binder import InputBinder
+from runepy.picking import TilePick
+
+
+def test_click_moves_to_picked_tile():
+    moves = []
+    picks = iter([TilePick(None, 3.7, -0.2, 0.0)])
+    binder = InputBinder.__new__(InputBinder)
+    binder.options_menu = types.SimpleNamespace(visible=False)
+    binder.pathfinder = types.SimpleNamespace(move_along_path=lambda x, y: moves.append((x, y)))
+    binder.base = types.SimpleNamespace(
+        camera=types.SimpleNamespace(setH=lambda h: None),
+        tile_picker=types.SimpleNamespace(invalidate=lambda: None, pick=lambda: next(picks)),
+    )
+    binder.on_click()
+    # The highlighted tile is the floored pick, not the rounded point
+    assert moves == [(3, -1)]
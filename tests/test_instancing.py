@@ -0,0 +1,78 @@
+import numpy as np
+
+from runepy.world.instancing import Instancer, placements
+from runepy.world.manager import RegionManager
+from runepy.world.region import Region
+
+
+def _region(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    region = Region.load(0, 0)
+    region.overlay[2, 3] = 1
+    region.overlay[5, 5] = 1
+    region.overlay[7, 1] = 4
+    region.height[5, 5] = 3
+    return region
+
+
+def test_placements_group_tiles_by_overlay_value():
+    overlay = np.zeros((8, 8), dtype=np.uint8)
+    overlay[1, 2] = overlay[3, 4] = 1
+    overlay[6, 0] = 9
+    found = placements(overlay)
+    assert set(found) == {1, 9}
+    assert sorted(map(tuple, found[1].tolist())) == [(2, 1), (4, 3)]
+    assert found[9].tolist() == [[0, 6]]
+
+
+def test_instanced_batches_update_buffer_incrementally(tmp_path, monkeypatch):
+    region = _region(tmp_path, monkeypatch)
+    instances = Instancer(instanced=True).build(region)
+    batch = instances.batches[1]
+    assert len(batch) == 2 and len(instances.batches[4]) == 1
+    assert batch.node.getInstanceCount() == 2
+
+    def texels():
+        data = np.frombuffer(bytes(batch.texture.getRamImage()), dtype=np.float32)
+        return data.reshape(-1, 4)[: len(batch)]
+
+    assert sorted(map(tuple, texels()[:, :3].tolist())) == [(3.5, 2.5, 0.0), (5.5, 5.5, 3.0)]
+
+    region.overlay[2, 3] = 0
+    instances.update_tile(3, 2)
+    assert batch.node.getInstanceCount() == 1
+    assert texels().tolist() == [[5.5, 5.5, 3.0, 1.0]]
+
+    for x in range(20):
+        region.overlay[10, x] = 1
+        instances.update_tile(x, 10)
+    assert len(batch) == 21 and len(texels()) == 21
+    assert batch.texture.getXSize() >= 21
+
+    region.overlay[7, 1] = 0
+    instances.update_tile(1, 7)
+    assert instances.batches[4].node.isHidden()
+
+
+def test_flattened_fallback_merges_copies(tmp_path, monkeypatch):
+    region = _region(tmp_path, monkeypatch)
+    instances = Instancer(instanced=False).build(region)
+    batch = instances.batches[1]
+    assert batch.texture is None
+    assert batch.node.findAllMatches("**/+GeomNode").getNumPaths() == 1
+    region.overlay[9, 9] = 1
+    instances.update_tile(9, 9)
+    assert len(batch) == 3
+    low, high = batch.node.getChildren()[0].getTightBounds()
+    assert np.allclose((low.x, high.y), (3.5 - 0.3, 9.5 + 0.3))
+
+
+def test_manager_builds_and_drops_instances(tmp_path, monkeypatch):
+    region = _region(tmp_path, monkeypatch)
+    region.save()
+    mgr = RegionManager(view_radius=0, retain_margin=0, instancer=Instancer(instanced=False))
+    mgr.ensure(10, 10)
+    loaded = mgr.loaded[(0, 0)]
+    assert len(loaded.instances) == 3
+    mgr.ensure(10 + 64 * 3, 10)
+    assert loaded.instances is None
@@ -0,0 +1,81 @@
+import numpy as np
+
+from runepy import pathfinding
+from runepy.landmarks import LandmarkCache, LandmarkTable
+
+
+def _maze(size=41):
+    """Return a serpentine corridor maze with walls on every other row."""
+    grid = np.ones((size, size), dtype=int)
+    for row in range(1, size - 1, 2):
+        grid[row, :] = 0
+        gap = size - 1 if (row // 2) % 2 == 0 else 0
+        grid[row, gap] = 1
+    return grid
+
+
+def test_landmark_bounds_are_admissible():
+    grid = _maze(21)
+    table = LandmarkTable(grid, count=4)
+    goal = (0, 20)
+    bounds = table.lower_bounds(goal)
+    exact = LandmarkTable(grid, landmarks=[goal]).distances[0]
+    walkable = grid != 0
+    assert np.all(bounds[walkable] <= exact[walkable])
+
+
+def _cup(size=60):
+    """Return an open map with a cup-shaped wall opening away from the goal."""
+    grid = np.ones((size, size), dtype=int)
+    grid[10:51, 40] = 0
+    grid[10, 20:41] = 0
+    grid[50, 20:41] = 0
+    return grid
+
+
+def test_alt_matches_chebyshev_path_with_fewer_expansions():
+    grid = _cup()
+    start, goal = (30, 30), (55, 30)
+    plain_stats, alt_stats = {}, {}
+    plain = pathfinding.a_star(grid, start, goal, stats=plain_stats)
+    table = LandmarkTable(grid, count=6)
+    alt = pathfinding.a_star(
+        grid, start, goal, heuristic=table.heuristic_for(goal), stats=alt_stats
+    )
+    assert alt is not None and len(alt) == len(plain)
+    assert alt_stats["expanded"] < plain_stats["expanded"]
+
+
+def test_alt_respects_corner_cutting():
+    grid = [
+        [1, 0],
+        [0, 1],
+    ]
+    table = LandmarkTable(grid, count=2)
+    assert pathfinding.a_star(grid, (0, 0), (1, 1), heuristic=table.heuristic_for((1, 1))) is None
+
+
+def test_landmark_cache_invalidation():
+    cache = LandmarkCache(count=2)
+    grid = np.ones((8, 8), dtype=int)
+    stamp = (((0, 0), 1),)
+    first = cache.get(grid, "window", stamp)
+    assert cache.get(grid, "window", stamp) is first
+
+    second = cache.get(grid, "window", (((0, 0), 2),))
+    assert second is not first
+
+    cache.invalidate_region(0, 0)
+    assert cache.get(grid, "window", (((0, 0), 2),)) is not second
+
+
+def test_window_stamp_tracks_region_edits(tmp_path, monkeypatch):
+    from runepy.world.world import World
+
+    monkeypatch.chdir(tmp_path)
+    world = World(view_radius=1)
+    world.update_streaming(0, 0)
+    before = world.window_stamp(0, 0)
+    assert world.window_stamp(0, 0) == before
+    world.region_manager.loaded[(0, 0)].touch()
+    assert world.window_stamp(0, 0) != before
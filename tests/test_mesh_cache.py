@@ -0,0 +1,92 @@
+import os
+
+from runepy.world import region as region_mod
+from runepy.world.mesh_cache import MeshCache, mesh_key
+from runepy.world.region import Region
+
+
+def test_mesh_cache_hit_skips_meshing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = MeshCache(tmp_path / "meshes")
+    region = Region.load(0, 0)
+    region.base[3:9, 3:9] = 7
+    built = region.make_mesh(cache=cache)
+    rows = built.find("**/chunk_0_0").node().getGeom(0).getVertexData().getNumRows()
+    assert len(list((tmp_path / "meshes").glob("*.bam"))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("mesh was rebuilt")
+
+    monkeypatch.setattr(region_mod, "build_geom", fail)
+    again = Region.load(0, 0)
+    again.base[3:9, 3:9] = 7
+    node = again.make_mesh(cache=cache)
+    assert node.find("**/chunk_0_0").node().getGeom(0).getVertexData().getNumRows() == rows
+    monkeypatch.undo()
+    assert again.set_lod(1) and again.set_lod(0)
+
+
+def test_mesh_key_tracks_geometry_layers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    region = Region.load(0, 0)
+    key = mesh_key(region)
+    region.flags[0, 0] = 1
+    assert mesh_key(region) == key
+    region.textures[0, 0, 5, 5] = 3
+    textured = mesh_key(region)
+    assert textured != key
+    region.textures[0, 0, 6, 6] = 4
+    assert mesh_key(region) == textured
+    region.height[1, 1] = 2
+    assert mesh_key(region) != textured
+    assert mesh_key(region, greedy=False) != mesh_key(region)
+
+
+def test_mesh_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = MeshCache(tmp_path / "meshes")
+    keys = []
+    for i in range(3):
+        region = Region.load(i, 0)
+        region.base[:, : i + 1] = 9
+        region.make_mesh(cache=cache)
+        keys.append(mesh_key(region))
+        path = tmp_path / "meshes" / f"{keys[-1]}.bam"
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+    sizes = [(tmp_path / "meshes" / f"{key}.bam").stat().st_size for key in keys]
+    cache.load(keys[0])  # refresh the oldest entry
+    cache.max_bytes = sizes[0] + sizes[2]
+    cache.prune()
+    remaining = {p.stem for p in (tmp_path / "meshes").glob("*.bam")}
+    assert remaining == {keys[0], keys[2]}
+
+
+def test_mesh_cache_tracks_size(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = MeshCache(tmp_path / "meshes")
+    Region.load(0, 0).make_mesh(cache=cache)
+    Region.load(1, 0).make_mesh(cache=cache)
+    on_disk = sum(p.stat().st_size for p in (tmp_path / "meshes").glob("*.bam"))
+    assert cache._total_size() == on_disk
+
+
+def test_mesh_cache_load_survives_concurrent_prune(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = MeshCache(tmp_path / "meshes")
+    region = Region.load(0, 0)
+    region.make_mesh(cache=cache)
+    key = mesh_key(region)
+    path = tmp_path / "meshes" / f"{key}.bam"
+    read_bytes = type(path).read_bytes
+
+    def read_then_prune(self):
+        data = read_bytes(self)
+        # A worker prunes the file right after it was read
+        cache.max_bytes = 0
+        cache.prune()
+        return data
+
+    monkeypatch.setattr(type(path), "read_bytes", read_then_prune)
+    assert cache.load(key) is not None
+    assert not path.exists()
+    assert cache._total_size() == 0
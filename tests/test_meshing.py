@@ -0,0 +1,265 @@
+import numpy as np
+
+from panda3d.core import GeomVertexReader
+
+from runepy.world import meshing, region as region_module
+from runepy.world.manager import RegionManager
+from runepy.world.mesh_cache import mesh_key
+from runepy.world.region import Region
+
+
+def _coverage(quads, shape):
+    cover = np.zeros(shape, dtype=int)
+    for x, y, w, h in zip(*quads):
+        cover[y : y + h, x : x + w] += 1
+    return cover
+
+
+def _rows(node):
+    return sum(
+        geom.getVertexData().getNumRows()
+        for path in node.findAllMatches("**/+GeomNode")
+        for geom in path.node().getGeoms()
+    )
+
+
+def test_greedy_quads_partition_uniform_rectangles():
+    rng = np.random.default_rng(5)
+    keys = rng.integers(0, 3, size=(32, 32))
+    keys[8:20, 4:30] = 7
+    quads = meshing.greedy_quads(keys)
+    assert (_coverage(quads, keys.shape) == 1).all()
+    for x, y, w, h in zip(*quads):
+        block = keys[y : y + h, x : x + w]
+        assert (block == block[0, 0]).all()
+    assert len(quads[0]) < keys.size // 2
+
+
+def test_greedy_quads_keep_detail_tiles():
+    keys = np.zeros((4, 4), dtype=int)
+    detail = np.zeros((4, 4), dtype=bool)
+    detail[1, 2] = True
+    quads = meshing.greedy_quads(keys, detail)
+    assert (_coverage(quads, keys.shape) == 1).all()
+    singles = [(x, y) for x, y, w, h in zip(*quads) if w == h == 1]
+    assert (2, 1) in singles
+    assert len(meshing.greedy_quads(keys)[0]) == 1
+
+
+def test_make_mesh_greedy_vertex_counts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    region = Region.load(0, 0)
+    assert _rows(region.make_mesh(greedy=False)) == 4 * 64 * 64
+    node = region.make_mesh()
+    # One merged quad per 16 × 16 chunk
+    assert _rows(node) == 4 * 16
+    assert node.find("**/chunk_0_0").node().getGeom(0).getPrimitive(0).getNumPrimitives() == 2
+
+    region.textures[3, 3, 0, 0] = 1
+    region.base[10:20, 10:20] = 5
+    assert _rows(region.make_mesh()) < 4 * 64
+
+
+def test_make_mesh_chunks_have_own_bounds(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    region = Region.load(0, 0)
+    node = region.make_mesh()
+    chunks = node.findAllMatches("**/chunk_*")
+    assert len(chunks) == 16
+    bounds = node.find("**/chunk_3_1").getTightBounds()
+    assert tuple(bounds[0])[:2] == (48, 16)
+    assert tuple(bounds[1])[:2] == (64, 32)
+
+    region.chunk_size = 64
+    assert len(region.make_mesh().findAllMatches("**/chunk_*")) == 1
+
+
+def test_rebuild_chunk_touches_only_its_chunk(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    region = Region.load(0, 0)
+    node = region.make_mesh()
+    geoms = {path.getName(): path.node().getGeom(0) for path in node.findAllMatches("**/chunk_*")}
+    region.set_lod(1)
+    region.base[20, 40] = 9
+    assert region.rebuild_chunk(40, 20)
+    assert region.lod == 1 and set(region.lod_nodes) == {0, 1}
+    region.set_lod(0)
+    for path in node.findAllMatches("**/chunk_*"):
+        same = path.node().getGeom(0) == geoms[path.getName()]
+        assert same == (path.getName() != "chunk_2_1")
+    assert node.find("**/chunk_2_1").node().getGeom(0).getVertexData().getNumRows() > 4
+    assert not Region.load(1, 0).rebuild_chunk(0, 0)
+
+
+def test_region_quads_colors_match_tiles():
+    height = np.zeros((4, 4), dtype=np.int16)
+    base = np.zeros((4, 4), dtype=np.uint8)
+    overlay = np.zeros((4, 4), dtype=np.uint8)
+    base[:, 2:] = 255
+    overlay[0, 0] = 51
+    height[3, 3] = 2
+    quads, heights, colors = meshing.region_quads(height, base, overlay)
+    for (x, y), z, color in zip(zip(quads[0], quads[1]), heights, colors):
+        value = overlay[y, x] or base[y, x]
+        expected = meshing.EMPTY_COLOR if not value else (value / 255.0,) * 3 + (1.0,)
+        assert np.allclose(color, expected)
+        assert z == height[y, x]
+
+
+def test_lod_quads_average_blocks():
+    height = np.zeros((8, 8), dtype=np.int16)
+    base = np.full((8, 8), 100, dtype=np.uint8)
+    overlay = np.zeros((8, 8), dtype=np.uint8)
+    height[0:2, 0:2] = [[0, 4], [4, 0]]
+    quads, heights, colors = meshing.lod_quads(height, base, overlay, 2)
+    assert (_coverage(quads, (8, 8)) == 1).all()
+    assert all(w % 2 == 0 and h % 2 == 0 for w, h in zip(quads[2], quads[3]))
+    corner = [i for i, (x, y) in enumerate(zip(quads[0], quads[1])) if x == 0 and y == 0][0]
+    assert heights[corner] == 2
+    assert len(quads[0]) <= 3
+    assert np.allclose(colors[:, 0], 100 / 255.0)
+
+
+def test_region_lod_switching(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    region = Region.load(0, 0)
+    rng = np.random.default_rng(1)
+    region.base[:] = rng.integers(1, 3, size=(64, 64))
+    node = region.make_mesh()
+    full = _rows(node)
+    assert region.lod_for_distance(10) == 0
+    assert region.lod_for_distance(1000) == 2
+    assert region.set_lod(2)
+    assert region.node is node
+    coarse = _rows(node)
+    assert coarse * 4 < full
+    assert not region.set_lod(2)
+    assert set(region.lod_nodes) == {0, 2}
+    assert region.set_lod(0)
+    assert _rows(node) == full
+
+
+def test_texture_image_layout_and_blank_tiles():
+    textures = np.zeros((2, 3, 16, 16), dtype=np.uint8)
+    textures[1, 2, 3, 4] = 9
+    image = meshing.texture_image(textures)
+    assert image.shape == (32, 48)
+    assert image[16 + 3, 32 + 4] == 9
+    assert image[16, 32] == 0
+    assert (image[:16, :16] == 255).all()
+
+
+def test_region_texture_patch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    region = Region.load(0, 0)
+    region.make_mesh()
+    assert region.texture is None
+    region.textures[2, 1, 0, 0] = 50
+    region.update_texture_tile(1, 2)
+    assert region.node.getTexture() == region.texture
+    region.textures[4, 4, 1, 2] = 77
+    region.update_texture_tile(4, 4)
+    image = np.frombuffer(bytes(region.texture.getRamImage()), dtype=np.uint8).reshape(1024, 1024)
+    assert image[32, 16] == 50
+    assert image[64 + 1, 64 + 2] == 77
+    assert image[64, 64] == 0
+    assert image[0, 0] == 255
+    chunk = region.node.find("**/chunk_0_0").node()
+    assert chunk.getGeom(0).getVertexData().hasColumn("texcoord")
+
+
+def test_smooth_grid_corners_and_normals():
+    height = np.zeros((8, 8), dtype=np.int16)
+    height[:, 4:] = 4
+    colors = meshing.value_colors(np.full((8, 8), 100, dtype=np.uint8))
+    heights, normals, shades = meshing.smooth_grid(height, colors, pad=2)
+    assert heights.shape == (5, 5) and normals.shape == (5, 5, 3)
+    # Corners on the step average both sides
+    assert heights[0, 2] == 2 and heights[0, 1] == 0 and heights[0, 3] == 4
+    assert normals[2, 2, 0] < 0 and np.allclose(normals[2, 0], (0, 0, 1))
+    assert np.allclose(np.linalg.norm(normals, axis=2), 1)
+    assert np.allclose(shades[..., 0], 100 / 255.0)
+
+
+def test_smooth_mesh_shares_vertices_and_borders(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(3)
+    west = Region.load(0, 0)
+    east = Region.load(1, 0)
+    for region in (west, east):
+        region.height[:] = rng.integers(0, 8, size=(64, 64))
+        region.smooth = True
+    west.save()
+    east.save()
+
+    flat = Region.load(0, 0)
+    flat_rows = _rows(flat.make_mesh(greedy=False))
+    rows = _rows(west.make_mesh())
+    assert rows == 16 * 17 * 17
+    assert rows * 3 < flat_rows
+
+    west_heights = west.corner_grid()[0]
+    east_heights = east.corner_grid()[0]
+    assert np.array_equal(west_heights[:, 64], east_heights[:, 0])
+    geom = west.node.find("**/chunk_3_0").node().getGeom(0)
+    assert geom.getVertexData().hasColumn("normal")
+    assert geom.getPrimitive(0).getNumPrimitives() == 2 * 16 * 16
+
+
+def test_smooth_rebuild_reaches_neighbor_chunks(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    region = Region.load(0, 0)
+    region.smooth = True
+    node = region.make_mesh()
+    geoms = {path.getName(): path.node().getGeom(0) for path in node.findAllMatches("**/chunk_*")}
+    region.height[15, 20] = 5
+    assert region.rebuild_chunk(20, 15)
+    changed = {
+        path.getName()
+        for path in node.findAllMatches("**/chunk_*")
+        if path.node().getGeom(0) != geoms[path.getName()]
+    }
+    assert changed == {"chunk_1_0", "chunk_1_1"}
+
+
+def _corner_z(node, x, y):
+    for path in node.findAllMatches("**/+GeomNode"):
+        reader = GeomVertexReader(path.node().getGeom(0).getVertexData(), "vertex")
+        while not reader.isAtEnd():
+            vx, vy, vz = reader.getData3()
+            if (vx, vy) == (x, y):
+                return vz
+    return None
+
+
+def test_smooth_border_follows_unsaved_neighbor_edits(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    west = Region.load(0, 0)
+    east = Region.load(1, 0)
+    for region in (west, east):
+        region.smooth = True
+    manager = RegionManager(view_radius=1)
+    manager.seed({(0, 0): west, (1, 0): east})
+    manager.ensure(0, 0)
+    assert manager.loaded[(0, 0)] is west and manager.loaded[(1, 0)] is east
+
+    # Resident neighbors are read from memory, even for cache keys
+    def no_disk(*_args, **_kwargs):
+        raise AssertionError("neighbor read from disk")
+
+    monkeypatch.setattr(region_module, "read_layers", no_disk)
+    key = mesh_key(west)
+
+    # Edit the east side of the border without saving it
+    east.height[10:12, 0] = 9
+    east.touch()
+    assert east.rebuild_chunk(0, 10)
+    manager.rebuild_border(64, 10)
+
+    assert mesh_key(west) != key
+    west_heights = west.corner_grid()[0]
+    east_heights = east.corner_grid()[0]
+    assert np.array_equal(west_heights[:, 64], east_heights[:, 0])
+    assert west_heights[11, 64] > 0
+    assert _corner_z(west.node, 64, 11) == west_heights[11, 64]
+    assert _corner_z(east.node, 0, 11) == east_heights[11, 0]
@@ -83,3 +83,55 @@ def test_a_star_diagonal_optimal_path():
     ]
     path = pathfinding.a_star(grid, (0, 0), (2, 2))
     assert path == [(0, 0), (1, 1), (2, 2)]
+
+
+def _path_cost(grid, path, weighted):
+    if not weighted:
+        return len(path) - 1
+    return sum(int(grid[y][x]) for x, y in path[1:])
+
+
+def test_bidirectional_matches_a_star_costs():
+    import numpy as np
+
+    rng = np.random.default_rng(11)
+    for weighted in (False, True):
+        for _ in range(20):
+            grid = (rng.random((24, 24)) > 0.3).astype(int)
+            if weighted:
+                grid *= rng.integers(1, 5, size=grid.shape)
+            grid[0, 0] = grid[23, 23] = 1
+            single = pathfinding.a_star(grid, (0, 0), (23, 23), weighted=weighted)
+            both = pathfinding.bidirectional_a_star(grid, (0, 0), (23, 23), weighted=weighted)
+            if single is None:
+                assert both is None
+                continue
+            assert both[0] == (0, 0) and both[-1] == (23, 23)
+            assert _path_cost(grid, both, weighted) == _path_cost(grid, single, weighted)
+            for (ax, ay), (bx, by) in zip(both, both[1:]):
+                assert max(abs(ax - bx), abs(ay - by)) == 1
+                assert grid[by, bx] != 0
+                if ax != bx and ay != by:
+                    assert grid[ay, bx] != 0 and grid[by, ax] != 0
+
+
+def test_bidirectional_no_corner_cutting():
+    grid = [
+        [1, 0],
+        [0, 1],
+    ]
+    assert pathfinding.bidirectional_a_star(grid, (0, 0), (1, 1)) is None
+    assert pathfinding.bidirectional_a_star(grid, (0, 0), (0, 0)) == [(0, 0)]
+
+
+def test_bidirectional_corridor_expands_fewer_nodes():
+    import numpy as np
+
+    grid = np.zeros((40, 200), dtype=int)
+    grid[20, :] = 1  # long corridor
+    grid[5:36, 190:200] = 1  # open room at the goal end
+    single_stats, both_stats = {}, {}
+    single = pathfinding.a_star(grid, (0, 20), (199, 20), stats=single_stats)
+    both = pathfinding.bidirectional_a_star(grid, (0, 20), (199, 20), stats=both_stats)
+    assert len(both) == len(single)
+    assert both_stats["expanded"] <= single_stats["expanded"]
@@ -0,0 +1,207 @@
+import math
+import types
+
+import numpy as np
+import pytest
+from panda3d.core import Camera, NodePath, PerspectiveLens, Point2
+
+from runepy.picking import TilePicker, corner_height, ground_plane, heightfield_hit
+from runepy.world.region import Region
+from runepy.world.world import World
+
+
+class _Mouse:
+    def __init__(self, x=0.0, y=0.0):
+        self.pos = Point2(x, y)
+
+    def hasMouse(self):
+        return True
+
+    def getMouse(self):
+        return self.pos
+
+
+def _scene(x=10.5, y=20.5, z=30.0):
+    render = NodePath("render")
+    camera = render.attachNewNode(Camera("cam", PerspectiveLens()))
+    camera.setPos(x, y, z)
+    camera.lookAt(x, y, 0)
+    return render, camera
+
+
+def test_ground_plane_intersection():
+    assert ground_plane((0, 0, 10), (10, 0, 0)) == (10, 0, 0)
+    assert ground_plane((0, 0, 10), (4, 2, 8), z=2.0) == pytest.approx((16, 8, 2))
+    assert ground_plane((0, 0, 10), (1, 0, 10)) is None
+    # The plane lies behind the camera
+    assert ground_plane((0, 0, 10), (0, 0, 20)) is None
+
+
+def test_picker_hits_tile_below_camera_once_per_frame():
+    render, camera = _scene()
+    clock = types.SimpleNamespace(frame=1)
+    clock.getFrameCount = lambda: clock.frame
+    calls = []
+
+    def surface(near, far):
+        calls.append(near)
+        return ground_plane(near, far)
+
+    picker = TilePicker(_Mouse(), camera, render, surface=surface, clock=clock)
+    pick = picker.pick()
+    assert (pick.tile_x, pick.tile_y) == (10, 20)
+    assert pick.z == 0
+    assert picker.pick() is pick
+    assert len(calls) == 1
+
+    camera.setPos(3.5, -7.5, 30)
+    camera.lookAt(3.5, -7.5, 0)
+    clock.frame += 1
+    assert (picker.pick().tile_x, picker.pick().tile_y) == (3, -8)
+    assert len(calls) == 2
+
+
+def test_picker_without_mouse():
+    render, camera = _scene()
+    mouse = types.SimpleNamespace(hasMouse=lambda: False)
+    assert TilePicker(mouse, camera, render).pick() is None
+
+
+def _brute_force(near, far, height_at, steps=20000):
+    for i in range(steps + 1):
+        t = i / steps
+        x, y, z = (n + t * (f - n) for n, f in zip(near, far))
+        if z <= height_at(math.floor(x), math.floor(y)):
+            return math.floor(x), math.floor(y)
+    return None
+
+
+def test_heightfield_hit_matches_dense_sampling():
+    rng = np.random.default_rng(7)
+    heights = rng.integers(0, 6, size=(40, 40))
+
+    def height_at(x, y):
+        return heights[y, x] if 0 <= x < 40 and 0 <= y < 40 else 0
+
+    for _ in range(20):
+        near = (rng.uniform(0, 40), rng.uniform(0, 40), 12.0)
+        far = (rng.uniform(0, 40), rng.uniform(0, 40), -1.0)
+        hit = heightfield_hit(near, far, height_at)
+        assert hit is not None
+        assert (math.floor(hit[0]), math.floor(hit[1])) == _brute_force(near, far, height_at)
+
+
+def test_heightfield_hit_picks_hill_in_front_of_ground_tile():
+    def height_at(x, y):
+        return 8 if x == 3 else 0
+
+    # Looking along +x the hill at x == 3 hides the ground plane hit at x == 10
+    near, far = (0.5, 0.5, 10.0), (10.5, 0.5, 0.0)
+    assert ground_plane(near, far)[0] == pytest.approx(10.5)
+    x, y, z = heightfield_hit(near, far, height_at)
+    assert (math.floor(x), math.floor(y), z) == (3, 0, 7.5)
+    # Stepping towards -x the hit on the tile border still floors into the tile
+    x, _y, _z = heightfield_hit((9.5, 0.5, 1.0), (-0.5, 0.5, 1.0), height_at)
+    assert math.floor(x) == 3
+    assert heightfield_hit((0.5, 0.5, 10.0), (0.5, 0.5, 9.0), height_at) is None
+
+
+def test_world_tile_height_reads_resident_regions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    region = Region.load(0, 0)
+    region.height[4, 3] = 9
+    region.save()
+    world = World(view_radius=0)
+    assert world.tile_height(3, 4) == 0
+    world.update_streaming(3, 4)
+    assert world.tile_height(3, 4) == 9
+    hit = heightfield_hit((3.5, -5.5, 20.0), (3.5, 4.5, 0.0), world.tile_height)
+    assert (math.floor(hit[0]), math.floor(hit[1])) == (3, 4)
+
+
+def test_heightfield_hit_follows_smooth_tile_triangles():
+    rng = np.random.default_rng(11)
+    grid = rng.uniform(0, 4, size=(9, 9))
+
+    def corners_at(x, y):
+        if not (0 <= x < 8 and 0 <= y < 8):
+            return None
+        return grid[y, x], grid[y, x + 1], grid[y + 1, x], grid[y + 1, x + 1]
+
+    def surface_z(x, y):
+        tx, ty = math.floor(x), math.floor(y)
+        corners = corners_at(tx, ty)
+        return 0.0 if corners is None else corner_height(corners, x - tx, y - ty)
+
+    for _ in range(20):
+        near = (*rng.uniform(0, 8, size=2), 12.0)
+        far = (*rng.uniform(0, 8, size=2), -1.0)
+        hit = heightfield_hit(near, far, lambda x, y: 0, corners_at=corners_at)
+        assert hit is not None
+        assert hit[2] == pytest.approx(surface_z(hit[0], hit[1]), abs=1e-4)
+        # Nothing along the ray before the hit lies below the surface
+        for i in range(200):
+            t = i / 200
+            x, y, z = (n + t * (h - n) for n, h in zip(near, hit))
+            assert z >= surface_z(x, y) - 1e-6
+
+
+def test_world_picks_smooth_regions_on_their_corner_grid(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    region = Region.load(0, 0)
+    region.height[10:12, 10:12] = 8
+    region.save()
+    world = World(view_radius=0)
+    world.update_streaming(10, 10)
+    loaded = world.region_manager.region_at(10, 10)
+    assert world.tile_corners(10, 10) is None
+
+    loaded.smooth = True
+    heights = loaded.corner_grid()[0]
+    assert world.tile_corners(10, 10) == tuple(
+        heights[[10, 10, 11, 11], [10, 11, 10, 11]].tolist()
+    )
+    # A vertical ray onto the hill lands on the rendered slope, not the column top
+    near, far = (9.25, 9.25, 20.0), (9.25, 9.25, -1.0)
+    flat = heightfield_hit(near, far, world.tile_height)
+    smooth = heightfield_hit(near, far, world.tile_height, corners_at=world.tile_corners)
+    assert flat[2] == 0
+    assert smooth[2] == pytest.approx(corner_height(world.tile_corners(9, 9), 0.25, 0.25))
+    assert 0 < smooth[2] < 8
+
+
+def test_extent_clipping_matches_full_walk_and_bounds_cost():
+    rng = np.random.default_rng(5)
+    heights = rng.integers(0, 6, size=(32, 32))
+    calls = []
+
+    def height_at(x, y):
+        calls.append((x, y))
+        return int(heights[y, x]) if 0 <= x < 32 and 0 <= y < 32 else 0
+
+    extent = ((0, 0, 32, 32), (0, 5))
+    for _ in range(30):
+        near = (*rng.uniform(-20, 52, size=2), 30.0)
+        far = (*rng.uniform(-20, 52, size=2), -2.0)
+        full = heightfield_hit(near, far, height_at)
+        clipped = heightfield_hit(near, far, height_at, extent=extent)
+        assert clipped == pytest.approx(full)
+
+    # A ray skimming towards the horizon over empty ground
+    calls.clear()
+    near, far = (16.5, 16.5, 20.0), (16.5, 100016.5, 19.0)
+    assert heightfield_hit(near, far, height_at, extent=extent) is None
+    assert len(calls) == 0
+    assert heightfield_hit(near, far, height_at) is None
+    assert len(calls) == 4096
+
+
+def test_world_terrain_extent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    region = Region.load(1, 0)
+    region.height[4, 3] = 9
+    region.save()
+    world = World(view_radius=0)
+    assert world.terrain_extent() == ((0, 0, 0, 0), (0, 0))
+    world.update_streaming(64 + 3, 4)
+    assert world.terrain_extent() == ((64, 0, 128, 64), (0, 9))
@@ -1,6 +1,7 @@
 import gzip
 
 import numpy as np
+import pytest
 
 from constants import REGION_SIZE
 from runepy.paths import MAPS_DIR
@@ -50,3 +51,46 @@ def test_region_load_v1(tmp_path, monkeypatch):
     assert np.array_equal(loaded.flags, flags)
     assert loaded.textures.shape == (REGION_SIZE, REGION_SIZE, 16, 16)
     assert np.all(loaded.textures == 0)
+
+
+def test_region_partial_load(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    r1 = Region.load(1, 2)
+    r1.flags[4, 4] = 1
+    r1.textures[6, 6, 1, 1] = 200
+    r1.save()
+
+    partial = Region.load(1, 2, layers={"flags"})
+    assert partial.loaded_layers == ("flags",)
+    assert partial.flags[4, 4] == 1
+    # Remaining layers are fetched on first access
+    assert partial.textures[6, 6, 1, 1] == 200
+    assert set(partial.loaded_layers) == {"flags", "textures"}
+    assert partial.height.shape == (REGION_SIZE, REGION_SIZE)
+
+
+def test_region_partial_load_rejects_unknown_layers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError):
+        Region.load(0, 0, layers={"colour"})
+
+
+def test_region_partial_load_v2(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = MAPS_DIR / "region_0_0.bin"
+    path.parent.mkdir(parents=True)
+    size = REGION_SIZE * REGION_SIZE
+    flags = np.zeros((REGION_SIZE, REGION_SIZE), dtype=np.uint8)
+    flags[2, 3] = 1
+    textures = np.zeros((REGION_SIZE, REGION_SIZE, 16, 16), dtype=np.uint8)
+    textures[0, 0, 0, 0] = 9
+    with gzip.open(path, "wb") as f:
+        f.write((2).to_bytes(2, "little"))
+        f.write(np.zeros(size, dtype=np.int16).tobytes())
+        f.write(np.zeros(size * 2, dtype=np.uint8).tobytes())
+        f.write(flags.tobytes())
+        f.write(textures.tobytes())
+
+    partial = Region.load(0, 0, layers={"flags"})
+    assert partial.flags[2, 3] == 1
+    assert partial.textures[0, 0, 0, 0] == 9
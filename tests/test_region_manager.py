@@ -1,6 +1,7 @@
 
 from constants import REGION_SIZE
 from runepy.world.manager import RegionManager
+from runepy.world.region import Region
 
 
 def test_region_manager_loading(tmp_path, monkeypatch):
@@ -33,3 +34,40 @@ def test_clear_cache(tmp_path, monkeypatch):
     assert mgr._cache
     mgr.clear_cache()
     assert mgr._cache == {}
+
+
+def test_retention_ring_avoids_reloads(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mgr = RegionManager(view_radius=1, retain_margin=1)
+    mgr.ensure(REGION_SIZE - 1, 10)
+    west = mgr.loaded[(-1, 0)]
+    mgr.ensure(REGION_SIZE, 10)
+    assert (-1, 0) not in mgr.loaded
+    assert mgr.retained[(-1, 0)] is west
+    assert mgr.resident(-1, 0) is west
+
+    loads = []
+    monkeypatch.setattr(Region, "load", classmethod(lambda cls, rx, ry, layers=None: loads.append((rx, ry))))
+    mgr.ensure(REGION_SIZE - 1, 10)
+    assert loads == []
+    assert mgr.loaded[(-1, 0)] is west
+    assert (2, 0) in mgr.retained
+
+
+def test_retention_ring_unloads_beyond_margin(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mgr = RegionManager(view_radius=1, retain_margin=1)
+    mgr.ensure(10, 10)
+    mgr.ensure(REGION_SIZE * 2 + 10, 10)
+    assert (-1, 0) not in mgr.retained
+    assert (0, 0) in mgr.retained
+
+
+def test_retention_respects_resident_budget(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mgr = RegionManager(view_radius=1, retain_margin=2, max_resident=12)
+    mgr.ensure(10, 10)
+    mgr.ensure(REGION_SIZE * 2 + 10, 10)
+    assert len(mgr.loaded) + len(mgr.retained) == 12
+    # The farthest column was dropped first
+    assert not any(key[0] == -1 for key in mgr.retained)
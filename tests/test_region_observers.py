@@ -0,0 +1,50 @@
+from constants import REGION_SIZE
+from runepy.world.manager import RegionManager
+
+
+def test_shared_regions_load_once(tmp_path, monkeypatch, load_calls):
+    monkeypatch.chdir(tmp_path)
+    calls = load_calls
+    mgr = RegionManager(view_radius=1, retain_margin=0)
+    mgr.update_observers({"a": (10, 10), "b": (REGION_SIZE + 10, 10)})
+    assert len(mgr.loaded) == 12
+    assert len(calls) == len(set(calls)) == 12
+    assert mgr.refcount(0, 0) == 2
+    assert mgr.refcount(-1, 0) == 1
+
+    mgr.remove_observer("a")
+    assert (-1, 0) not in mgr.loaded
+    assert (0, 0) in mgr.loaded
+    assert mgr.refcount(0, 0) == 1
+
+
+def test_batched_moves_keep_claimed_regions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mgr = RegionManager(view_radius=0, retain_margin=0)
+    mgr.update_observers({"a": (10, 10), "b": (REGION_SIZE + 10, 10)})
+    region = mgr.loaded[(0, 0)]
+    # ``a`` leaves region (0, 0) as ``b`` enters it in the same tick
+    mgr.update_observers({"a": (-10, 10), "b": (10, 10)})
+    assert mgr.loaded[(0, 0)] is region
+    assert set(mgr.loaded) == {(-1, 0), (0, 0)}
+
+
+def test_observer_radius_and_primary(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mgr = RegionManager(view_radius=0, retain_margin=0)
+    mgr.add_observer("npc", REGION_SIZE * 5, 0, view_radius=1)
+    mgr.ensure(10, 10)
+    assert len(mgr.loaded) == 10
+    assert set(mgr.observers) == {"npc", RegionManager.PRIMARY}
+    mgr.ensure(REGION_SIZE * 5, 10)
+    assert len(mgr.loaded) == 9
+
+
+def test_last_observer_leaving_unloads_retained(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mgr = RegionManager(view_radius=1, retain_margin=1)
+    mgr.add_observer("a", 10, 10)
+    region = mgr.loaded[(0, 0)]
+    mgr.remove_observer("a")
+    assert mgr.loaded == {} and mgr.retained == {}
+    assert region.node is None
@@ -0,0 +1,74 @@
+import threading
+
+from constants import REGION_SIZE
+from runepy.world.manager import RegionManager
+from runepy.world.world import World
+
+
+def test_rank_route_orders_by_arrival():
+    mgr = RegionManager(view_radius=0)
+    points = [(10, 10), (REGION_SIZE + 10, 10), (REGION_SIZE * 2 + 10, 10)]
+    assert mgr.rank_route(points, speed=2.0) == [(0, 0), (1, 0), (2, 0)]
+
+
+def test_prefetched_regions_skip_disk_on_ensure(tmp_path, monkeypatch, load_calls):
+    monkeypatch.chdir(tmp_path)
+    mgr = RegionManager(view_radius=0)
+    mgr.ensure(10, 10)
+    ranked = mgr.prefetch_route([(10, 10), (REGION_SIZE * 2 + 10, 10)], build_mesh=True)
+    assert ranked == [(1, 0), (2, 0)]
+    for future in list(mgr._prefetched.values()):
+        future.result()
+
+    load_calls.clear()
+    mgr.ensure(REGION_SIZE + 10, 10)
+    mgr.ensure(REGION_SIZE * 2 + 10, 10)
+    assert load_calls == []
+    assert (2, 0) in mgr.loaded
+    mgr.shutdown()
+
+
+def test_prefetch_requeues_in_new_order(tmp_path, monkeypatch, load_calls):
+    monkeypatch.chdir(tmp_path)
+    mgr = RegionManager(view_radius=0)
+    # Keep the worker busy so the prefetches below are still queued
+    gate = threading.Event()
+    mgr._get_executor().submit(gate.wait)
+
+    mgr.prefetch([(5, 5), (6, 6)])
+    queued = dict(mgr._prefetched)
+    mgr.prefetch([(7, 7), (5, 5)])
+    assert queued[(6, 6)].cancelled() and (6, 6) not in mgr._prefetched
+    assert queued[(5, 5)].cancelled() and mgr._prefetched[(5, 5)] is not queued[(5, 5)]
+
+    gate.set()
+    for future in list(mgr._prefetched.values()):
+        future.result(timeout=5.0)
+    mgr._collect_prefetched()
+    mgr.shutdown()
+    assert load_calls == [(7, 7), (5, 5)]
+    assert set(mgr._cache) == {(7, 7), (5, 5)}
+
+
+def test_world_prefetch_motion(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    w = World(view_radius=0)
+    w.update_streaming(10, 10)
+    ranked = w.prefetch_motion(10, 10, REGION_SIZE, 0, horizon=2.0)
+    assert ranked[:2] == [(1, 0), (2, 0)]
+    assert w.prefetch_motion(10, 10, 0, 0) == []
+    w.shutdown()
+
+
+def test_prefetch_around_reports_progress(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mgr = RegionManager(view_radius=1)
+    ranked = mgr.prefetch_around(10, 10, build_mesh=True)
+    assert ranked[0] == (0, 0) and len(ranked) == 9
+    done, total = mgr.prefetch_progress()
+    assert total == 9
+    while done < total:
+        done, total = mgr.wait_prefetch(timeout=1.0)
+    assert set(mgr._cache) == set(ranked)
+    assert mgr._cache[(0, 0)].node is not None
+    mgr.shutdown()
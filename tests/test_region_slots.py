@@ -0,0 +1,80 @@
+import numpy as np
+
+from constants import REGION_SIZE
+from runepy.terrain import FLAG_BLOCKED
+from runepy.world.manager import RegionManager
+from runepy.world.region import Region
+from runepy.world.slots import RegionSlots
+
+
+def test_slots_shadow_loaded_regions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mgr = RegionManager(view_radius=1)
+    mgr.ensure(10, 10)
+    region = mgr.loaded[(-1, 0)]
+    region.flags[3, 5] = FLAG_BLOCKED
+    assert mgr.slots.tile(-REGION_SIZE + 5, 3) == FLAG_BLOCKED
+    assert mgr.slots.tile(5, 3) == 0
+    assert mgr.slots.tile(REGION_SIZE * 4, 0) is None
+    assert mgr.region_at(-1, 0) is region
+
+    xs = np.array([-REGION_SIZE + 5, 5, REGION_SIZE * 4])
+    ys = np.array([3, 3, 0])
+    values, present = mgr.slots.tiles(xs, ys)
+    assert values.tolist() == [FLAG_BLOCKED, 0, 0]
+    assert present.tolist() == [True, True, False]
+
+
+def test_released_regions_keep_their_data(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mgr = RegionManager(view_radius=0, retain_margin=0)
+    mgr.ensure(10, 10)
+    region = mgr.loaded[(0, 0)]
+    region.height[1, 1] = 7
+    mgr.ensure(REGION_SIZE * 3 + 10, 10)
+    assert mgr.slots.tile(1, 1, "height") is None
+    assert region.height[1, 1] == 7
+    region.height[1, 1] = 9
+    assert mgr.slots.tile(REGION_SIZE * 3 + 1, 1, "height") == 0
+
+
+def test_slot_collision_evicts_older_region(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    slots = RegionSlots(2)
+    a = Region.load(0, 0)
+    b = Region.load(2, 0)
+    a.flags[0, 0] = 1
+    slots.insert(a)
+    slots.insert(b)
+    assert slots.region(0, 0) is None
+    assert slots.region(2, 0) is b
+    assert a.flags[0, 0] == 1
+    assert slots.tile(0, 0) is None
+    assert slots.tile(2 * REGION_SIZE, 0) == 0
+
+
+def test_slots_index_region_arrays_in_place(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    slots = RegionSlots(2)
+    region = Region.load(1, 0)
+    flags = region.flags
+    slots.insert(region)
+    assert region.flags is flags
+    flags[2, 3] = FLAG_BLOCKED
+    assert slots.tile(REGION_SIZE + 3, 2) == FLAG_BLOCKED
+    values, present = slots.tiles([REGION_SIZE + 3, 3], [2, 2])
+    assert values.tolist() == [FLAG_BLOCKED, 0] and present.tolist() == [True, False]
+    slots.release(1, 0)
+    assert region.flags is flags
+    assert slots.tile(REGION_SIZE + 3, 2) is None
+
+
+def test_wide_footprint_grows_slots(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mgr = RegionManager(view_radius=1)
+    assert mgr.slots.size == 3
+    mgr.ensure_rect(0, 0, REGION_SIZE * 9, REGION_SIZE * 4)
+    assert mgr.slots.size == 10
+    assert len(mgr.loaded) == 50
+    for (rx, ry), region in mgr.loaded.items():
+        assert mgr.slots.region(rx, ry) is region
@@ -0,0 +1,36 @@
+from constants import REGION_SIZE
+from runepy.world.manager import RegionManager
+from runepy.world.meshing import mesh_stats
+
+
+def _recount(mgr):
+    total = {"regions": len(mgr.loaded)}
+    for region in mgr.loaded.values():
+        for name, value in mesh_stats(region.node, region.texture).items():
+            total[name] = total.get(name, 0) + value
+    return total
+
+
+def test_render_stats_follow_attach_detach_and_rebuilds(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mgr = RegionManager(view_radius=1, retain_margin=1)
+    mgr.ensure(10, 10)
+    assert mgr.render_stats["regions"] == 9
+    assert mgr.render_stats == _recount(mgr)
+    assert mgr.render_stats["triangles"] == 9 * 16 * 2
+
+    region = mgr.loaded[(0, 0)]
+    region.base[3, 5] = 7
+    region.rebuild_chunk(5, 3)
+    region.textures[3, 5, 0, 0] = 9
+    region.apply_texture()
+    mgr.loaded[(1, 1)].set_lod(2)
+    assert mgr.render_stats == _recount(mgr)
+    assert mgr.render_stats["texture_bytes"] > 0
+
+    mgr.ensure(REGION_SIZE * 2 + 10, 10)
+    assert mgr.render_stats == _recount(mgr)
+    assert region.stats_sink is None
+    mgr.ensure(REGION_SIZE * 6 + 10, 10)
+    assert mgr.render_stats == _recount(mgr)
+    mgr.shutdown()
@@ -0,0 +1,91 @@
+import json
+import os
+
+from runepy.world.manager import RegionManager
+from runepy.world.region import Region, region_path
+from runepy.world import snapshot
+from runepy.world.snapshot import load_snapshot, save_snapshot
+
+
+def test_snapshot_round_trip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    region = Region.load(0, 0)
+    region.height[2, 3] = 11
+    region.save()
+
+    mgr = RegionManager(view_radius=1)
+    mgr.ensure(10, 10)
+    path = str(tmp_path / "config" / "session.snap")
+    assert save_snapshot(mgr, path) == 9
+
+    restored = load_snapshot(path)
+    assert len(restored) == 9
+    assert restored[(0, 0)].height[2, 3] == 11
+    assert restored[(0, 0)].node is not None
+
+    fresh = RegionManager(view_radius=1)
+    fresh.seed(restored)
+    calls = []
+    monkeypatch.setattr(Region, "load", classmethod(lambda cls, *a, **k: calls.append(a)))
+    fresh.ensure(10, 10)
+    assert calls == []
+    assert fresh.loaded[(0, 0)] is restored[(0, 0)]
+
+
+def test_snapshot_skips_changed_regions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    Region.load(0, 0).save()
+    mgr = RegionManager(view_radius=0)
+    mgr.ensure(10, 10)
+    path = str(tmp_path / "session.snap")
+    save_snapshot(mgr, path)
+
+    stat = region_path(0, 0).stat()
+    os.utime(region_path(0, 0), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert load_snapshot(path) == {}
+    assert load_snapshot(str(tmp_path / "missing.snap")) == {}
+
+
+def test_snapshot_skips_edited_regions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mgr = RegionManager(view_radius=0)
+    mgr.ensure(10, 10)
+    mgr.loaded[(0, 0)].touch()
+    assert save_snapshot(mgr, str(tmp_path / "session.snap")) == 0
+    mgr.loaded[(0, 0)].save()
+    assert save_snapshot(mgr, str(tmp_path / "session.snap")) == 1
+
+
+def test_snapshot_drops_stale_meshes_and_corrupt_entries(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mgr = RegionManager(view_radius=1)
+    mgr.ensure(10, 10)
+    mgr.loaded[(1, 1)].smooth = True
+    mgr.loaded[(1, 1)].make_mesh()
+    path = str(tmp_path / "session.snap")
+    assert save_snapshot(mgr, path) == 9
+
+    restored = load_snapshot(path)
+    assert restored[(0, 0)].node is not None
+    # Smooth meshes depend on neighbor files and are rebuilt on attach
+    assert restored[(1, 1)].smooth and restored[(1, 1)].node is None
+
+    monkeypatch.setattr(snapshot, "MESH_FORMAT", snapshot.MESH_FORMAT + 1)
+    restored = load_snapshot(path)
+    assert len(restored) == 9
+    assert all(region.node is None for region in restored.values())
+    monkeypatch.undo()
+    monkeypatch.chdir(tmp_path)
+
+    # Corrupt the layer table of one entry
+    with open(path, "rb") as f:
+        raw = f.read()
+    (length,) = snapshot._LENGTH.unpack_from(raw, 4)
+    start = 4 + snapshot._LENGTH.size
+    header = json.loads(raw[start : start + length])
+    header["regions"][0]["layers"]["height"] = [0, 3]
+    encoded = json.dumps(header).encode()
+    with open(path, "wb") as f:
+        f.write(snapshot.MAGIC + snapshot._LENGTH.pack(len(encoded)) + encoded + raw[start + length :])
+    restored = load_snapshot(path)
+    assert len(restored) == 8 and (-1, -1) not in restored
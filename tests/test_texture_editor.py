@@ -57,3 +57,25 @@ def test_texture_paint(monkeypatch, tmp_path):
     editor.texture_editor.paint(5, 6)
     region = world.region_manager.loaded[(0,0)]
     assert region.textures[0, 0, 6, 5] == 123
+
+
+def test_texture_paint_without_mesh_refreshes_texture(monkeypatch, tmp_path):
+    import numpy as np
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr('runepy.texture_editor.create_ui', fake_create_ui)
+    world = World(view_radius=1)
+    editor = MapEditor(_FakeClient(), world)
+    monkeypatch.setattr('runepy.map_editor.get_tile_from_mouse', lambda *a: (0, 0))
+
+    editor.open_texture_editor()
+    region = world.region_manager.loaded[(0, 0)]
+    region.textures[0, 0, 0, 0] = 1
+    region.apply_texture()
+    region.node.removeNode()
+    region.node = None
+
+    editor.texture_editor.set_color(200)
+    editor.texture_editor.paint(5, 6)
+    image = np.frombuffer(bytes(region.texture.getRamImage()), dtype=np.uint8)
+    assert image.reshape(1024, 1024)[6, 5] == 200
@@ -0,0 +1,83 @@
+import numpy as np
+
+from constants import REGION_SIZE
+from runepy import visibility
+from runepy.terrain import FLAG_BLOCKED
+from runepy.world.world import World
+
+
+def _room():
+    opaque = np.zeros((9, 9), dtype=bool)
+    opaque[4, 2:7] = True  # horizontal wall through the middle
+    return opaque
+
+
+def test_line_of_sight_batch():
+    opaque = _room()
+    sources = [(4, 1), (4, 1), (0, 0), (4, 1)]
+    targets = [(4, 7), (8, 1), (8, 3), (4, 4)]
+    result = visibility.line_of_sight(opaque, sources, targets)
+    assert result.tolist() == [False, True, True, True]
+
+
+def test_supercover_blocks_diagonal_squeeze():
+    opaque = np.zeros((3, 3), dtype=bool)
+    opaque[0, 1] = opaque[1, 0] = True
+    assert not visibility.has_line_of_sight(opaque, (0, 0), (1, 1))
+    assert visibility.line_of_sight(opaque, [(0, 0)], [(1, 1)], supercover=False)[0]
+
+
+def test_line_of_sight_is_symmetric():
+    rng = np.random.default_rng(3)
+    opaque = rng.random((24, 24)) < 0.25
+    pts = rng.integers(0, 24, size=(200, 2))
+    other = rng.integers(0, 24, size=(200, 2))
+    forward = visibility.line_of_sight(opaque, pts, other)
+    backward = visibility.line_of_sight(opaque, other, pts)
+    assert np.array_equal(forward, backward)
+
+
+def test_line_cells_endpoints():
+    xs, ys, valid = visibility.line_cells([(0, 0)], [(5, 2)], supercover=False)
+    cells = list(zip(xs[0][valid[0]], ys[0][valid[0]]))
+    assert cells[0] == (0, 0) and cells[-1] == (5, 2)
+    assert len(cells) == 6
+
+
+def test_field_of_view_walls_and_shadow():
+    opaque = _room()
+    mask = visibility.field_of_view(opaque, (4, 1))
+    assert mask[1, 4]
+    assert mask[4, 4]  # the wall itself is lit
+    assert not mask[6, 4]  # directly behind the wall
+    assert mask[5, 0]  # around the end of the wall
+
+
+def test_field_of_view_is_symmetric():
+    rng = np.random.default_rng(7)
+    opaque = rng.random((16, 16)) < 0.2
+    floor = list(zip(*np.nonzero(~opaque)))[:40]
+    masks = visibility.fields_of_view(opaque, [(x, y) for y, x in floor])
+    for i, (ay, ax) in enumerate(floor):
+        for j, (by, bx) in enumerate(floor):
+            assert masks[i, by, bx] == masks[j, ay, ax]
+
+
+def test_field_of_view_radius():
+    opaque = np.zeros((21, 21), dtype=bool)
+    mask = visibility.field_of_view(opaque, (10, 10), radius=3)
+    assert mask[10, 13] and not mask[10, 14]
+    assert not mask[13, 13]
+
+
+def test_flags_window_feeds_visibility(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    world = World(view_radius=1)
+    world.update_streaming(0, 0)
+    world.region_manager.loaded[(0, 0)].flags[5, 3] = FLAG_BLOCKED
+    flags, off_x, off_y = world.flags_window(0, 0)
+    assert flags.shape == (REGION_SIZE * 3, REGION_SIZE * 3)
+    opaque = visibility.opaque_mask(flags)
+    src = (3 - off_x, 2 - off_y)
+    assert not visibility.has_line_of_sight(opaque, src, (3 - off_x, 8 - off_y))
+    assert visibility.has_line_of_sight(opaque, src, (8 - off_x, 2 - off_y))
@@ -1,6 +1,8 @@
+import numpy as np
 
 from constants import REGION_SIZE
 from runepy.terrain import FLAG_BLOCKED
+from runepy.world.region import Region
 from runepy.world.world import World
 
 
@@ -42,3 +44,89 @@ def test_is_walkable(tmp_path, monkeypatch):
     region.flags[1, 1] = FLAG_BLOCKED
     assert not w.is_walkable(1, 1)
     assert w.is_walkable(2, 2)
+
+
+def test_pump_streaming_integrates_async_loads(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    w = World(view_radius=1, async_load=True)
+    w.update_streaming(10, 10)
+    assert len(w.manager._pending) == 9
+    for future in list(w.manager._pending.values()):
+        future.result()
+
+    completed = 0
+    for _ in range(9):
+        stats = w.pump_streaming()
+        completed += stats["completed"]
+        if stats["pending"] == 0:
+            break
+    assert completed == 9
+    assert len(w.manager.loaded) == 9
+    assert w.pump_streaming()["completed"] == 0
+    w.shutdown()
+
+
+def test_pump_respects_budget(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    w = World(view_radius=1, async_load=True)
+    w.update_streaming(10, 10)
+    for future in list(w.manager._pending.values()):
+        future.result()
+    stats = w.manager.pump(budget=0.0)
+    assert stats["completed"] == 1
+    assert stats["pending"] == 8
+    w.shutdown()
+
+
+def test_batch_queries_cross_regions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    far = Region.load(5, 0)
+    far.flags[2, 3] = FLAG_BLOCKED
+    far.height[2, 3] = 4
+    far.save()
+
+    w = World(view_radius=1)
+    w.update_streaming(10, 10)
+    w.manager.loaded[(-1, 0)].flags[0, REGION_SIZE - 1] = FLAG_BLOCKED
+    xs = np.array([-1, 0, REGION_SIZE * 5 + 3, REGION_SIZE * 5 + 4])
+    ys = np.array([0, 0, 2, 2])
+
+    values, present = w.layer_values("flags", xs, ys)
+    assert present.tolist() == [True, True, False, False]
+    assert values.tolist() == [FLAG_BLOCKED, 0, 0, 0]
+
+    heights, present = w.layer_values("height", xs, ys, on_miss="load")
+    assert present.all()
+    assert heights.tolist() == [0, 0, 4, 0]
+    assert (5, 0) not in w.manager.loaded
+
+    walkable = w.is_walkable_many(xs, ys)
+    assert walkable.tolist() == [False, True, False, True]
+    assert (5, 0) not in w.manager.loaded
+
+
+def test_batch_queries_prefetch_misses(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    w = World(view_radius=0)
+    xs = np.arange(0, REGION_SIZE * 3, 16)
+    _values, present = w.layer_values("base", xs, np.zeros_like(xs), on_miss="prefetch")
+    assert not present.any()
+    assert set(w.manager._prefetched) == {(0, 0), (1, 0), (2, 0)}
+    w.shutdown()
+
+
+def test_update_lod_by_camera_distance(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    w = World(view_radius=1)
+    w.update_streaming(10, 10)
+    assert w.update_lod(32, 32, 10) == 0
+    # Coarse meshes are built a couple per call, nearest regions first
+    assert w.update_lod(32, 32, 200) == w.lod_builds
+    assert w.manager.loaded[(0, 0)].lod == 2
+    switched = w.lod_builds
+    for _ in range(9):
+        switched += w.update_lod(32, 32, 200)
+    assert switched == 9
+    assert {region.lod for region in w.manager.loaded.values()} == {2}
+    # Levels already built switch back without a budget
+    assert w.update_lod(32, 32, 10) == 9
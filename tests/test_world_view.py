@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from constants import REGION_SIZE
+from runepy.world.region import Region
+from runepy.world.world import World
+
+
+def test_view_inside_region_is_zero_copy(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    world = World(view_radius=1)
+    world.update_streaming(10, 10)
+    region = world.manager.loaded[(0, 0)]
+    view = world.view("height", 4, 2, 12, 6)
+    assert view.shape == (4, 8)
+    assert np.shares_memory(view, region.height)
+    assert not view.flags.writeable
+    region.height[3, 5] = 9
+    assert view[1, 1] == 9
+
+
+def test_view_stitches_and_caches(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    far = Region.load(2, 0)
+    far.base[0, 0] = 3
+    far.save()
+
+    world = World(view_radius=1)
+    world.update_streaming(10, 10)
+    region = world.manager.loaded[(1, 0)]
+    region.base[0, 0] = 5
+    x0 = REGION_SIZE - 2
+    view = world.view("base", x0, 0, REGION_SIZE * 2 + 2, 4)
+    assert view.shape == (4, REGION_SIZE + 4)
+    assert view[0, 2] == 5
+    assert view[0, REGION_SIZE + 2] == 3
+    assert (2, 0) not in world.manager.loaded
+    assert world.view("base", x0, 0, REGION_SIZE * 2 + 2, 4) is view
+
+    region.base[0, 1] = 7
+    region.touch()
+    fresh = world.view("base", x0, 0, REGION_SIZE * 2 + 2, 4)
+    assert fresh is not view
+    assert fresh[0, 3] == 7
+
+
+def test_view_tracks_rewritten_and_reloaded_regions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    world = World(view_radius=1)
+    world.update_streaming(10, 10)
+    x0 = REGION_SIZE - 2
+    view = world.view("base", x0, 0, REGION_SIZE * 2 + 2, 4)
+    assert view[0, REGION_SIZE + 2] == 0
+
+    # A non-resident region rewritten on disk invalidates the stitched view
+    far = Region.load(2, 0)
+    far.base[0, 0] = 3
+    far.save()
+    fresh = world.view("base", x0, 0, REGION_SIZE * 2 + 2, 4)
+    assert fresh[0, REGION_SIZE + 2] == 3
+
+    # So does a resident region reloaded at the same revision
+    stamp = world.window_stamp(10, 10)
+    world.manager.replace_region(0, 0, Region.load(0, 0))
+    assert world.window_stamp(10, 10) != stamp
+    world.shutdown()
+
+
+def test_view_textures_and_errors(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    world = World(view_radius=1)
+    world.update_streaming(10, 10)
+    assert world.view("textures", -1, 0, 1, 1).shape == (1, 2, 16, 16)
+    with pytest.raises(ValueError):
+        world.view("colour", 0, 0, 1, 1)
+    with pytest.raises(ValueError):
+        world.view("flags", 0, 0, 0, 1)